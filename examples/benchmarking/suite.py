@@ -0,0 +1,408 @@
+"""Time the building blocks of a :term:`FiPy` simulation
+
+Unlike :mod:`examples.benchmarking.benchmarker`, which measures a whole
+run of :mod:`examples.phase.anisotropy`, this suite times each piece of
+work separately, for meshes of several sizes:
+
+- ``mesh/...``: constructing `Grid2D`, `Grid3D` and, if :term:`Gmsh` is
+  available, `Gmsh2D` meshes and their geometry,
+- ``assembly/...``: building the matrix of each type of `Term`,
+- ``solve/...``: solving with each `Solver` of the active solver suite,
+  with and without each of its preconditioners,
+- ``variable/...``: re-evaluating trees of `Variable` operations,
+- ``io/...``: writing with :mod:`~fipy.tools.dump`, `TSVViewer` and,
+  if :term:`Mayavi` is available, `VTKCellViewer`.
+
+Run as::
+
+    $ python examples/benchmarking/suite.py --sizes=1000,10000,100000 \\
+          --output=results.json
+
+and, after some change, compare with the earlier results::
+
+    $ python examples/benchmarking/suite.py --sizes=1000,10000,100000 \\
+          --output=new.json --baseline=results.json --threshold=0.2
+
+which lists every benchmark that became more than 20% slower and exits
+with status 1 if there is any.  Use ``--only=solve`` to run only the
+benchmarks whose names start with ``solve``.
+
+Each benchmark is run once to warm up any caches, then ``--repeat``
+times.  The best time is compared, as it is least affected by other
+load on the machine.  When run in parallel, the time of the slowest
+processor is recorded and only processor 0 writes the results.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+from builtins import zip
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from fipy.tools.parser import parse
+
+__all__ = []
+
+def _time(fn, repeat):
+    """Best and median wall time of `repeat` calls of `fn`, after one
+    warm-up call
+    """
+    from fipy.tools import parallelComm
+
+    fn()
+    times = []
+    for i in range(repeat):
+        parallelComm.Barrier()
+        start = time.time()
+        fn()
+        times.append(time.time() - start)
+
+    if parallelComm.Nproc > 1:
+        times = [max(t) for t in zip(*parallelComm.allgather(times))]
+
+    times.sort()
+    return times[0], times[len(times) // 2]
+
+def _grid2DSide(size):
+    return max(1, int(round(size**(1. / 2))))
+
+def _grid3DSide(size):
+    return max(1, int(round(size**(1. / 3))))
+
+def meshBenchmarks(size):
+    """Construction of meshes with about `size` cells, including their
+    geometry
+    """
+    from fipy import Grid2D, Grid3D, Gmsh2D
+
+    def geometry(mesh):
+        mesh.cellVolumes
+        mesh.cellCenters
+        mesh.faceCenters
+        mesh._cellDistances
+        return mesh
+
+    n = _grid2DSide(size)
+    yield "mesh/Grid2D", n**2, lambda: geometry(Grid2D(nx=n, ny=n))
+
+    n = _grid3DSide(size)
+    yield "mesh/Grid3D", n**3, lambda: geometry(Grid3D(nx=n, ny=n, nz=n))
+
+    # triangles of a unit square
+    cellSize = (2. / size)**0.5
+    geo = '''
+    cellSize = %g;
+    Point(1) = {0, 0, 0, cellSize};
+    Point(2) = {1, 0, 0, cellSize};
+    Point(3) = {1, 1, 0, cellSize};
+    Point(4) = {0, 1, 0, cellSize};
+    Line(5) = {1, 2};
+    Line(6) = {2, 3};
+    Line(7) = {3, 4};
+    Line(8) = {4, 1};
+    Line Loop(9) = {5, 6, 7, 8};
+    Plane Surface(10) = {9};
+    ''' % cellSize
+    try:
+        cells = Gmsh2D(geo).globalNumberOfCells
+    except Exception:
+        # Gmsh is not installed
+        return
+    yield "mesh/Gmsh2D", cells, lambda: geometry(Gmsh2D(geo))
+
+def _grid2D(size):
+    from fipy import Grid2D
+
+    n = _grid2DSide(size)
+    return Grid2D(nx=n, ny=n, dx=1. / n, dy=1. / n)
+
+def assemblyBenchmarks(size):
+    """Building the matrix of each type of `Term` on a `Grid2D` with
+    about `size` cells
+    """
+    from fipy import (CellVariable, TransientTerm, DiffusionTerm,
+                      ImplicitSourceTerm, CentralDifferenceConvectionTerm,
+                      UpwindConvectionTerm, ExponentialConvectionTerm,
+                      PowerLawConvectionTerm, HybridConvectionTerm,
+                      VanLeerConvectionTerm, DefaultSolver)
+
+    mesh = _grid2D(size)
+    var = CellVariable(mesh=mesh, value=mesh.cellCenters[0])
+    var.constrain(0., mesh.facesLeft)
+    var.constrain(1., mesh.facesRight)
+    D = CellVariable(mesh=mesh, value=1. + mesh.cellCenters[1])
+
+    terms = [("TransientTerm", TransientTerm()),
+             ("DiffusionTerm", DiffusionTerm(coeff=1.)),
+             ("DiffusionTerm-variable", DiffusionTerm(coeff=D.harmonicFaceValue)),
+             ("DiffusionTerm-4th", DiffusionTerm(coeff=(1., 1.))),
+             ("ImplicitSourceTerm", ImplicitSourceTerm(coeff=D))]
+    for Term in (CentralDifferenceConvectionTerm, UpwindConvectionTerm,
+                 ExponentialConvectionTerm, PowerLawConvectionTerm,
+                 HybridConvectionTerm, VanLeerConvectionTerm):
+        terms.append((Term.__name__, Term(coeff=(1., 0.5))))
+
+    for name, term in terms:
+        def build(term=term):
+            term._prepareLinearSystem(var=var, solver=DefaultSolver(),
+                                      boundaryConditions=(), dt=1.)
+        yield "assembly/" + name, mesh.globalNumberOfCells, build
+
+def _solvers():
+    """Solver and preconditioner classes of the active solver suite
+    """
+    import fipy.solvers
+
+    solvers = []
+    preconditioners = [None]
+    for name in fipy.solvers.__all__:
+        cls = getattr(fipy.solvers, name)
+        if name.startswith("Linear") and name.endswith("Solver"):
+            solvers.append(cls)
+        elif name.endswith("Preconditioner") and name != "Preconditioner":
+            preconditioners.append(cls)
+
+    return solvers, preconditioners
+
+def solveBenchmarks(size):
+    """Solving a transient diffusion problem on a `Grid2D` with about
+    `size` cells with each solver and preconditioner
+    """
+    from fipy import CellVariable, TransientTerm, DiffusionTerm
+
+    mesh = _grid2D(size)
+    var = CellVariable(mesh=mesh, value=0.)
+    var.constrain(0., mesh.facesLeft)
+    var.constrain(1., mesh.facesRight)
+    eq = TransientTerm() == DiffusionTerm(coeff=1.)
+
+    solvers, preconditioners = _solvers()
+    for Solver in solvers:
+        for Preconditioner in preconditioners:
+            if Preconditioner is None:
+                name = Solver.__name__
+                try:
+                    solver = Solver(tolerance=1e-10, iterations=1000)
+                except Exception:
+                    continue
+            else:
+                name = "%s-%s" % (Solver.__name__, Preconditioner.__name__)
+                try:
+                    solver = Solver(tolerance=1e-10, iterations=1000,
+                                    precon=Preconditioner())
+                except Exception:
+                    # not every solver takes a preconditioner
+                    continue
+
+            def solve(solver=solver):
+                var.value = 0.
+                eq.solve(var=var, solver=solver, dt=1.)
+                return solver
+
+            yield "solve/" + name, mesh.globalNumberOfCells, solve
+
+def variableBenchmarks(size):
+    """Re-evaluating trees of `Variable` operations on a `Grid2D` with
+    about `size` cells, after their inputs change
+    """
+    from fipy import CellVariable
+    from fipy.tools import numerix
+
+    mesh = _grid2D(size)
+    x, y = mesh.cellCenters
+    a = CellVariable(mesh=mesh, value=x)
+    b = CellVariable(mesh=mesh, value=y)
+
+    trees = [("arithmetic", (a * b + a / (1. + b**2) - 2 * a) * 0.5),
+             ("functions", numerix.sqrt(a**2 + b**2) * numerix.exp(-a) + numerix.sin(b)),
+             ("faceValue", (a * b).arithmeticFaceValue),
+             ("grad", (a * b).grad),
+             ("faceGradDivergence", (a * b).faceGrad.divergence)]
+
+    for name, tree in trees:
+        def evaluate(tree=tree):
+            a.value = x
+            return tree.value
+        yield "variable/" + name, mesh.globalNumberOfCells, evaluate
+
+def ioBenchmarks(size):
+    """Writing a `CellVariable` on a `Grid2D` with about `size` cells
+    """
+    from fipy import CellVariable, TSVViewer
+    from fipy.tools import dump
+
+    mesh = _grid2D(size)
+    var = CellVariable(mesh=mesh, value=mesh.cellCenters[0] * mesh.cellCenters[1],
+                       name="var")
+
+    def write(suffix, fn):
+        f, filename = tempfile.mkstemp(suffix)
+        os.close(f)
+        def benchmark():
+            fn(filename)
+        benchmark.filename = filename
+        return benchmark
+
+    yield ("io/dump", mesh.globalNumberOfCells,
+           write(".dmp.gz", lambda filename: dump.write((mesh, var), filename=filename)))
+    yield ("io/TSVViewer", mesh.globalNumberOfCells,
+           write(".tsv", lambda filename: TSVViewer(vars=var).plot(filename=filename)))
+
+    try:
+        from fipy.viewers.vtkViewer import VTKCellViewer
+        viewer = VTKCellViewer(vars=var)
+    except ImportError:
+        # Mayavi is not installed
+        return
+    yield ("io/VTKCellViewer", mesh.globalNumberOfCells,
+           write(".vtk", lambda filename: viewer.plot(filename=filename)))
+
+benchmarks = [meshBenchmarks,
+              assemblyBenchmarks,
+              solveBenchmarks,
+              variableBenchmarks,
+              ioBenchmarks]
+
+def run(sizes, repeat=5, only=None, log=None):
+    """Run all benchmarks for meshes of each of `sizes` cells
+
+    Parameters
+    ----------
+    sizes : :obj:`list` of int
+        Approximate numbers of cells.
+    repeat : int
+        How many times to time each benchmark.
+    only : str
+        If not `None`, only run benchmarks whose names start with `only`.
+    log : file
+        If not `None`, where to report each result as it is obtained.
+
+    Returns
+    -------
+    :obj:`list` of dict
+        With keys "name", "cells", "size", "best", "median" and, for
+        solves, "iterations".
+    """
+    results = []
+    for size in sizes:
+        for benchmarkSet in benchmarks:
+            for name, cells, fn in benchmarkSet(size):
+                if only is not None and not name.startswith(only):
+                    continue
+
+                best, median = _time(fn, repeat)
+
+                result = dict(name=name, size=size, cells=cells,
+                              best=best, median=median)
+                if name.startswith("solve/"):
+                    convergence = fn().convergence
+                    if convergence is not None:
+                        result["iterations"] = convergence.iterations
+                results.append(result)
+
+                if hasattr(fn, "filename") and os.path.exists(fn.filename):
+                    os.remove(fn.filename)
+
+                if log is not None:
+                    log.write("%-60s %8d %12.6f %12.6f\n" % (name, cells, best, median))
+                    log.flush()
+
+    return results
+
+def metadata():
+    """Description of the environment the benchmarks ran in
+    """
+    import numpy
+    import fipy
+    import fipy.solvers
+    from fipy.tools import parallelComm
+
+    return {"fipy": fipy.__version__,
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "platform": platform.platform(),
+            "solver": fipy.solvers.solver,
+            "processors": parallelComm.Nproc,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+
+def compare(results, baseline, threshold=0.1):
+    """Benchmarks that became slower than in `baseline`
+
+    Parameters
+    ----------
+    results, baseline : :obj:`list` of dict
+        As returned by :func:`run`.
+    threshold : float
+        Fraction by which the best time must grow to count as slower.
+
+    Returns
+    -------
+    :obj:`list` of tuple
+        `(name, size, baseline time, time)` of each slower benchmark.
+
+    >>> baseline = [dict(name="a", size=10, best=1.),
+    ...             dict(name="b", size=10, best=1.)]
+    >>> results = [dict(name="a", size=10, best=1.05),
+    ...            dict(name="b", size=10, best=1.5),
+    ...            dict(name="c", size=10, best=1.)]
+    >>> print(compare(results, baseline, threshold=0.1))
+    [('b', 10, 1.0, 1.5)]
+    """
+    old = dict(((r["name"], r["size"]), r["best"]) for r in baseline)
+
+    slower = []
+    for r in results:
+        key = (r["name"], r["size"])
+        if key in old and r["best"] > old[key] * (1 + threshold):
+            slower.append((r["name"], r["size"], old[key], r["best"]))
+
+    return slower
+
+if __name__ == "__main__":
+    from fipy.tools import parallelComm
+
+    sizes = [int(s) for s in parse('--sizes', action='store',
+                                   type='string', default="1000,10000").split(",")]
+    repeat = parse('--repeat', action='store', type='int', default=5)
+    only = parse('--only', action='store', type='string', default=None)
+    output = parse('--output', action='store', type='string', default=None)
+    baselineFile = parse('--baseline', action='store', type='string', default=None)
+    threshold = parse('--threshold', action='store', type='float', default=0.1)
+
+    if parallelComm.procID == 0:
+        log = sys.stdout
+        log.write("%-60s %8s %12s %12s\n" % ("benchmark", "cells", "best / s", "median / s"))
+    else:
+        log = None
+
+    results = run(sizes=sizes, repeat=repeat, only=only, log=log)
+
+    if parallelComm.procID == 0:
+        if output is not None:
+            with open(output, "w") as f:
+                json.dump({"metadata": metadata(), "results": results},
+                          f, indent=2, sort_keys=True)
+
+        slower = []
+        if baselineFile is not None:
+            with open(baselineFile) as f:
+                baseline = json.load(f)["results"]
+            slower = compare(results, baseline, threshold=threshold)
+            for name, size, old, new in slower:
+                print("SLOWER: %s (size %d): %.6f s -> %.6f s (%+.0f%%)"
+                      % (name, size, old, new, 100 * (new / old - 1)))
+            if not slower:
+                print("No benchmark is more than %g%% slower than %s"
+                      % (100 * threshold, baselineFile))
+    else:
+        slower = []
+
+    if parallelComm.Nproc > 1:
+        slower = parallelComm.bcast(slower, root=0)
+
+    sys.exit(1 if slower else 0)
@@ -32,50 +32,101 @@ electrodeposition process :cite:`NIST:damascene:2001`.
 .. _NIST:                 http://www.nist.gov/
 """
 from __future__ import unicode_literals
-from builtins import input
+from builtins import input as _builtinInput
 __docformat__ = 'restructuredtext'
 
 import sys
 
-from fipy.boundaryConditions import *
-from fipy.meshes import *
-from fipy.solvers import *
-from fipy.steppers import *
-from fipy.terms import *
-from fipy.tools import *
-from fipy.variables import *
-from fipy.viewers import *
-
-__all__ = []
-__all__.extend(boundaryConditions.__all__)
-__all__.extend(meshes.__all__)
-__all__.extend(solvers.__all__)
-__all__.extend(steppers.__all__)
-__all__.extend(terms.__all__)
-__all__.extend(tools.__all__)
-__all__.extend(variables.__all__)
-__all__.extend(viewers.__all__)
+# subpackages whose public names make up the `fipy` namespace, in the
+# order that a name is looked up in them
+_subpackages = ("tools",
+                "meshes",
+                "variables",
+                "boundaryConditions",
+                "terms",
+                "steppers",
+                "solvers",
+                "viewers")
 
 # fipy needs to export raw_input whether or not parallel
 
-input_original = input
+input_original = _builtinInput
 
-if parallelComm.Nproc > 1:
-    def mpi_input(prompt=""):
-        parallelComm.Barrier()
+def _mpiInput(prompt=""):
+    from fipy.tools import parallelComm
+
+    parallelComm.Barrier()
+    sys.stdout.flush()
+    if parallelComm.procID == 0:
+        sys.stdout.write(prompt)
         sys.stdout.flush()
-        if parallelComm.procID == 0:
-            sys.stdout.write(prompt)
-            sys.stdout.flush()
-            return sys.stdin.readline()
+        return sys.stdin.readline()
+    else:
+        return ""
+
+def _parallelInput():
+    from fipy.tools import parallelComm
+
+    if parallelComm.Nproc > 1:
+        return _mpiInput
+    else:
+        return input_original
+
+def _allNames():
+    names = []
+    for subpackage in _subpackages:
+        module = __import__("fipy." + subpackage, fromlist=[str("__all__")])
+        names.extend(module.__all__)
+    names.extend(['input', 'input_original'])
+
+    from future.utils import text_to_native_str
+    return [text_to_native_str(n) for n in names]
+
+if sys.version_info >= (3, 7):
+    # Import subpackages only when one of their names is first used
+    # (PEP 562), so that, e.g., ``from fipy import Grid2D`` doesn't
+    # import the solvers and viewers.
+
+    def __getattr__(name):
+        if name == "__all__":
+            value = _allNames()
+        elif name == "input":
+            value = _parallelInput()
+        elif name == "__version__":
+            # may need to ask git
+            from ._version import get_versions
+            value = get_versions()['version']
+        elif name in _subpackages:
+            value = __import__("fipy." + name, fromlist=[str("__all__")])
+        elif name.startswith("__"):
+            raise AttributeError("module 'fipy' has no attribute '%s'" % name)
         else:
-            return ""
-    input = mpi_input
-
-__all__.extend(['input', 'input_original'])
-
-from future.utils import text_to_native_str
-__all__ = [text_to_native_str(n) for n in __all__]
+            for subpackage in _subpackages:
+                module = __import__("fipy." + subpackage, fromlist=[str("__all__")])
+                if name in module.__all__:
+                    value = getattr(module, name)
+                    break
+            else:
+                raise AttributeError("module 'fipy' has no attribute '%s'" % name)
+
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__getattr__("__all__")))
+else:
+    from fipy.boundaryConditions import *
+    from fipy.meshes import *
+    from fipy.solvers import *
+    from fipy.steppers import *
+    from fipy.terms import *
+    from fipy.tools import *
+    from fipy.variables import *
+    from fipy.viewers import *
+
+    input = _parallelInput()
+
+    __all__ = _allNames()
 
 _saved_stdout = sys.stdout
 
@@ -144,6 +195,7 @@ def test(*args):
         shutil.rmtree(tmpDir)
         raise exitErr
 
-from ._version import get_versions
-__version__ = get_versions()['version']
-del get_versions
+if sys.version_info < (3, 7):
+    from ._version import get_versions
+    __version__ = get_versions()['version']
+    del get_versions
@@ -0,0 +1,262 @@
+"""Linear operators that are applied without assembling a sparse matrix
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+
+from fipy.matrices.sparseMatrix import _SparseMatrix
+
+class _MatrixFreeMatrix(_SparseMatrix):
+    """Sum of the contributions that `Term` objects make to a matrix
+
+    Each contribution is kept as the (`vals`, `rows`, `cols`) that were
+    passed to :meth:`addAt`.  Applying the operator to a vector scatters
+    the products of `vals` with the vector directly into the result, so
+    no sparse matrix is ever sorted or compressed.
+
+        >>> L = _MatrixFreeMatrix(shape=(3, 3))
+        >>> L.addAt([3., 10., numerix.pi, 2.5], [0, 0, 1, 2], [2, 1, 1, 0])
+        >>> L.addAtDiagonal(1.)
+        >>> print(L * numerix.array((1., 2., 3.)))
+        [ 30.           8.28318531   5.5       ]
+        >>> print(L)
+         1.000000  10.000000   3.000000  
+            ---     4.141593      ---    
+         2.500000      ---     1.000000  
+        >>> print(L.takeDiagonal())
+        [ 1.          4.14159265  1.        ]
+
+    Operators can be added, scaled and multiplied
+
+        >>> M = 2 * L - L * L
+        >>> x = numerix.array((1., -1., 2.))
+        >>> print(numerix.allclose(M * x, 2 * (L * x) - L * (L * x)))
+        True
+        >>> A = L.numpyArray
+        >>> print(numerix.allclose(M.numpyArray, 2 * A - numerix.NUMERIX.dot(A, A)))
+        True
+
+    and handed to Krylov solvers
+
+        >>> from scipy.sparse.linalg import gmres # doctest: +SCIPY
+        >>> b = L * x
+        >>> y, info = gmres(L.asLinearOperator(), b, tol=1e-12) # doctest: +SCIPY
+        >>> print(numerix.allclose(y, x)) # doctest: +SCIPY
+        True
+    """
+
+    def __init__(self, shape):
+        """
+        Parameters
+        ----------
+        shape : tuple of int
+            The number of rows and columns of the operator
+        """
+        self._operatorShape = tuple(shape)
+        self._blocks = []
+        self._products = []
+        self._flat = None
+
+    @property
+    def _shape(self):
+        return self._operatorShape
+
+    @property
+    def _range(self):
+        return list(range(self._shape[1])), list(range(self._shape[0]))
+
+    def _empty(self):
+        return _MatrixFreeMatrix(shape=self._shape)
+
+    def copy(self):
+        new = self._empty()
+        new._blocks = list(self._blocks)
+        new._products = list(self._products)
+        return new
+
+    def _scaled(self, scale):
+        new = self._empty()
+        new._blocks = [(scale * vals, rows, cols) for vals, rows, cols in self._blocks]
+        new._products = [(scale * s, A, B) for s, A, B in self._products]
+        return new
+
+    def addAt(self, vector, id1, id2):
+        """
+        Add elements of `vector` to the positions in the matrix corresponding to (`id1`,`id2`)
+        """
+        # copy, as the values may be the cache of a `Variable`
+        vector = numerix.array(vector, dtype=float).ravel()
+        id1 = numerix.asarray(id1).ravel()
+        id2 = numerix.asarray(id2).ravel()
+        assert(len(id1) == len(id2) == len(vector))
+
+        self._blocks.append((vector, id1, id2))
+        self._flat = None
+
+    def addAtDiagonal(self, vector):
+        if type(vector) in [type(1), type(1.)]:
+            vector = numerix.repeat(vector, self._shape[0])
+
+        ids = numerix.arange(len(vector))
+        self.addAt(vector, ids, ids)
+
+    def _flatten(self):
+        if self._flat is None:
+            if self._blocks:
+                self._flat = [numerix.concatenate(x) for x in zip(*self._blocks)]
+            else:
+                self._flat = [numerix.zeros((0,), dtype=float),
+                              numerix.zeros((0,), dtype=numerix.INT_DTYPE),
+                              numerix.zeros((0,), dtype=numerix.INT_DTYPE)]
+        return self._flat
+
+    def matvec(self, x):
+        """Apply the operator to the vector `x`
+        """
+        x = numerix.asarray(x, dtype=float).ravel()
+        vals, rows, cols = self._flatten()
+        y = numerix.bincount(rows, weights=vals * x[cols], minlength=self._shape[0])
+        # `bincount` of nothing is an array of int
+        y = numerix.asarray(y, dtype=float)
+        for scale, A, B in self._products:
+            y += scale * A.matvec(B.matvec(x))
+        return y
+
+    def asLinearOperator(self):
+        """The operator as a :class:`~scipy.sparse.linalg.LinearOperator`
+
+        Returns
+        -------
+        ~scipy.sparse.linalg.LinearOperator
+        """
+        from scipy.sparse.linalg import LinearOperator
+        return LinearOperator(self._shape, matvec=self.matvec, dtype=float)
+
+    @property
+    def matrix(self):
+        return self.asLinearOperator()
+
+    def _toCSR(self):
+        """Assemble the operator, for inspection
+        """
+        import scipy.sparse as sp
+        vals, rows, cols = self._flatten()
+        csr = sp.coo_matrix((vals, (rows, cols)), self._shape).tocsr()
+        for scale, A, B in self._products:
+            csr = csr + scale * (A._toCSR() * B._toCSR())
+        return csr
+
+    @property
+    def numpyArray(self):
+        return self._toCSR().toarray()
+
+    def __getitem__(self, index):
+        return self._toCSR()[index]
+
+    def take(self, id1, id2):
+        return numerix.asarray(self._toCSR()[id1, id2]).ravel()
+
+    def put(self, vector, id1, id2):
+        # not `self.addAt`, which `OffsetSparseMatrix` offsets a second time
+        _MatrixFreeMatrix.addAt(self, numerix.asarray(vector) - self.take(id1, id2), id1, id2)
+
+    def takeDiagonal(self):
+        if self._products:
+            return self._toCSR().diagonal()
+        vals, rows, cols = self._flatten()
+        diagonal = (rows == cols)
+        return numerix.asarray(numerix.bincount(rows[diagonal], weights=vals[diagonal],
+                                                minlength=min(self._shape)), dtype=float)
+
+    def putDiagonal(self, vector):
+        vector = vector + numerix.zeros((min(self._shape),), dtype=float)
+        ids = numerix.arange(len(vector))
+        # the diagonal of the whole matrix, not of the block that
+        # `OffsetSparseMatrix` would offset it to
+        _MatrixFreeMatrix.addAt(self, vector - self.takeDiagonal(), ids, ids)
+
+    def _iadd(self, other, sign=1):
+        if isinstance(other, _MatrixFreeMatrix):
+            self._blocks.extend([(sign * vals, rows, cols) for vals, rows, cols in other._blocks])
+            self._products.extend([(sign * scale, A, B) for scale, A, B in other._products])
+            self._flat = None
+        elif numerix.shape(other) != () or other != 0:
+            raise TypeError("can only add another operator to a %s" % self.__class__.__name__)
+
+        return self
+
+    def __iadd__(self, other):
+        return self._iadd(other)
+
+    def __isub__(self, other):
+        return self._iadd(other, sign=-1)
+
+    def __add__(self, other):
+        return self.copy()._iadd(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.copy()._iadd(other, sign=-1)
+
+    def __rsub__(self, other):
+        return (-self)._iadd(other)
+
+    def __mul__(self, other):
+        if isinstance(other, _MatrixFreeMatrix):
+            new = self._empty()
+            # copies, so that later additions to either factor don't
+            # change the product
+            new._products = [(1., self.copy(), other.copy())]
+            return new
+        elif numerix.shape(other) == ():
+            return self._scaled(other)
+        elif numerix.shape(other) == (self._shape[1],):
+            return self.matvec(other)
+        else:
+            raise TypeError
+
+    def __rmul__(self, other):
+        if numerix.shape(other) == ():
+            return self._scaled(other)
+        else:
+            raise TypeError
+
+class _MatrixFreeMeshMatrix(_MatrixFreeMatrix):
+    def __init__(self, mesh, bandwidth=0, sizeHint=None, matrix=None, numberOfVariables=1, numberOfEquations=1, storeZeros=True):
+        """Creates a `_MatrixFreeMatrix` associated with a `Mesh`.
+
+        Takes the same arguments as the assembled matrices, so that it
+        can be handed to `Term` objects in place of them.
+
+        Parameters
+        ----------
+        mesh : ~fipy.meshes.mesh.Mesh
+            The `Mesh` to apply the operator on.
+        numberOfVariables : int
+            The columns of the matrix is determined by `numberOfVariables * self.mesh.numberOfCells`.
+        numberOfEquations : int
+            The rows of the matrix is determined by `numberOfEquations * self.mesh.numberOfCells`.
+        """
+        self.mesh = mesh
+        self.numberOfVariables = numberOfVariables
+        self.numberOfEquations = numberOfEquations
+        _MatrixFreeMatrix.__init__(self, shape=(numberOfEquations * mesh.numberOfCells,
+                                                numberOfVariables * mesh.numberOfCells))
+
+    def _empty(self):
+        return _MatrixFreeMeshMatrix(mesh=self.mesh,
+                                     numberOfVariables=self.numberOfVariables,
+                                     numberOfEquations=self.numberOfEquations)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -19,11 +19,15 @@ def OffsetSparseMatrix(SparseMatrix, numberOfVariables, numberOfEquations):
             SparseMatrix.__init__(self, mesh=mesh, bandwidth=bandwidth, sizeHint=sizeHint,
                                   numberOfVariables=numberOfVariables, numberOfEquations=numberOfEquations)
 
+        def _offsetIDs(self, id1, id2):
+            return (id1 + self.mesh.numberOfCells * self.equationIndex,
+                    id2 + self.mesh.numberOfCells * self.varIndex)
+
         def put(self, vector, id1, id2):
-            SparseMatrix.put(self, vector, id1 + self.mesh.numberOfCells * self.equationIndex, id2 + self.mesh.numberOfCells * self.varIndex)
+            SparseMatrix.put(self, vector, *self._offsetIDs(id1, id2))
 
         def addAt(self, vector, id1, id2):
-            SparseMatrix.addAt(self, vector, id1 + self.mesh.numberOfCells * self.equationIndex, id2 + self.mesh.numberOfCells * self.varIndex)
+            SparseMatrix.addAt(self, vector, *self._offsetIDs(id1, id2))
 
         def addAtDiagonal(self, vector):
             if type(vector) in [type(1), type(1.)]:
@@ -16,6 +16,27 @@ class _ScipyMatrix(_SparseMatrix):
     `_ScipyMatrix` is always `NxN`.
     Allows basic python operations __add__, __sub__ etc.
     Facilitate matrix populating in an easy way.
+
+    Values added with :meth:`addAt`, including those of other matrices
+    added with `+=`, are held as (`vals`, `rows`, `cols`) blocks in
+    coordinate format.  They are summed into the CSR matrix in one pass
+    the next time the matrix is needed, rather than with one sparse
+    matrix addition each.
+
+        >>> L = _ScipyMatrixFromShape(size=3)
+        >>> L.addAt([1., 2.], [0, 1], [0, 1])
+        >>> M = _ScipyMatrixFromShape(size=3)
+        >>> M.addAt([3., 4.], [1, 2], [1, 0])
+        >>> L += M
+        >>> L -= _ScipyIdentityMatrix(size=3)
+        >>> len(L._blocks)
+        2
+        >>> print(L)
+            ---        ---        ---    
+            ---     4.000000      ---    
+         4.000000      ---    -1.000000  
+        >>> len(L._blocks)
+        0
     """
 
     def __init__(self, matrix):
@@ -28,6 +49,53 @@ class _ScipyMatrix(_SparseMatrix):
         """
         self.matrix = matrix
 
+    def _getMatrix(self):
+        if self._blocks:
+            vals, rows, cols = [numerix.concatenate(x) for x in zip(*self._blocks)]
+            self._blocks = []
+            # conversion from coordinate format sums the duplicates
+            temp = sp.coo_matrix((vals, (rows, cols)), self._matrix.shape).tocsr()
+            if self._matrix.nnz == 0:
+                self._matrix = temp
+            else:
+                self._matrix = self._matrix + temp
+
+        return self._matrix
+
+    def _setMatrix(self, matrix):
+        self._matrix = matrix
+        self._blocks = []
+
+    def _delMatrix(self):
+        del self._matrix
+        self._blocks = []
+
+    matrix = property(_getMatrix, _setMatrix, _delMatrix)
+
+    def _addCSR(self, other, sign=1):
+        """Add the CSR matrix `other` to the assembled part of the matrix
+
+        `Term` objects that assemble over the same stencil produce
+        matrices with the same sparsity pattern, which are added by
+        summing their `data` alone.
+        """
+        if other.nnz == 0:
+            return
+
+        mine = self._matrix
+        if mine.nnz == 0:
+            self._matrix = sign * other
+        elif (other.has_sorted_indices and mine.has_sorted_indices
+              and len(other.indices) == len(mine.indices)
+              and numerix.array_equal(other.indptr, mine.indptr)
+              and numerix.array_equal(other.indices, mine.indices)):
+            temp = sp.csr_matrix((mine.data + sign * other.data, mine.indices, mine.indptr),
+                                 mine.shape)
+            temp.has_sorted_indices = True
+            self._matrix = temp
+        else:
+            self._matrix = mine + sign * other
+
     def getCoupledClass(self):
         return _CoupledScipyMeshMatrix
 
@@ -45,7 +113,10 @@ class _ScipyMatrix(_SparseMatrix):
         return self._iadd(other)
 
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        if isinstance(other, _ScipyMatrix) and other._matrix.shape == self._matrix.shape:
+            self._blocks.extend([(sign * vals, rows, cols) for vals, rows, cols in other._blocks])
+            self._addCSR(other._matrix, sign=sign)
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif type(other) in [float, int]:
             fillVec = numerix.repeat(other, self.matrix.nnz)
@@ -155,7 +226,7 @@ class _ScipyMatrix(_SparseMatrix):
 
     @property
     def _shape(self):
-        return self.matrix.shape
+        return self._matrix.shape
 
     @property
     def _range(self):
@@ -218,12 +289,26 @@ class _ScipyMatrix(_SparseMatrix):
             12.300000  10.000000   3.000000  
                 ---     3.141593   2.960000  
              2.500000      ---     2.200000  
+
+        The values are summed into the matrix later, so they are copied
+        in case the caller changes them in the meantime
+
+            >>> L = _ScipyMatrixFromShape(size=2)
+            >>> v = numerix.array([1., 2.])
+            >>> i = numerix.array([0, 1])
+            >>> L.addAt(v, i, i)
+            >>> v[:] = 0
+            >>> i[:] = 0
+            >>> print(L)
+             1.000000      ---    
+                ---     2.000000  
         """
         assert(len(id1) == len(id2) == len(vector))
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + temp
+        # copy, as the values may be the cache of a `Variable`
+        self._blocks.append((numerix.array(vector, copy=True).ravel(),
+                             numerix.array(id1, copy=True).ravel(),
+                             numerix.array(id2, copy=True).ravel()))
 
     def addAtDiagonal(self, vector):
         if type(vector) in [type(1), type(1.)]:
@@ -296,6 +381,177 @@ class _ScipyMeshMatrix(_ScipyMatrixFromShape):
         else:
             return _ScipyMatrixFromShape.__mul__(self, other)
 
+    def _offsetIDs(self, id1, id2):
+        return id1, id2
+
+    def _getSparsityPattern(self, id1s, id2s, stencil):
+        """Obtain the CSR structure of (`id1s`, `id2s`), cached on the mesh.
+
+        Returns
+        -------
+        indptr : ndarray
+            CSR row pointers.
+        indices : ndarray
+            CSR column indices.
+        scatter : ndarray
+            Position in the CSR `data` of each concatenated input value.
+        """
+        key = (stencil, self._offsetIDs(0, 0), self.matrix.shape)
+        patterns = self.mesh._sparsityPatterns
+        cached = patterns.get(key)
+
+        id1, id2 = self._offsetIDs(numerix.concatenate(id1s),
+                                   numerix.concatenate(id2s))
+        N, M = self.matrix.shape
+        positions = numerix.asarray(id1, dtype='l') * M + id2
+
+        # comparing the positions is much cheaper than sorting them
+        if cached is None or not numerix.array_equal(cached[1], positions):
+            flat, scatter = numerix.unique(positions, return_inverse=True)
+            indptr = numerix.concatenate(([0], numerix.cumsum(numerix.bincount(flat // M, minlength=N))))
+            indices = flat % M
+            cached = ((indptr, indices, scatter), positions)
+            patterns[key] = cached
+
+        return cached[0]
+
+    def addAtStencil(self, vectors, id1s, id2s, stencil=None):
+        """
+        Add several `vectors` to the positions in the matrix corresponding
+        to the matching (`id1s`, `id2s`)
+
+        When `stencil` is given, the CSR structure is only computed the
+        first time and values are scattered directly into the `data` of
+        subsequent matrices.
+
+            >>> from fipy import Grid1D
+            >>> from fipy.tools import serialComm
+            >>> mesh = Grid1D(nx=3, communicator=serialComm)
+            >>> id1 = numerix.array([0, 1])
+            >>> id2 = numerix.array([1, 2])
+            >>> for i in range(2):
+            ...     L = _ScipyMeshMatrix(mesh=mesh)
+            ...     L.addAtStencil([[1., 1.], [-1., -1.], [-1., -1.], [1., 1.]],
+            ...                    [id1, id1, id2, id2], [id1, id2, id1, id2],
+            ...                    stencil="test")
+            >>> print(L)
+             1.000000  -1.000000      ---    
+            -1.000000   2.000000  -1.000000  
+                ---    -1.000000   1.000000  
+            >>> len(mesh._sparsityPatterns)
+            1
+
+        The cached structure is only used for the same ids
+
+            >>> L = _ScipyMeshMatrix(mesh=mesh)
+            >>> L.addAtStencil([[1., 1.], [1., 1.], [1., 1.], [1., 1.]],
+            ...                [id1, id1, id2, id2], [id1, id1, id2, id2],
+            ...                stencil="test")
+            >>> print(L)
+             2.000000      ---        ---    
+                ---     4.000000      ---    
+                ---        ---     2.000000  
+        """
+        if stencil is None:
+            _ScipyMatrixFromShape.addAtStencil(self, vectors, id1s, id2s)
+        else:
+            indptr, indices, scatter = self._getSparsityPattern(id1s, id2s, stencil)
+            vector = numerix.concatenate([numerix.asarray(v, dtype='d').ravel() for v in vectors])
+            data = numerix.bincount(scatter, weights=vector, minlength=len(indices))
+            temp = sp.csr_matrix((data, indices.copy(), indptr.copy()), self.matrix.shape)
+            temp.has_sorted_indices = True
+
+            if self.matrix.nnz == 0:
+                self.matrix = temp
+            else:
+                self.matrix = self.matrix + temp
+
+    def _addAtFaceBands(self, coeffs, vectorSize=1):
+        """
+        Fill the bands of the matrix of a uniform grid directly from the
+        face values, which are only sliced, never gathered.
+
+            >>> from fipy import Grid2D, Grid3D, CellVariable, FaceVariable
+            >>> from fipy import DiffusionTerm, ExponentialConvectionTerm
+            >>> from fipy.tools import serialComm
+            >>> for uniform, general in ((Grid2D(nx=4, ny=3, communicator=serialComm),
+            ...                           Grid2D(dx=[1.] * 4, dy=[1.] * 3, communicator=serialComm)),
+            ...                          (Grid3D(nx=3, ny=2, nz=4, communicator=serialComm),
+            ...                           Grid3D(dx=[1.] * 3, dy=[1.] * 2, dz=[1.] * 4, communicator=serialComm))):
+            ...     matrices = []
+            ...     for mesh in (uniform, general):
+            ...         var = CellVariable(mesh=mesh)
+            ...         D = FaceVariable(mesh=mesh, value=mesh.faceCenters[0] + 1.)
+            ...         u = FaceVariable(mesh=mesh, rank=1, value=mesh.faceCenters)
+            ...         eq = DiffusionTerm(coeff=D) + ExponentialConvectionTerm(coeff=u)
+            ...         L = eq._buildAndAddMatrices(var, _ScipyMeshMatrix, dt=1.)[1]
+            ...         matrices.append(L.numpyArray)
+            ...     print(numerix.allclose(*matrices))
+            ...     print(uniform._faceBands is not None, general._faceBands is None)
+            True
+            True True
+            True
+            True True
+        """
+        mesh = self.mesh
+        bands = mesh._faceBands
+        N = mesh.numberOfCells
+        F = mesh.numberOfFaces
+
+        if (bands is None or vectorSize != 1
+            or self._shape != (N, N) or self._offsetIDs(0, 0) != (0, 0)):
+            return False
+
+        coeffs = [numerix.asarray(coeff) for coeff in coeffs]
+        if any(coeff.size != F for coeff in coeffs):
+            return False
+        coeffs = [coeff.reshape((F,)) for coeff in coeffs]
+
+        shape, directions = bands
+        indptr, indices, scatter = self._getFaceBandPattern(shape, directions)
+
+        diagonal = numerix.zeros(shape, 'd')
+        values = [diagonal]
+        for (start, stop, faceShape, interior), lower, upper in directions:
+            cell1diag, cell1offdiag, cell2offdiag, cell2diag = [coeff[start:stop].reshape(faceShape)[interior]
+                                                                for coeff in coeffs]
+            diagonal[lower] += cell1diag
+            diagonal[upper] += cell2diag
+            values += [cell1offdiag, cell2offdiag]
+
+        # each position in the bands is only filled once
+        data = numerix.empty((len(indices),), 'd')
+        data[scatter] = numerix.concatenate([value.ravel() for value in values])
+        temp = sp.csr_matrix((data, indices.copy(), indptr.copy()), self._shape)
+        temp.has_sorted_indices = True
+
+        if self.matrix.nnz == 0:
+            self.matrix = temp
+        else:
+            self._addCSR(temp)
+
+        return True
+
+    def _getFaceBandPattern(self, shape, directions):
+        """CSR structure of the bands of a uniform grid, cached on the mesh
+        """
+        key = ("faceBands", self._offsetIDs(0, 0), self._shape)
+        cached = self.mesh._sparsityPatterns.get(key)
+        if cached is not None:
+            pattern = cached[0]
+        else:
+            cells = numerix.arange(self.mesh.numberOfCells).reshape(shape)
+            id1s = [cells]
+            id2s = [cells]
+            for faces, lower, upper in directions:
+                id1s += [cells[lower], cells[upper]]
+                id2s += [cells[upper], cells[lower]]
+            pattern = self._getSparsityPattern([ids.ravel() for ids in id1s],
+                                               [ids.ravel() for ids in id2s],
+                                               stencil="faceBands")
+
+        return pattern
+
     def asTrilinosMeshMatrix(self):
         """Transforms a scipy matrix into a trilinos matrix and maintains the
         trilinos matrix as an attribute.
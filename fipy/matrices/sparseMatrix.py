@@ -113,6 +113,49 @@ class _SparseMatrix(object):
     def addAt(self, vector, id1, id2):
         pass
 
+    def addAtStencil(self, vectors, id1s, id2s, stencil=None):
+        """
+        Add several `vectors` to the positions in the matrix corresponding
+        to the matching (`id1s`, `id2s`)
+
+        Parameters
+        ----------
+        vectors : list of array_like
+            The values to add.
+        id1s : list of array_like
+            The row indices of each of `vectors`.
+        id2s : list of array_like
+            The column indices of each of `vectors`.
+        stencil : hashable, optional
+            Identifies the arrangement of `id1s` and `id2s` on the mesh,
+            so that matrix classes that can reuse the sparsity pattern
+            from one assembly to the next need only scatter the values.
+        """
+        for vector, id1, id2 in zip(vectors, id1s, id2s):
+            self.addAt(vector, id1, id2)
+
+    def _addAtFaceBands(self, coeffs, vectorSize=1):
+        """
+        Add the contributions of the interior faces of a structured mesh,
+        without looking up the cells adjacent to each face
+
+        Parameters
+        ----------
+        coeffs : tuple of array_like
+            The contributions of each face to the diagonal of its first
+            cell, from its first cell to its second cell, from its second
+            cell to its first cell and to the diagonal of its second cell.
+        vectorSize : int
+            The number of elements of the solution variable in each cell.
+
+        Returns
+        -------
+        bool
+            Whether the contributions were added.  If not, they must be
+            added with :meth:`addAtStencil`.
+        """
+        return False
+
     def addAtDiagonal(self, vector):
         pass
 
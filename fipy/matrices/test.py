@@ -18,6 +18,8 @@ elif solver == 'pyamgx':
 else:
     raise ImportError('Unknown solver package %s' % solver)
 
+docTestModuleNames += ('matrixFreeMatrix',)
+
 def _suite():
     return _LateImportDocTestSuite(docTestModuleNames=docTestModuleNames, base=__name__)
 
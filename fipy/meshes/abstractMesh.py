@@ -256,9 +256,11 @@ class AbstractMesh(object):
                                       cellFaceIDs[i])
             ## add those faces back to the main self.cellFaceIDs
             numerix.put(self.cellFaceIDs[i], faceCellIDs, cellFaceIDs[i])
+        self._raggedCellFaceIDs = self._raggedCellFaceIDs.fromPadded(self.cellFaceIDs)
 
         ## calculate new topology
         self._setTopology()
+        self._sparsityPatternCache = {}
 
         ## calculate new geometry
         self._handleFaceConnection()
@@ -344,15 +346,11 @@ class AbstractMesh(object):
         self_XvertexCoords = selfc.vertexCoords[..., self_Xvertices]
         other_XvertexCoords = otherc.vertexCoords[..., other_Xvertices]
 
-        closest = numerix.nearest(self_XvertexCoords, other_XvertexCoords)
-
-        # just because they're closest, doesn't mean they're close
-        tmp = self_XvertexCoords[..., closest] - other_XvertexCoords
-        distance = numerix.sqrtDot(tmp, tmp)
         # only want vertex pairs that are 100x closer than the smallest
         # cell-to-cell distance
-        close = distance < resolution * min(selfc._cellToCellDistances.min(),
-                                            otherc._cellToCellDistances.min())
+        tolerance = resolution * min(selfc._cellToCellDistances.min(),
+                                     otherc._cellToCellDistances.min())
+        closest, close = _closeVertices(self_XvertexCoords, other_XvertexCoords, tolerance)
         vertexCorrelates = numerix.array((self_Xvertices[closest[close]],
                                           other_Xvertices[close]))
 
@@ -384,12 +382,10 @@ class AbstractMesh(object):
             self_faceVertexIDs = MA.masked_values(self_faceVertexIDs, -1)
 
         # want self's Faces for which all faceVertexIDs are in vertexCorrelates
-        self_matchingFaces = numerix.in1d(self_faceVertexIDs,
-                                          vertexCorrelates[0]).reshape(self_faceVertexIDs.shape).all(axis=0).nonzero()[0]
+        self_matchingFaces = _facesOfVertices(self_faceVertexIDs, vertexCorrelates[0])
 
         # want other's Faces for which all faceVertexIDs are in vertexCorrelates
-        other_matchingFaces = numerix.in1d(other_faceVertexIDs,
-                                           vertexCorrelates[1]).reshape(other_faceVertexIDs.shape).all(axis=0).nonzero()[0]
+        other_matchingFaces = _facesOfVertices(other_faceVertexIDs, vertexCorrelates[1])
 
         # map other's Vertex IDs to new Vertex IDs,
         # accounting for overlaps with self's Vertex IDs
@@ -398,38 +394,13 @@ class AbstractMesh(object):
         vertex_map[verticesToAdd] = numerix.arange(otherNumVertices - len(vertexCorrelates[1])) + selfNumVertices
         vertex_map[vertexCorrelates[1]] = vertexCorrelates[0]
 
-        # calculate hashes of faceVertexIDs for comparing Faces
-
-        if self_matchingFaces.shape[-1] == 0:
-            self_faceHash = numerix.empty(self_matchingFaces.shape[:-1] + (0,), dtype="str")
-        else:
-            # sort each of self's Face's vertexIDs for canonical comparison
-            self_faceHash = numerix.sort(self_faceVertexIDs[..., self_matchingFaces], axis=0)
-            # then hash the Faces for comparison (NumPy set operations are only for 1D arrays)
-            self_faceHash = numerix.apply_along_axis(str, axis=0, arr=self_faceHash)
-
-        face_sort = numerix.argsort(self_faceHash)
-        self_faceHash = self_faceHash[face_sort]
-        self_matchingFaces = self_matchingFaces[face_sort]
+        # Faces are the same if they have the same Vertices, in any order
+        self_faceKeys = _faceKeys(self_faceVertexIDs[..., self_matchingFaces])
+        other_faceKeys = _faceKeys(other_faceVertexIDs[..., other_matchingFaces], vertex_map)
 
-        if other_matchingFaces.shape[-1] == 0:
-            other_faceHash = numerix.empty(other_matchingFaces.shape[:-1] + (0,), dtype="str")
-        else:
-            # convert each of other's Face's vertexIDs to new IDs
-            other_faceHash = vertex_map[other_faceVertexIDs[..., other_matchingFaces]]
-            # sort each of other's Face's vertexIDs for canonical comparison
-            other_faceHash = numerix.sort(other_faceHash, axis=0)
-            # then hash the Faces for comparison (NumPy set operations are only for 1D arrays)
-            other_faceHash = numerix.apply_along_axis(str, axis=0, arr=other_faceHash)
-
-        face_sort = numerix.argsort(other_faceHash)
-        other_faceHash = other_faceHash[face_sort]
-        other_matchingFaces = other_matchingFaces[face_sort]
-
-        self_matchingFaces = self_matchingFaces[numerix.in1d(self_faceHash,
-                                                             other_faceHash)]
-        other_matchingFaces = other_matchingFaces[numerix.in1d(other_faceHash,
-                                                               self_faceHash)]
+        self_matches, other_matches = _matchingColumns(self_faceKeys, other_faceKeys)
+        self_matchingFaces = self_matchingFaces[self_matches]
+        other_matchingFaces = other_matchingFaces[other_matches]
 
         faceCorrelates = numerix.array((self_matchingFaces,
                                         other_matchingFaces))
@@ -487,6 +458,28 @@ class AbstractMesh(object):
             self._interiorFaceIDs = numerix.nonzero(self.interiorFaces)[0]
         return self._interiorFaceIDs
 
+    @property
+    def _sparsityPatterns(self):
+        """Sparse matrix structures, keyed by assembly stencil."""
+        if not hasattr(self, '_sparsityPatternCache'):
+            self._sparsityPatternCache = {}
+        return self._sparsityPatternCache
+
+    @property
+    def _faceBands(self):
+        """Arrangement of the interior faces of a structured grid
+
+        `None`, unless the cells and faces are numbered as those of a
+        uniform grid, in which case it is `(shape, directions)`: the cells
+        form an array of `shape` and each direction is `(faces, lower,
+        upper)`.  `faces` is `(start, stop, faceShape, interior)`, such
+        that `values[start:stop].reshape(faceShape)[interior]` are the
+        values at the interior faces normal to that direction, and
+        `lower` and `upper` select the cells on either side of those
+        faces, which are their first and second cells.
+        """
+        return None
+
     @property
     def interiorFaceCellIDs(self):
         if not hasattr(self, '_interiorFaceCellIDs'):
@@ -537,6 +530,21 @@ class AbstractMesh(object):
         """
         return self.topology._globalNonOverlappingCellIDs
 
+    @property
+    def _gatheredGlobalNonOverlappingCellIDs(self):
+        """
+        Return the `_globalNonOverlappingCellIDs` of all processors,
+        one after the other in the order of `allgather` and `gather`.
+
+        .. note:: Only exchanged once, as the partitioning of the mesh
+           doesn't change
+        """
+        if self.communicator.Nproc == 1:
+            return self._globalNonOverlappingCellIDs
+        if not hasattr(self, '_gatheredCellIDs'):
+            self._gatheredCellIDs = numerix.concatenate(self.communicator.allgather(self._globalNonOverlappingCellIDs))
+        return self._gatheredCellIDs
+
     @property
     def _globalOverlappingCellIDs(self):
         """
@@ -623,6 +631,21 @@ class AbstractMesh(object):
         """
         return self.topology._globalNonOverlappingFaceIDs
 
+    @property
+    def _gatheredGlobalNonOverlappingFaceIDs(self):
+        """
+        Return the `_globalNonOverlappingFaceIDs` of all processors,
+        one after the other in the order of `allgather` and `gather`.
+
+        .. note:: Only exchanged once, as the partitioning of the mesh
+           doesn't change
+        """
+        if self.communicator.Nproc == 1:
+            return self._globalNonOverlappingFaceIDs
+        if not hasattr(self, '_gatheredFaceIDs'):
+            self._gatheredFaceIDs = numerix.concatenate(self.communicator.allgather(self._globalNonOverlappingFaceIDs))
+        return self._gatheredFaceIDs
+
     @property
     def _globalOverlappingFaceIDs(self):
         """
@@ -1149,6 +1172,101 @@ class AbstractMesh(object):
             return float((yCoords.max() - yCoords.min()) / (xCoords.max() - xCoords.min()))
 
 
+def _closeVertices(data, points, tolerance):
+    """Find the vertices of `data` that are closest to `points`, and
+    whether they are within `tolerance` of them
+
+        >>> data = numerix.array(((0., 1., 2.), (0., 0., 0.)))
+        >>> points = numerix.array(((2.001, 0.5, 1.), (0., 0., 0.)))
+        >>> closest, close = _closeVertices(data, points, tolerance=0.01)
+        >>> print(closest[close])
+        [2 1]
+        >>> print(close)
+        [ True False  True]
+    """
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        cKDTree = None
+
+    if cKDTree is not None and data.shape[-1] > 0 and points.shape[-1] > 0:
+        distance, closest = cKDTree(numerix.asarray(data).swapaxes(0, 1)).query(numerix.asarray(points).swapaxes(0, 1),
+                                                                                  distance_upper_bound=tolerance)
+        close = distance < tolerance
+        # points with no vertex within `tolerance` are given `len(data)`
+        closest = numerix.where(close, closest, 0)
+    else:
+        closest = numerix.nearest(data, points)
+        # just because they're closest, doesn't mean they're close
+        tmp = data[..., closest] - points
+        close = numerix.sqrtDot(tmp, tmp) < tolerance
+
+    return numerix.asarray(closest, dtype=numerix.INT_DTYPE), numerix.asarray(close, dtype=bool)
+
+def _facesOfVertices(faceVertexIDs, vertexIDs):
+    """Faces all of whose vertices are among `vertexIDs`
+
+        >>> faceVertexIDs = MA.masked_values(((0, 1, 2),
+        ...                                   (1, 2, 3),
+        ...                                   (-1, 0, 1)), -1)
+        >>> print(_facesOfVertices(faceVertexIDs, (0, 1, 2)))
+        [0 1]
+    """
+    inVertices = numerix.in1d(MA.filled(faceVertexIDs, 0), vertexIDs).reshape(faceVertexIDs.shape)
+    return (inVertices | MA.getmaskarray(faceVertexIDs)).all(axis=0).nonzero()[0]
+
+def _faceKeys(faceVertexIDs, vertexMap=None):
+    """Vertex IDs of each face, sorted, with missing vertices as `-1`
+
+        >>> faceVertexIDs = MA.masked_values(((3, 1),
+        ...                                   (2, 0),
+        ...                                   (-1, 4)), -1)
+        >>> print(_faceKeys(faceVertexIDs))
+        [[-1  0]
+         [ 2  1]
+         [ 3  4]]
+        >>> print(_faceKeys(faceVertexIDs, vertexMap=numerix.arange(5) * 10))
+        [[-1  0]
+         [20 10]
+         [30 40]]
+    """
+    mask = MA.getmaskarray(faceVertexIDs)
+    IDs = numerix.asarray(MA.filled(faceVertexIDs, 0), dtype=numerix.INT_DTYPE)
+    if vertexMap is not None:
+        IDs = vertexMap[IDs]
+    return numerix.sort(numerix.where(mask, -1, IDs), axis=0)
+
+def _matchingColumns(a, b):
+    """Pair the columns of `a` with the identical columns of `b`
+
+    The columns of each array must be distinct.  All columns are sorted
+    together, so that identical columns are adjacent.
+
+        >>> a = numerix.array(((0, 1, 2, 3),
+        ...                    (4, 5, 6, 7)))
+        >>> b = numerix.array(((3, 9, 1),
+        ...                    (7, 9, 5)))
+        >>> ia, ib = _matchingColumns(a, b)
+        >>> print(ia, ib)
+        [1 3] [2 0]
+    """
+    a = numerix.asarray(a)
+    b = numerix.asarray(b)
+    columns = numerix.concatenate((a, b), axis=1)
+    if columns.shape[-1] == 0:
+        empty = numerix.arange(0)
+        return empty, empty
+
+    # sort by the first row, then the second, ...
+    order = numerix.lexsort(columns[::-1])
+    columns = columns[..., order]
+    same = (columns[..., 1:] == columns[..., :-1]).all(axis=0)
+    # `lexsort` is stable, so the column of `a` comes first
+    first = order[:-1][same]
+    second = order[1:][same]
+    pairs = (first < a.shape[-1]) & (second >= a.shape[-1])
+    return first[pairs], second[pairs] - a.shape[-1]
+
 def _madmin(x):
     if len(x) == 0:
         return 0
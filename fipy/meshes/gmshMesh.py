@@ -2,13 +2,16 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import unicode_literals
 from builtins import object
-from builtins import zip
 from builtins import range
 from builtins import str
 __docformat__ = 'restructuredtext'
 
+import hashlib
+import json
+import mmap
 import os
 from subprocess import Popen, PIPE
+import struct
 import sys
 import tempfile
 from textwrap import dedent
@@ -94,7 +97,7 @@ def _gmshVersion(communicator=parallelComm):
     version = gmshVersion(communicator) or "0.0"
     return StrictVersion(version)
 
-def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parallelComm, order=1, mode='r', background=None):
+def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parallelComm, order=1, mode='r', background=None, cacheDir=None):
     """Open a Gmsh `MSH` file
 
     Parameters
@@ -114,11 +117,33 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
         Add a `b` to the mode for binary files.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cacheDir : str
+        If not `None`, a directory in which to keep the mesh data read from
+        the `MSH` file.  When `name`, `order`, and the number of processes
+        are unchanged, the mesh is taken from this cache instead of running
+        Gmsh and deriving the cells and faces again.  The version of Gmsh
+        is not checked, so the cache should be emptied when Gmsh is
+        upgraded.
     """
 
     if order > 1:
         communicator = serialComm
 
+    # a cached mesh needs neither Gmsh nor its version
+    cacheFile = None
+    if cacheDir is not None and mode.startswith('r'):
+        cacheFile = _meshCacheFile(cacheDir=cacheDir, name=name,
+                                   dimensions=dimensions,
+                                   coordDimensions=coordDimensions,
+                                   communicator=communicator,
+                                   order=order,
+                                   background=background)
+        cached = _readMeshCache(cacheFile)
+        # either every process reads its partition from the cache, or
+        # they all run Gmsh together
+        if communicator.all(nx.array(cached is not None)):
+            return _CachedMSHFile(cached=cached, communicator=communicator)
+
     # Enforce gmsh version to be either >= 2 or 2.5, based on Nproc.
     version = _gmshVersion(communicator=communicator)
     if version < StrictVersion("2.0"):
@@ -145,16 +170,16 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
         else:
             # Gmsh isn't picky about file extensions,
             # so we peek at the start of the file to deduce the type
-            f = open(name, 'r')
+            f = open(name, 'rb')
             filetype = f.readline().strip()
             f.close()
-            if filetype == "$MeshFormat":
+            if filetype == b"$MeshFormat":
                 geoFile = None
                 mshFile = name
                 gmshOutput = ""
-            elif filetype == "$NOD":
+            elif filetype == b"$NOD":
                 raise SyntaxError("Gmsh MSH file format version 1.0 is not supported")
-            elif filetype == "$PostFormat":
+            elif filetype == b"$PostFormat":
                 raise SyntaxError("Gmsh POS post-processing format cannot be used to generate a Mesh")
             else:
                 # must be a Gmsh script file
@@ -237,7 +262,52 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
                    communicator=communicator,
                    gmshOutput=gmshOutput,
                    mode=mode,
-                   fileIsTemporary=fileIsTemporary)
+                   fileIsTemporary=fileIsTemporary,
+                   cacheFile=cacheFile)
+
+# bump whenever the layout of the mesh cache changes
+_meshCacheVersion = 2
+
+def _meshCacheFile(cacheDir, name, dimensions, coordDimensions, communicator, order, background):
+    """Return the path of the cached mesh data for this process
+
+    The file name is a hash of the contents of `name` (the file, if it
+    exists, or else the script itself) and the arguments that affect
+    the resulting mesh, so that the cache can be found without running
+    Gmsh. Files included by a Gmsh script are not hashed.
+    """
+    key = hashlib.sha256()
+    if os.path.exists(name):
+        with open(name, 'rb') as f:
+            for block in iter(lambda: f.read(2**20), b""):
+                key.update(block)
+    else:
+        key.update(name.encode("utf-8"))
+
+    key.update(repr((_meshCacheVersion, dimensions, coordDimensions,
+                     order, communicator.Nproc)).encode("ascii"))
+
+    if background is not None:
+        key.update(nx.ascontiguousarray(background.mesh.cellCenters, dtype=float).tobytes())
+        key.update(nx.ascontiguousarray(background.value, dtype=float).tobytes())
+
+    return os.path.join(cacheDir, "%s-%d.npz" % (key.hexdigest(), communicator.procID))
+
+def _readMeshCache(cacheFile):
+    """Return the arrays stored in `cacheFile` or `None` if unavailable
+    """
+    if not os.path.exists(cacheFile):
+        return None
+
+    try:
+        data = nx.load(cacheFile)
+        try:
+            return dict((key, data[key]) for key in data.files)
+        finally:
+            data.close()
+    except Exception:
+        # an unreadable cache is simply regenerated
+        return None
 
 def openPOSFile(name, communicator=parallelComm, mode='w'):
     """Open a Gmsh `POS` post-processing file
@@ -478,7 +548,8 @@ class MSHFile(GmshFile):
     Does not support gmsh versions < 2. If partitioning, gmsh
     version must be >= 2.5.
 
-    TODO: Refactor face extraction functions.
+    Reads MSH file formats 2 and 4.1, both ASCII and binary. Partitioned
+    meshes must be in format 2.
     """
     def __init__(self, filename,
                        dimensions,
@@ -486,7 +557,8 @@ class MSHFile(GmshFile):
                        communicator=parallelComm,
                        gmshOutput="",
                        mode='r',
-                       fileIsTemporary=False):
+                       fileIsTemporary=False,
+                       cacheFile=None):
         """
         Parameters
         ----------
@@ -509,181 +581,491 @@ class MSHFile(GmshFile):
             Add a `b` to the mode for binary files.
         fileIsTemporary : bool
             If `True`, `filename` should be cleaned up on deletion
+        cacheFile : str
+            If not `None`, where `read` should save the mesh data for reuse
+            by `openMSHFile`
         """
         self.dimensions = dimensions
         self.coordDimensions = coordDimensions
         self.gmshOutput = gmshOutput
+        self.cacheFile = cacheFile
 
         self.mesh = None
         self.meshWritten = False
 
         GmshFile.__init__(self, filename=filename, communicator=communicator, mode=mode, fileIsTemporary=fileIsTemporary)
 
-    def _getMetaData(self):
+    def _getMetaData(self, buf):
         """
         Extracts `gmshVersion`, file-type, and data-size in that
         order.
+
+        Binary files follow the format line with the integer 1, from which
+        the byte order of the file is determined.
+        """
+        offset = self._seekForHeader(buf, "MeshFormat")
+        line, offset = self._readLine(buf, offset)
+        metaData = [float(x) for x in line.split()]
+
+        self.byteOrder = "<"
+        if metaData[1] == 1:
+            one, offset = self._binaryData(buf, "<i4", 1, offset)
+            if one[0] != 1:
+                self.byteOrder = ">"
+
+        return metaData
+
+    def _seekForHeader(self, buf, title):
+        """
+        Find the section header for `title` in the memory-mapped file
+        `buf` and return the offset of the line that follows it.
+        """
+        header = ("$%s" % title).encode("ascii")
+        offset = 0
+        while True:
+            offset = buf.find(header, offset)
+            if offset < 0:
+                raise EOFError("No `%s' header found!" % title)
+            line, nextLine = self._readLine(buf, offset)
+            if ((offset == 0 or buf[offset-1:offset] == b"\n")
+                and line.strip() == header):
+                return nextLine
+            offset += len(header)
+
+    def _seekForFooter(self, buf, offset, title):
+        """
+        Find the end of the ASCII section `title` that begins at `offset`.
+        """
+        end = buf.find(("$End%s" % title).encode("ascii"), offset)
+        if end < 0:
+            raise EOFError("No `$End%s' footer found!" % title)
+        return end
+
+    @staticmethod
+    def _readLine(buf, offset):
         """
-        self._seekForHeader("MeshFormat")
-        metaData = self.fileobj.readline().split()
-        self.fileobj.seek(0)
-        return [float(x) for x in metaData]
+        Return the line of `buf` starting at `offset` and the offset of the
+        line that follows it.
+        """
+        end = buf.find(b"\n", offset)
+        if end < 0:
+            end = len(buf)
+        return buf[offset:end], end + 1
+
+    @staticmethod
+    def _binaryData(buf, dtype, count, offset):
+        """
+        Copy `count` items of `dtype` starting at `offset` out of `buf`.
 
-    def _isolateData(self, title):
+        Returns the array and the offset just past it. The data are copied so
+        that no array keeps the memory map open.
         """
-        Gets all data between $[title] and $End[title], writes
-        it out to its own file.
+        dtype = nx.dtype(dtype)
+        if count == 0:
+            return nx.zeros((0,), dtype=dtype), offset
+        data = nx.frombuffer(buf, dtype=dtype, count=count, offset=offset).copy()
+        return data, offset + count * dtype.itemsize
+
+    def _asciiData(self, buf, offset, title, dtype):
         """
-        newF, newPath = tempfile.mkstemp(title, text=True)
-        newF = os.fdopen(newF, 'w')
+        Parse all of the whitespace-separated numbers from `offset` to the
+        end of section `title` as a flat array of `dtype`.
+        """
+        end = self._seekForFooter(buf, offset, title)
+        return nx.fromstring(buf[offset:end], dtype=dtype, sep=" ")
+
+    def _asciiChunks(self, buf, offset, title, chunkSize=2**24):
+        """
+        Yield the lines from `offset` to the end of section `title` in
+        blocks of roughly `chunkSize` bytes that end on line boundaries.
+        """
+        end = self._seekForFooter(buf, offset, title)
+        while offset < end:
+            stop = min(offset + chunkSize, end)
+            if stop < end:
+                stop = buf.find(b"\n", stop, end) + 1 or end
+            yield buf[offset:stop]
+            offset = stop
+
+    @staticmethod
+    def _tokensPerLine(chunk):
+        """
+        Count the whitespace-separated tokens on each line of `chunk`.
+        """
+        chars = nx.frombuffer(chunk, dtype=nx.uint8)
+        solid = chars > ord(" ")
+        tokenStarts = solid.copy()
+        tokenStarts[1:] &= ~solid[:-1]
+        tokenStarts = nx.nonzero(tokenStarts)[0]
+        lineEnds = nx.nonzero(chars == ord("\n"))[0]
+        if len(chars) > 0 and chars[-1] != ord("\n"):
+            lineEnds = nx.concatenate((lineEnds, [len(chars)]))
+        return nx.diff(nx.concatenate(([0], nx.searchsorted(tokenStarts, lineEnds))))
+
+    def _numNodes(self, shapeType):
         try:
-            self._seekForHeader(title)
-        except Exception as e:
-            newF.close()
-            os.unlink(newPath)
-            raise
+            return _numNodesPerElement[shapeType]
+        except KeyError:
+            raise GmshException("Gmsh element type %d is not supported" % shapeType)
 
-        # extract the actual data within section
-        while True:
-            line = self.fileobj.readline()
-            if ("$End%s" % title) not in line:
-                newF.write(line)
-            else: break
+    def _readNodes(self, buf):
+        """
+        Return the Gmsh IDs and the coordinates, shape `(N, 3)`, of all nodes.
+        """
+        offset = self._seekForHeader(buf, "Nodes")
 
-        self.fileobj.seek(0)
-        newF.close()
-        return newPath
+        if self.version < 3:
+            if self.fileType == 0:
+                data = self._asciiData(buf, offset, "Nodes", dtype=float)
+                data = data[1:].reshape((-1, 4))
+                return data[..., 0].astype(nx.INT_DTYPE), data[..., 1:]
+            else:
+                line, offset = self._readLine(buf, offset)
+                nodeType = nx.dtype([("tag", self.byteOrder + "i4"),
+                                     ("coords", self.byteOrder + "f8", (3,))])
+                data, offset = self._binaryData(buf, nodeType, int(line), offset)
+                return data["tag"].astype(nx.INT_DTYPE), data["coords"].astype(float)
+
+        tags = []
+        coords = []
+        if self.fileType == 0:
+            data = self._asciiData(buf, offset, "Nodes", dtype=float)
+            numBlocks = int(data[0])
+            pos = 4
+            for block in range(numBlocks):
+                entityDim, entityTag, parametric, numNodes = data[pos:pos+4].astype(int)
+                pos += 4
+                numCoords = 3 + (entityDim if parametric and entityDim in (1, 2) else 0)
+                tags.append(data[pos:pos+numNodes].astype(nx.INT_DTYPE))
+                pos += numNodes
+                coords.append(data[pos:pos+numNodes*numCoords].reshape((numNodes, numCoords))[..., :3])
+                pos += numNodes * numCoords
+        else:
+            sizeType = self.byteOrder + ("u8" if self.dataSize == 8 else "u4")
+            blockType = nx.dtype([("entityDim", self.byteOrder + "i4"),
+                                  ("entityTag", self.byteOrder + "i4"),
+                                  ("parametric", self.byteOrder + "i4"),
+                                  ("numNodes", sizeType)])
+            header, offset = self._binaryData(buf, sizeType, 4, offset)
+            for block in range(int(header[0])):
+                info, offset = self._binaryData(buf, blockType, 1, offset)
+                entityDim, parametric, numNodes = (int(info["entityDim"][0]),
+                                                   int(info["parametric"][0]),
+                                                   int(info["numNodes"][0]))
+                numCoords = 3 + (entityDim if parametric and entityDim in (1, 2) else 0)
+                blockTags, offset = self._binaryData(buf, sizeType, numNodes, offset)
+                tags.append(blockTags.astype(nx.INT_DTYPE))
+                blockCoords, offset = self._binaryData(buf, self.byteOrder + "f8",
+                                                       numNodes * numCoords, offset)
+                coords.append(blockCoords.reshape((numNodes, numCoords))[..., :3].astype(float))
+
+        return (nx.concatenate(tags + [nx.zeros((0,), dtype=nx.INT_DTYPE)]),
+                nx.concatenate(coords + [nx.zeros((0, 3))]))
+
+    def _tagsToElementData(self, ids, shapes, tags, numTags, nodes):
+        """
+        Interpret the MSH 2 tags of each element.
 
-    def _seekForHeader(self, title):
+        The first two tags are the physical and geometrical entities. If
+        there are more, the next is a count of the partitions the element
+        belongs to, followed by the partitions themselves (negative if the
+        element is a ghost in that partition).
         """
-        Iterate through a file until we end up at the section header
-        for `title`. Function has obvious side-effects on `self.fileobj`.
+        if tags.shape[1] < 3:
+            tags = nx.concatenate((tags, nx.zeros((len(tags), 3 - tags.shape[1]),
+                                                  dtype=tags.dtype)), axis=1)
+
+        hasEntities = numTags >= 2
+        physicalEntities = nx.where(hasEntities, tags[..., 0], -1)
+        geometricalEntities = nx.where(hasEntities, tags[..., 1], -1)
+
+        # the partition tags for don't seem to always be present
+        # and don't always make much sense when they are
+        hasPartitions = numTags >= 3
+        isCell = nx.in1d(shapes, list(self.numFacesPerCell.keys()))
+        disagree = hasPartitions & isCell & (tags[..., 2] != numTags - 3)
+        if nx.any(disagree):
+            first = nx.nonzero(disagree)[0][0]
+            warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[first, 2], numTags[first] - 3),
+                          SyntaxWarning, stacklevel=4)
+
+        return _ElementData(ids=ids,
+                            shapes=shapes,
+                            nodes=nodes,
+                            physicalEntities=physicalEntities,
+                            geometricalEntities=geometricalEntities,
+                            partitions=tags[..., 3:])
+
+    def _readEntityPhysicals(self, buf):
         """
-        while True:
-            line = self.fileobj.readline()
-            if len(line) == 0:
-                raise EOFError("No `%s' header found!" % title)
-                break
-            elif (("$%s" % title) not in line):
+        Return a dictionary mapping the `(dimension, tag)` of each MSH 4
+        entity to the first of its physical tags.
+
+        Unlike MSH 2, MSH 4 elements do not carry tags of their own; they
+        take those of the entity they belong to.
+        """
+        entityPhysicals = {}
+        try:
+            offset = self._seekForHeader(buf, "Entities")
+        except EOFError:
+            return entityPhysicals
+
+        if self.fileType == 0:
+            end = self._seekForFooter(buf, offset, "Entities")
+            tokens = iter(buf[offset:end].split())
+            readInts = lambda n: [int(next(tokens)) for i in range(n)]
+            readSizes = readInts
+            skipFloats = lambda n: [next(tokens) for i in range(n)]
+        else:
+            sizeType = "Q" if self.dataSize == 8 else "I"
+            position = [offset]
+            def unpack(fmt, n):
+                fmt = self.byteOrder + "%d%s" % (n, fmt)
+                values = struct.unpack_from(fmt, buf, position[0])
+                position[0] += struct.calcsize(fmt)
+                return values
+            readSizes = lambda n: unpack(sizeType, n)
+            readInts = lambda n: unpack("i", n)
+            skipFloats = lambda n: unpack("d", n)
+
+        for dim, count in enumerate(readSizes(4)):
+            for i in range(count):
+                tag, = readInts(1)
+                skipFloats(3 if dim == 0 else 6)
+                numPhysicals, = readSizes(1)
+                physicals = readInts(numPhysicals)
+                if dim > 0:
+                    numBounding, = readSizes(1)
+                    readInts(numBounding)
+                entityPhysicals[(dim, tag)] = physicals[0] if numPhysicals > 0 else 0
+
+        return entityPhysicals
+
+    def _readElements(self, buf):
+        """
+        Return an `_ElementData` for all of the elements in the file, in the
+        order they are listed.
+        """
+        offset = self._seekForHeader(buf, "Elements")
+        blocks = []
+
+        if self.version < 3:
+            if self.fileType == 0:
+                line, offset = self._readLine(buf, offset) # skip number of elements
+                for chunk in self._asciiChunks(buf, offset, "Elements"):
+                    ints = nx.fromstring(chunk, dtype=nx.INT_DTYPE, sep=" ")
+                    counts = self._tokensPerLine(chunk)
+                    counts = counts[counts > 0]
+                    starts = nx.cumsum(counts) - counts
+                    numTags = ints[starts + 2]
+                    blocks.append(self._tagsToElementData(ids=ints[starts],
+                                                          shapes=ints[starts + 1],
+                                                          tags=_ragged(ints, starts + 3, numTags),
+                                                          numTags=numTags,
+                                                          nodes=_ragged(ints, starts + 3 + numTags,
+                                                                        counts - 3 - numTags)))
+            else:
+                line, offset = self._readLine(buf, offset)
+                numElements = int(line)
+                intType = self.byteOrder + "i4"
+                while numElements > 0:
+                    (shapeType, count, numTags), offset = self._binaryData(buf, intType, 3, offset)
+                    numNodes = self._numNodes(shapeType)
+                    data, offset = self._binaryData(buf, intType, count * (1 + numTags + numNodes), offset)
+                    data = data.reshape((count, -1)).astype(nx.INT_DTYPE)
+                    blocks.append(self._tagsToElementData(ids=data[..., 0],
+                                                          shapes=nx.zeros((count,), dtype=nx.INT_DTYPE) + shapeType,
+                                                          tags=data[..., 1:1+numTags],
+                                                          numTags=nx.zeros((count,), dtype=nx.INT_DTYPE) + numTags,
+                                                          nodes=data[..., 1+numTags:]))
+                    numElements -= count
+        else:
+            if self.communicator.Nproc > 1:
+                raise GmshException("Partitioned meshes must be read from MSH 2 files")
+
+            entityPhysicals = self._readEntityPhysicals(buf)
+
+            def elementBlock(entityDim, entityTag, shapeType, data):
+                count = len(data)
+                return _ElementData(ids=data[..., 0],
+                                    shapes=nx.zeros((count,), dtype=nx.INT_DTYPE) + shapeType,
+                                    nodes=data[..., 1:],
+                                    physicalEntities=nx.zeros((count,), dtype=nx.INT_DTYPE)
+                                                     + entityPhysicals.get((entityDim, entityTag), 0),
+                                    geometricalEntities=nx.zeros((count,), dtype=nx.INT_DTYPE) + entityTag)
+
+            if self.fileType == 0:
+                data = self._asciiData(buf, offset, "Elements", dtype=nx.INT_DTYPE)
+                pos = 4
+                for block in range(data[0]):
+                    entityDim, entityTag, shapeType, count = data[pos:pos+4]
+                    pos += 4
+                    width = 1 + self._numNodes(shapeType)
+                    blocks.append(elementBlock(entityDim, entityTag, shapeType,
+                                               data[pos:pos+count*width].reshape((count, width))))
+                    pos += count * width
+            else:
+                sizeType = self.byteOrder + ("u8" if self.dataSize == 8 else "u4")
+                blockType = nx.dtype([("entityDim", self.byteOrder + "i4"),
+                                      ("entityTag", self.byteOrder + "i4"),
+                                      ("shapeType", self.byteOrder + "i4"),
+                                      ("count", sizeType)])
+                header, offset = self._binaryData(buf, sizeType, 4, offset)
+                for block in range(int(header[0])):
+                    info, offset = self._binaryData(buf, blockType, 1, offset)
+                    entityDim, entityTag, shapeType, count = [int(info[name][0]) for name in blockType.names]
+                    width = 1 + self._numNodes(shapeType)
+                    data, offset = self._binaryData(buf, sizeType, count * width, offset)
+                    blocks.append(elementBlock(entityDim, entityTag, shapeType,
+                                               data.reshape((count, width)).astype(nx.INT_DTYPE)))
+
+        return _ElementData.concatenate(blocks)
+
+    def _readPhysicalNames(self, buf):
+        physicalNames = {
+            0: dict(),
+            1: dict(),
+            2: dict(),
+            3: dict()
+        }
+        try:
+            offset = self._seekForHeader(buf, "PhysicalNames")
+        except EOFError as e:
+            return physicalNames
+
+        end = self._seekForFooter(buf, offset, "PhysicalNames")
+        names = buf[offset:end].decode("utf-8").splitlines()
+
+        for nm in names[1:]: # skip number of names
+            nm = nm.split()
+            if len(nm) == 0:
                 continue
+            if self.version > 2.0:
+                dim = [int(nm.pop(0))]
             else:
-                break # found header
+                # Gmsh format prior to 2.1 did not unambiguously tie
+                # physical names to physical entities of different dimensions
+                # http://article.gmane.org/gmane.comp.cad.gmsh.general/1601
+                dim = [0, 1, 2, 3]
+            num = int(nm.pop(0))
+            name = " ".join(nm)[1:-1]
+            for d in dim:
+                physicalNames[d][name] = int(num)
+
+        return physicalNames
+
+    def _faceOrderings(self, shapeType, numVerts):
+        """
+        Return, for cells of `shapeType` with `numVerts` vertices, the
+        indices of the vertices that make up each face.
+        """
+        if shapeType in [5, 12, 17]: # hexahedron
+            return [[0, 1, 2, 3], # ordering of vertices gleaned from
+                    [4, 5, 6, 7], # a one-cube Grid3D example
+                    [0, 1, 5, 4],
+                    [3, 2, 6, 7],
+                    [0, 3, 7, 4],
+                    [1, 2, 6, 5]]
+        elif shapeType in [6, 13, 18]: # prism
+            return [[0, 1, 2],
+                    [5, 4, 3],
+                    [3, 4, 1, 0],
+                    [4, 5, 2, 1],
+                    [5, 3, 0, 2]]
+        elif shapeType in [7, 14, 19]: # pyramid
+            return [[0, 1, 2, 3],
+                    [0, 1, 4],
+                    [1, 2, 4],
+                    [2, 3, 4],
+                    [3, 0, 4]]
+        else:
+            if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
+                faceLength = 2 # triangle
+            elif shapeType in [3, 10, 16]:
+                faceLength = 2 # quadrangle
+            elif shapeType in [4, 11, 29, 30, 31]:
+                faceLength = 3 # tetrahedron
+
+            # we may wrap
+            return [[(i + j) % numVerts for j in range(faceLength)]
+                    for i in range(self.numFacesPerCell[shapeType])]
 
     def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells):
         """
-        Uses element information obtained from `_parseElementFile` to deliver
+        Uses element information obtained from `_readElements` to deliver
         `facesToVertices` and `cellsToFaces`.
+
+        Every face of every cell is listed and duplicates are found by
+        sorting the vertex IDs of each face and labeling the unique
+        rows. Faces are numbered in the order they are first encountered.
         """
 
         allShapes  = nx.unique(shapeTypes).tolist()
         maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
 
+        numVerts = (cellsToVertIDs != -1).sum(axis=1)
+        cellsOfShape = {}
+        faceOrderings = {}
+        for shapeType in allShapes:
+            cellsOfShape[shapeType] = nx.nonzero(shapeTypes == shapeType)[0]
+            faceOrderings[shapeType] = self._faceOrderings(shapeType,
+                                                           numVerts[cellsOfShape[shapeType][0]])
+        maxFaceLen = max([len(face) for ordering in faceOrderings.values() for face in ordering])
+
+        # list every face of every cell, padding short faces with -1
+        cellFaces = nx.ones((numCells, maxFaces, maxFaceLen), dtype=nx.INT_DTYPE) * -1
+        hasFace = nx.zeros((numCells, maxFaces), dtype=bool)
+        for shapeType in allShapes:
+            cells = cellsOfShape[shapeType][..., nx.newaxis]
+            for faceIdx, face in enumerate(faceOrderings[shapeType]):
+                cellFaces[cells, faceIdx, nx.arange(maxFaceLen - len(face), maxFaceLen)] = cellsToVertIDs[cells, face]
+                hasFace[cells, faceIdx] = True
+
+        # NB: faces are sorted to spot duplicates
+        faces = cellFaces[hasFace]
+        faceIDs, firstFaces = _uniqueRows(nx.sort(faces, axis=1))
+
         # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
         cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
-
-        # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
-
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
-
-        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), facesDict
-
-    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
-        """Translates e`ntitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
-        """
-        entitiesVertices = []
-
-        for entity in entitiesNodes:
-            try:
-                vertIndices = vertexMap[nx.array(entity)]
-            except IndexError:
-                vertIndices = nx.ones((len(entity),), 'l') * -1
-            entitiesVertices.append(vertIndices)
+        cellsToFaces[hasFace] = faceIDs
 
-        return entitiesVertices
+        facesToVertices = faces[firstFaces]
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
+        return (facesToVertices.swapaxes(0, 1)[::-1],
+                cellsToFaces.swapaxes(0, 1).copy('C'),
+                nx.sort(facesToVertices, axis=1))
 
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
+    def _mapFaceEntities(self, faceKeys, facesData, vertGIDtoIdx):
         """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
-        """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
+        Transfer the entities of the Gmsh face elements to the FiPy faces
+        with the same vertices.
 
-        return [orderingToFace(o) for o in faceOrderings]
+        `faceKeys` holds the sorted vertex IDs of each FiPy face.
+        """
+        self.physicalFaceMap = nx.zeros(faceKeys.shape[:1], 'l')
+        self.geometricalFaceMap = nx.zeros(faceKeys.shape[:1], 'l')
+
+        # translate Gmsh IDs to `vertexCoord` indices and discard any faces
+        # with nodes that don't belong to the cells
+        facesToVertIDs = _translate(facesData.nodes, vertGIDtoIdx)
+        tagged = ~nx.any((facesData.nodes > 0) & (facesToVertIDs == -1), axis=1)
+        facesToVertIDs = nx.sort(facesToVertIDs[tagged], axis=1)
+
+        width = max(faceKeys.shape[1], facesToVertIDs.shape[1])
+        keys = [nx.concatenate((nx.ones((len(k), width - k.shape[1]), dtype=nx.INT_DTYPE) * -1, k), axis=1)
+                for k in (faceKeys, facesToVertIDs)]
+
+        # FiPy faces are unique, so they are labeled by their own IDs
+        labels, first = _uniqueRows(nx.concatenate(keys))
+        labels = labels[len(faceKeys):]
+        matched = nx.nonzero(labels < len(faceKeys))[0]
+
+        # not all faces are necessarily tagged;
+        # the last Gmsh face takes precedence if more than one matches
+        faceIDs, last = nx.unique(labels[matched][::-1], return_index=True)
+        last = matched[::-1][last]
+        self.physicalFaceMap[faceIDs] = facesData.physicalEntities[tagged][last]
+        self.geometricalFaceMap[faceIDs] = facesData.geometricalEntities[tagged][last]
 
     def read(self):
         """
@@ -694,40 +1076,34 @@ class MSHFile(GmshFile):
         3. Build faces
         4. Build `cellsToFaces`
 
-        Isolate relevant data into three files, store in
-        `self.nodesPath` for `$Nodes`,
-        `self.elemsPath` for `$Elements`.
-        `self.namesFile` for `$PhysicalNames`.
+        The file is memory-mapped and the `$Nodes` and `$Elements`
+        sections are parsed a block at a time into arrays. Reads MSH
+        formats 2 and 4.1, both ASCII and binary.
 
         Returns `vertexCoords`, `facesToVertexID`, `cellsToFaceID`,
                 `cellGlobalIDMap`, `ghostCellGlobalIDMap`.
         """
-        self.version, self.fileType, self.dataSize = self._getMetaData()
-        self.nodesPath = self._isolateData("Nodes")
-        self.elemsPath = self._isolateData("Elements")
+        f = open(self.filename, 'rb')
         try:
-            self.namesPath = self._isolateData("PhysicalNames")
-        except EOFError as e:
-            self.namesPath = None
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            f.close()
 
         try:
-            if self.dimensions is None:
-                nodesFile = open(self.nodesPath, 'r')
-                nodesFile.readline() # skip number of nodes
+            self.version, self.fileType, self.dataSize = self._getMetaData(buf)
+            if not (self.version < 3 or self.version >= 4.1):
+                raise GmshException("Gmsh MSH file format version %g is not supported" % self.version)
+
+            parprint("Parsing nodes.")
+            nodeIDs, nodeCoords = self._readNodes(buf)
 
+            if self.dimensions is None:
                 # We assume we have a 2D file unless we find a node
                 # with a non-zero Z coordinate
-                self.dimensions = 2
-                for node in nodesFile:
-                    line   = node.split()
-
-                    newVert = [float(x) for x in line]
-
-                    if newVert[2] != 0.0:
-                        self.dimensions = 3
-                        break
-
-                nodesFile.close()
+                if nx.any(nodeCoords[..., 2] != 0.0):
+                    self.dimensions = 3
+                else:
+                    self.dimensions = 2
 
             self.coordDimensions = self.coordDimensions or self.dimensions
 
@@ -776,75 +1152,65 @@ class MSHFile(GmshFile):
                 raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
 
             parprint("Parsing elements.")
-            (cellsData,
-             ghostsData,
-             facesData) = self._parseElementFile()
-
-            cellsToGmshVerts = cellsData.nodes + ghostsData.nodes
-            numCellsTotal    = len(cellsData.nodes) + len(ghostsData.nodes)
-            allShapeTypes    = cellsData.shapes + ghostsData.shapes
-            allShapeTypes    = nx.array(allShapeTypes)
-            allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
-            self.physicalCellMap = nx.array(cellsData.physicalEntities
-                                            + ghostsData.physicalEntities)
-            self.geometricalCellMap = nx.array(cellsData.geometricalEntities
-                                               + ghostsData.geometricalEntities)
-
-            if numCellsTotal < 1:
-                errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
-                errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
-                raise GmshException(errStr)
-
-            parprint("Recovering coords.")
-            parprint("numcells %d" % numCellsTotal)
-            vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts)
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
-                                                            vertIDtoIdx)
-
-            parprint("Building cells and faces.")
-            (facesToV,
-             cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
-
-            # cell entities were easy to record on parsing
-            # but we don't use Gmsh faces, so we need to correlate the nodes
-            # that make up the Gmsh faces with the vertex IDs of the FiPy faces
-            # so that we can check if any are named
-            faceEntitiesDict = dict()
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
-                                                            vertIDtoIdx)
-
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
-            self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in list(facesDict.keys()):
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
-
-            self.physicalNames = self._parseNamesFile()
+            elements = self._readElements(buf)
 
+            self.physicalNames = self._readPhysicalNames(buf)
         finally:
-            os.unlink(self.nodesPath)
-            os.unlink(self.elemsPath)
-            if self.namesPath is not None:
-                os.unlink(self.namesPath)
-
-        # convert lists of cell vertices to a properly oriented masked array
-        maxVerts = max([len(v) for v in cellsToVertIDs])
-        # ticket:539 - NumPy 1.7 casts to array before concatenation and empty array defaults to float
-        cellsToVertIDs = [nx.concatenate((v, nx.array([-1] * (maxVerts-len(v)), dtype=nx.INT_DTYPE))) for v in cellsToVertIDs]
+            buf.close()
+
+        (cellsData,
+         ghostsData,
+         facesData) = self._partitionElements(elements)
+
+        allCellsData = _ElementData.concatenate([cellsData, ghostsData])
+        numCellsTotal = len(allCellsData)
+        self.physicalCellMap = allCellsData.physicalEntities
+        self.geometricalCellMap = allCellsData.geometricalEntities
+
+        if numCellsTotal < 1:
+            errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
+            errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
+            raise GmshException(errStr)
+
+        parprint("Recovering coords.")
+        parprint("numcells %d" % numCellsTotal)
+
+        # vertices are ordered by Gmsh ID
+        allVerts = nx.unique(allCellsData.nodes[allCellsData.nodes > 0])
+        vertGIDtoIdx = nx.ones((allVerts[-1] + 1,), 'l') * -1 # gmsh ID -> vertexCoords idx
+        vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
+
+        nodeRows = _translate(allVerts, _inverseMap(nodeIDs))
+        if nx.any(nodeRows == -1):
+            raise GmshException("Elements refer to nodes that are not in the `$Nodes` section")
+        # transpose for FiPy
+        vertexCoords = nodeCoords[nodeRows, :self.coordDimensions].swapaxes(0, 1).copy('C')
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        cellsToVertIDs = _translate(allCellsData.nodes, vertGIDtoIdx)
+
+        parprint("Building cells and faces.")
+        (facesToV,
+         cellsToF,
+         faceKeys) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                               allCellsData.shapes,
+                                               numCellsTotal)
+
+        # cell entities were easy to record on parsing
+        # but we don't use Gmsh faces, so we need to correlate the nodes
+        # that make up the Gmsh faces with the vertex IDs of the FiPy faces
+        # so that we can check if any are named
+        self._mapFaceEntities(faceKeys, facesData, vertGIDtoIdx)
+
+        if self.cacheFile is not None:
+            self._writeCache(vertexCoords=vertexCoords,
+                             faceVertexIDs=facesToV,
+                             cellFaceIDs=cellsToF,
+                             cellGlobalIDs=cellsData.idmap,
+                             ghostCellGlobalIDs=ghostsData.idmap,
+                             cellVertexIDs=cellsToVertIDs)
+
+        # convert cell vertices to a properly oriented masked array
         cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0, 1)
 
         parprint("Done with cells and faces.")
@@ -852,6 +1218,76 @@ class MSHFile(GmshFile):
                 cellsData.idmap, ghostsData.idmap,
                 cellsToVertIDs)
 
+    def _writeCache(self, **arrays):
+        """
+        Save the results of `read` to `self.cacheFile`.
+
+        The data are written to a temporary file that is then renamed, so
+        that concurrent jobs never see a partial cache.
+        """
+        cacheDir = os.path.dirname(self.cacheFile)
+        if not os.path.isdir(cacheDir):
+            try:
+                os.makedirs(cacheDir)
+            except OSError:
+                # another process may have just created it
+                pass
+
+        (f, tmpFile) = tempfile.mkstemp(suffix=".npz", dir=cacheDir)
+        f = os.fdopen(f, 'wb')
+        try:
+            nx.savez(f,
+                     dimensions=self.dimensions,
+                     coordDimensions=self.coordDimensions,
+                     physicalCellMap=self.physicalCellMap,
+                     geometricalCellMap=self.geometricalCellMap,
+                     physicalFaceMap=self.physicalFaceMap,
+                     geometricalFaceMap=self.geometricalFaceMap,
+                     physicalNames=json.dumps(self.physicalNames),
+                     **arrays)
+        finally:
+            f.close()
+
+        try:
+            os.rename(tmpFile, self.cacheFile)
+        except OSError:
+            # on Windows, another process may have written it first
+            os.unlink(tmpFile)
+
+    def _partitionElements(self, elements):
+        """
+        Return three `_ElementData` objects, the first for non-ghost cells,
+        the second for ghost cells, and the third for faces.
+
+        All nastiness concerning ghost cell
+        calculation is consolidated here: if we were ever to need to CALCULATE
+        GHOST CELLS OURSELVES, the only code we'd have to change is in here.
+        """
+        isCell = nx.in1d(elements.shapes, list(self.numFacesPerCell.keys()))
+        isFace = nx.in1d(elements.shapes, list(self.numVertsPerFace.keys()))
+
+        allCells = elements.take(nx.nonzero(isCell)[0])
+        facesData = elements.take(nx.nonzero(isFace)[0])
+
+        # this will be subtracted from gmsh ID to obtain global ID
+        cellOffset = allCells.ids[0] if len(allCells) > 0 else 0
+
+        if self.communicator.Nproc > 1:
+            pid = self.communicator.procID + 1
+            # el is in this processor's partition
+            cellsData = allCells.take(nx.nonzero(nx.any(allCells.partitions == pid, axis=1))[0])
+            # if we're collecting ghost cells and this is our ghost cell
+            ghostsData = allCells.take(nx.nonzero(nx.any(allCells.partitions == -pid, axis=1))[0])
+        else:
+            # we collect all cells
+            cellsData = allCells
+            ghostsData = allCells.take(nx.zeros((0,), dtype=nx.INT_DTYPE))
+
+        cellsData.idmap = (cellsData.ids - cellOffset).tolist()
+        ghostsData.idmap = (ghostsData.ids - cellOffset).tolist()
+
+        return cellsData, ghostsData, facesData
+
     def write(self, obj, time=0.0, timeindex=0):
         if not self.formatWritten:
             self._writeMeshFormat()
@@ -979,176 +1415,6 @@ class MSHFile(GmshFile):
 
         self.fileobj.write("$EndElementData\n")
 
-    def _vertexCoordsAndMap(self, cellsToGmshVerts):
-        """
-        Returns `vertexCoords` and mapping from Gmsh ID to `vertexCoords`
-        indices (same as in `MSHFile`).
-
-        Unlike parent, doesn't use `genfromtxt`
-        because we want to avoid loading the entire `.msh` file into memory.
-        """
-        allVerts     = [v for c in cellsToGmshVerts for v in c] # flatten
-        allVerts     = nx.unique(nx.array(allVerts, dtype=nx.INT_DTYPE)) # remove dups
-        allVerts     = nx.sort(allVerts)
-        maxVertIdx   = allVerts[-1] + 1 # add one to offset zero
-        vertGIDtoIdx = nx.ones(maxVertIdx, 'l') * -1 # gmsh ID -> vertexCoords idx
-        vertexCoords = nx.empty((len(allVerts), self.coordDimensions))
-        nodeCount    = 0
-
-        # establish map. This works because allVerts is a sorted set.
-        vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
-
-        nodesFile = open(self.nodesPath, 'r')
-        nodesFile.readline() # skip number of nodes
-
-        # now we walk through node file with a sorted unique list of vertices
-        # in hand. When we encounter 0th element in `allVerts`, save it
-        # to `vertexCoords` then pop its ID off `allVerts`.
-        for node in nodesFile:
-            line   = node.split()
-            nodeID = int(line[0])
-
-            if nodeID == allVerts[nodeCount]:
-                newVert = [float(x) for x in line[1:self.coordDimensions+1]]
-                vertexCoords[nodeCount,:] = nx.array(newVert)
-                nodeCount += 1
-
-            if len(allVerts) == nodeCount:
-                break
-
-        nodesFile.close()
-
-        # transpose for FiPy
-        transCoords = vertexCoords.swapaxes(0, 1)
-        return transCoords, vertGIDtoIdx
-
-    def _parseElementFile(self):
-        """
-        Return three objects, the first for non-ghost cells, the second for
-        ghost cells, and the third for faces.
-
-        All nastiness concerning ghost cell
-        calculation is consolidated here: if we were ever to need to CALCULATE
-        GHOST CELLS OURSELVES, the only code we'd have to change is in here.
-        """
-
-        def _parseTags(offset, currLineInts):
-            if offset == -1:
-                # if first valid shape
-                offset = currLineInts[0]
-
-            numTags = currLineInts[2]
-            tags    = currLineInts[3:(3+numTags)]
-
-            # the partition tags for don't seem to always be present
-            # and don't always make much sense when they are
-
-            if len(tags) >= 2:
-                physicalEntity = tags.pop(0)
-                geometricalEntity = tags.pop(0)
-            else:
-                physicalEntity = geometricalEntity = -1
-
-            return offset, tags, physicalEntity, geometricalEntity
-
-
-        cellsData = _ElementData()
-        ghostsData = _ElementData()
-        facesData = _ElementData()
-
-        cellOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        faceOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        pid = self.communicator.procID + 1
-
-        elemsFile = open(self.elemsPath, 'r')
-
-        elemsFile.readline() # skip number of elements
-        for el in elemsFile:
-            currLineInts = [int(x) for x in el.split()]
-            elemType     = currLineInts[1]
-
-            if elemType in list(self.numFacesPerCell.keys()):
-                # element is a cell
-
-                (cellOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=cellOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= cellOffset
-
-                if len(tags) > 0:
-                    # next item is a count
-                    if tags[0] != len(tags) - 1:
-                        warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[0], len(tags) - 1),
-                                      SyntaxWarning, stacklevel=2)
-                    tags = tags[1:]
-
-                if self.communicator.Nproc > 1:
-                    for tag in tags:
-                        if -tag == pid:
-                            # if we're collecting ghost cells and this is our ghost cell
-                            ghostsData.add(currLine=currLineInts, elType=elemType,
-                                           physicalEntity=physicalEntity,
-                                           geometricalEntity=geometricalEntity)
-                        elif tag == pid:
-                            # el is in this processor's partition or we collect all cells
-                            cellsData.add(currLine=currLineInts, elType=elemType,
-                                          physicalEntity=physicalEntity,
-                                          geometricalEntity=geometricalEntity)
-                else:
-                    # we collect all cells
-                    cellsData.add(currLine=currLineInts, elType=elemType,
-                                  physicalEntity=physicalEntity,
-                                  geometricalEntity=geometricalEntity)
-            elif elemType in list(self.numVertsPerFace.keys()):
-                # element is a face
-
-                (faceOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=faceOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= faceOffset
-
-                facesData.add(currLine=currLineInts, elType=elemType,
-                              physicalEntity=physicalEntity,
-                              geometricalEntity=geometricalEntity)
-
-        elemsFile.close()
-
-        return cellsData, ghostsData, facesData
-
-
-    def _parseNamesFile(self):
-        physicalNames = {
-            0: dict(),
-            1: dict(),
-            2: dict(),
-            3: dict()
-        }
-        if self.namesPath is not None:
-            namesFile = open(self.namesPath, 'r')
-
-            namesFile.readline() # skip number of elements
-            for nm in namesFile:
-                nm = nm.split()
-                if self.version > 2.0:
-                    dim = [int(nm.pop(0))]
-                else:
-                    # Gmsh format prior to 2.1 did not unambiguously tie
-                    # physical names to physical entities of different dimensions
-                    # http://article.gmane.org/gmane.comp.cad.gmsh.general/1601
-                    dim = [0, 1, 2, 3]
-                num = int(nm.pop(0))
-                name = " ".join(nm)[1:-1]
-                for d in dim:
-                    physicalNames[d][name] = int(num)
-
-            namesFile.close()
-
-        return physicalNames
-
     def makeMapVariables(self, mesh):
         """Utility function to make `MeshVariables` that define different domains in the mesh
         """
@@ -1246,36 +1512,311 @@ class MSHFile(GmshFile):
         ...     p = Popen(["gmsh", os.path.join(dir, "cyl.msh")]) # doctest: +GMSH
         ...     doctest_raw_input("CylindricalGrid2D... Press enter.")
 
+        Test reading. Gmsh isn't needed to read an existing `.msh` file.
+
+        >>> f = MSHFile(os.path.join(dir, "gr.msh"), dimensions=2,
+        ...             communicator=serialComm, mode='w')
+        >>> f.write(g)
+        >>> f.close()
+
+        >>> f = MSHFile(os.path.join(dir, "gr.msh"), dimensions=2,
+        ...             communicator=serialComm)
+        >>> verts, faces, cells = f.read()[:3]
+        >>> f.close()
+        >>> print(nx.allclose(verts, g.vertexCoords))
+        True
+        >>> gr = Mesh2D(vertexCoords=verts, faceVertexIDs=faces, cellFaceIDs=cells)
+        >>> print(gr.numberOfFaces == g.numberOfFaces)
+        True
+        >>> print(nx.allclose(gr.cellCenters, g.cellCenters))
+        True
+
+        MSH 4.1 files, where elements take their physical entities from
+        the `$Entities` section, can also be read
+
+        >>> with open(os.path.join(dir, "two.msh"), 'w') as f:
+        ...     f.writelines('''$MeshFormat
+        ... 4.1 0 8
+        ... $EndMeshFormat
+        ... $PhysicalNames
+        ... 1
+        ... 1 7 "bottom"
+        ... $EndPhysicalNames
+        ... $Entities
+        ... 0 1 1 0
+        ... 1 0 0 0 1 0 0 1 7 2 1 -2
+        ... 1 0 0 0 1 1 0 0 0
+        ... $EndEntities
+        ... $Nodes
+        ... 1 4 1 4
+        ... 2 1 0 4
+        ... 1
+        ... 2
+        ... 3
+        ... 4
+        ... 0 0 0
+        ... 1 0 0
+        ... 1 1 0
+        ... 0 1 0
+        ... $EndNodes
+        ... $Elements
+        ... 2 3 1 3
+        ... 1 1 1 1
+        ... 1 1 2
+        ... 2 1 2 2
+        ... 2 1 2 3
+        ... 3 1 3 4
+        ... $EndElements
+        ... ''')
+        >>> f = MSHFile(os.path.join(dir, "two.msh"), dimensions=None,
+        ...             communicator=serialComm)
+        >>> verts, faces, cells, cellIDs = f.read()[:4]
+        >>> f.close()
+        >>> print(f.dimensions)
+        2
+        >>> print(faces)
+        [[1 2 0 3 0]
+         [0 1 2 2 3]]
+        >>> print(cells)
+        [[0 2]
+         [1 3]
+         [2 4]]
+        >>> print(cellIDs)
+        [0, 1]
+        >>> print(f.physicalFaceMap)
+        [7 0 0 0 0]
+        >>> print(f.physicalNames[1])
+        {'bottom': 7}
+
+        What `read` derives can be cached, so that `openMSHFile` can later
+        skip both Gmsh and the derivation of cells and faces
+
+        >>> cacheFile = os.path.join(dir, "cache", "two.npz")
+        >>> f = MSHFile(os.path.join(dir, "two.msh"), dimensions=2,
+        ...             communicator=serialComm, cacheFile=cacheFile)
+        >>> data = f.read()
+        >>> f.close()
+        >>> cf = _CachedMSHFile(cached=_readMeshCache(cacheFile))
+        >>> cached = cf.read()
+        >>> print([bool(nx.MA.allequal(a, b)) for a, b in zip(data, cached)])
+        [True, True, True, True, True, True]
+        >>> print(nx.allequal(cf.physicalFaceMap, f.physicalFaceMap))
+        True
+        >>> print(cf.physicalNames == f.physicalNames)
+        True
+        >>> print(_readMeshCache(os.path.join(dir, "two.msh")))
+        None
+
+        A cached mesh is opened without running, or even having, Gmsh
+
+        >>> cacheDir = os.path.join(dir, "cache")
+        >>> cacheFile = _meshCacheFile(cacheDir=cacheDir, name=os.path.join(dir, "two.msh"),
+        ...                            dimensions=2, coordDimensions=None,
+        ...                            communicator=serialComm, order=1, background=None)
+        >>> f = MSHFile(os.path.join(dir, "two.msh"), dimensions=2,
+        ...             communicator=serialComm, cacheFile=cacheFile)
+        >>> data = f.read()
+        >>> f.close()
+        >>> f = openMSHFile(os.path.join(dir, "two.msh"), dimensions=2,
+        ...                 communicator=serialComm, cacheDir=cacheDir)
+        >>> print(isinstance(f, _CachedMSHFile))
+        True
+
         >>> import shutil
         >>> shutil.rmtree(dir)
         """
         pass
 
+class _CachedMSHFile(MSHFile):
+    """
+    Stands in for an `MSHFile` whose mesh data were saved by a previous
+    `read`.
+    """
+    def __init__(self, cached, communicator=parallelComm):
+        self.cached = cached
+        self.communicator = communicator
+        self.dimensions = int(cached["dimensions"])
+        self.coordDimensions = int(cached["coordDimensions"])
+        self.filename = None
+        self.fileIsTemporary = False
+
+    def read(self):
+        cached = self.cached
+
+        self.physicalCellMap = cached["physicalCellMap"]
+        self.geometricalCellMap = cached["geometricalCellMap"]
+        self.physicalFaceMap = cached["physicalFaceMap"]
+        self.geometricalFaceMap = cached["geometricalFaceMap"]
+        self.physicalNames = dict((int(dim), names)
+                                  for dim, names in json.loads(str(cached["physicalNames"])).items())
+
+        cellsToVertIDs = nx.MA.masked_equal(cached["cellVertexIDs"], value=-1).swapaxes(0, 1)
+
+        return (cached["vertexCoords"], cached["faceVertexIDs"], cached["cellFaceIDs"],
+                cached["cellGlobalIDs"].tolist(), cached["ghostCellGlobalIDs"].tolist(),
+                cellsToVertIDs)
+
+    def close(self):
+        pass
+
 class _ElementData(object):
     """
-    Bookkeeping for cells. Declared as own class for generality.
+    Bookkeeping for elements. Declared as own class for generality.
 
     :Properties:
-    - `nodes`: A Python list of the vertices that make up this element
-    - `shapes`: A `shapeTypes` Python list
+    - `ids`: An array of the Gmsh ID of each element
+    - `shapes`: A `shapeTypes` array
+    - `nodes`: An array of the Gmsh IDs of the nodes that make up each
+      element, padded with 0
+    - `physicalEntities`: An array of the Gmsh physical entity each element is in
+    - `geometricalEntities`: An array of the Gmsh geometrical entity each element is in
+    - `partitions`: An array of the partitions each element is in (negative
+      where the element is a ghost), padded with 0
     - `idmap`: A Python list which maps `vertexCoords` index to global ID
-    - `physicalEntities`: A Python list of the Gmsh physical entities each element is in
-    - `geometricalEntities`: A Python list of the Gmsh geometrical entities each element is in
     """
-    def __init__(self):
-        self.nodes = []
-        self.shapes = []
+    def __init__(self, ids, shapes, nodes, physicalEntities, geometricalEntities, partitions=None):
+        self.ids = ids
+        self.shapes = shapes
+        self.nodes = nodes
+        self.physicalEntities = physicalEntities
+        self.geometricalEntities = geometricalEntities
+        if partitions is None:
+            partitions = nx.zeros((len(ids), 0), dtype=nx.INT_DTYPE)
+        self.partitions = partitions
         self.idmap = [] # vertexCoords idx -> gmsh ID (global ID)
-        self.physicalEntities = []
-        self.geometricalEntities = []
 
-    def add(self, currLine, elType, physicalEntity, geometricalEntity):
-        numTags = currLine[2]
-        self.nodes.append(currLine[(numTags+3):])
-        self.shapes.append(elType)
-        self.idmap.append(currLine[0])
-        self.physicalEntities.append(physicalEntity)
-        self.geometricalEntities.append(geometricalEntity)
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _trim(padded):
+        """Remove the columns of `padded` that only hold padding
+        """
+        width = (padded != 0).sum(axis=1).max() if len(padded) > 0 else 0
+        return padded[..., :width]
+
+    def take(self, indices):
+        """Return the elements selected by `indices`
+        """
+        return _ElementData(ids=self.ids[indices],
+                            shapes=self.shapes[indices],
+                            nodes=self._trim(self.nodes[indices]),
+                            physicalEntities=self.physicalEntities[indices],
+                            geometricalEntities=self.geometricalEntities[indices],
+                            partitions=self._trim(self.partitions[indices]))
+
+    @staticmethod
+    def concatenate(elements):
+        """Join a sequence of `_ElementData` objects
+        """
+        empty = nx.zeros((0,), dtype=nx.INT_DTYPE)
+        elements = list(elements) + [_ElementData(ids=empty,
+                                                  shapes=empty,
+                                                  nodes=nx.zeros((0, 0), dtype=nx.INT_DTYPE),
+                                                  physicalEntities=empty,
+                                                  geometricalEntities=empty)]
+
+        def join(name):
+            return nx.concatenate([getattr(e, name) for e in elements])
+
+        def joinPadded(name):
+            width = max([getattr(e, name).shape[1] for e in elements])
+            return nx.concatenate([nx.concatenate((getattr(e, name),
+                                                   nx.zeros((len(e), width - getattr(e, name).shape[1]),
+                                                            dtype=nx.INT_DTYPE)), axis=1)
+                                   for e in elements])
+
+        return _ElementData(ids=join("ids"),
+                            shapes=join("shapes"),
+                            nodes=joinPadded("nodes"),
+                            physicalEntities=join("physicalEntities"),
+                            geometricalEntities=join("geometricalEntities"),
+                            partitions=joinPadded("partitions"))
+
+# number of nodes of each Gmsh element type
+_numNodesPerElement = {
+     1: 2,  # 2-node line
+     2: 3,  # 3-node triangle
+     3: 4,  # 4-node quadrangle
+     4: 4,  # 4-node tetrahedron
+     5: 8,  # 8-node hexahedron
+     6: 6,  # 6-node prism
+     7: 5,  # 5-node pyramid
+     8: 3,  # 3-node line
+     9: 6,  # 6-node triangle
+    10: 9,  # 9-node quadrangle
+    11: 10, # 10-node tetrahedron
+    12: 27, # 27-node hexahedron
+    13: 18, # 18-node prism
+    14: 14, # 14-node pyramid
+    15: 1,  # 1-node point
+    16: 8,  # 8-node quadrangle
+    17: 20, # 20-node hexahedron
+    18: 15, # 15-node prism
+    19: 13, # 13-node pyramid
+    20: 9,  # 9-node triangle
+    21: 10, # 10-node triangle
+    22: 12, # 12-node triangle
+    23: 15, # 15-node triangle
+    24: 15, # 15-node triangle
+    25: 21, # 21-node triangle
+    26: 4,  # 4-node line
+    27: 5,  # 5-node line
+    28: 6,  # 6-node line
+    29: 20, # 20-node tetrahedron
+    30: 35, # 35-node tetrahedron
+    31: 56  # 56-node tetrahedron
+}
+
+def _ragged(flat, starts, lengths):
+    """Gather the runs `flat[starts:starts+lengths]` into rows padded with 0
+    """
+    width = lengths.max() if len(lengths) > 0 else 0
+    columns = nx.arange(width)
+    inRun = columns < lengths[..., nx.newaxis]
+    rows = nx.zeros((len(starts), width), dtype=flat.dtype)
+    rows[inRun] = flat[(starts[..., nx.newaxis] + columns)[inRun]]
+    return rows
+
+def _inverseMap(ids):
+    """Return an array that maps each of `ids` to its index
+    """
+    idMap = nx.ones((ids.max() + 1 if len(ids) > 0 else 0,), 'l') * -1
+    idMap[ids] = nx.arange(len(ids))
+    return idMap
+
+def _translate(ids, idMap):
+    """Look up `ids` in `idMap`, returning -1 for any outside of it
+    """
+    inMap = (ids >= 0) & (ids < len(idMap))
+    if len(idMap) == 0:
+        return nx.ones(ids.shape, 'l') * -1
+    return nx.where(inMap, idMap[nx.where(inMap, ids, 0)], -1)
+
+def _uniqueRows(rows):
+    """Label the distinct rows of a 2D array in the order they first appear
+
+    Returns the label of each row and the index of the first row with
+    each label.
+    """
+    if len(rows) == 0:
+        return nx.zeros((0,), 'l'), nx.zeros((0,), 'l')
+
+    order = nx.lexsort(rows.swapaxes(0, 1)[::-1])
+    sortedRows = rows[order]
+    isNew = nx.concatenate(([True], nx.any(sortedRows[1:] != sortedRows[:-1], axis=1)))
+
+    # `lexsort` is stable, so the first of each run of identical rows
+    # is the first to appear
+    first = order[isNew]
+    appearance = nx.argsort(first)
+    relabel = nx.empty_like(appearance)
+    relabel[appearance] = nx.arange(len(appearance))
+
+    labels = nx.empty_like(order)
+    labels[order] = relabel[nx.cumsum(isNew) - 1]
+
+    return labels, first[appearance]
 
 class _GmshTopology(_MeshTopology):
 
@@ -1561,6 +2102,9 @@ class Gmsh2D(Mesh2D):
         ???
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cacheDir : str
+        If not `None`, a directory in which to cache the mesh so that later
+        runs on the same input skip Gmsh; see `openMSHFile`
     """
 
     def __init__(self,
@@ -1568,7 +2112,8 @@ class Gmsh2D(Mesh2D):
                  coordDimensions=2,
                  communicator=parallelComm,
                  order=1,
-                 background=None):
+                 background=None,
+                 cacheDir=None):
 
         self.mshFile = openMSHFile(arg,
                                    dimensions=2,
@@ -1576,7 +2121,8 @@ class Gmsh2D(Mesh2D):
                                    communicator=communicator,
                                    order=order,
                                    mode='r',
-                                   background=background)
+                                   background=background,
+                                   cacheDir=cacheDir)
 
         (verts,
          faces,
@@ -1842,6 +2388,19 @@ class Gmsh2D(Mesh2D):
 
         >>> noTag = Gmsh2D(mshFile) # doctest: +GMSH, +SERIAL
 
+        Reuse a cached mesh
+
+        >>> cacheDir = tempfile.mkdtemp()
+        >>> cached1 = Gmsh2D(mshFile, cacheDir=cacheDir) # doctest: +GMSH, +SERIAL
+        >>> cached2 = Gmsh2D(mshFile, cacheDir=cacheDir) # doctest: +GMSH, +SERIAL
+        >>> print(len(os.listdir(cacheDir))) # doctest: +GMSH, +SERIAL
+        1
+        >>> print(nx.allclose(cached1.cellCenters, cached2.cellCenters)) # doctest: +GMSH, +SERIAL
+        True
+
+        >>> import shutil
+        >>> shutil.rmtree(cacheDir)
+
         >>> os.remove(mshFile)
 
         """
@@ -1860,14 +2419,18 @@ class Gmsh2DIn3DSpace(Gmsh2D):
         ???
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cacheDir : str
+        If not `None`, a directory in which to cache the mesh so that later
+        runs on the same input skip Gmsh; see `openMSHFile`
     """
-    def __init__(self, arg, communicator=parallelComm, order=1, background=None):
+    def __init__(self, arg, communicator=parallelComm, order=1, background=None, cacheDir=None):
         Gmsh2D.__init__(self,
                         arg,
                         coordDimensions=3,
                         communicator=communicator,
                         order=order,
-                        background=background)
+                        background=background,
+                        cacheDir=cacheDir)
 
     def _test(self):
         """
@@ -1938,14 +2501,18 @@ class Gmsh3D(Mesh):
         ???
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cacheDir : str
+        If not `None`, a directory in which to cache the mesh so that later
+        runs on the same input skip Gmsh; see `openMSHFile`
     """
-    def __init__(self, arg, communicator=parallelComm, order=1, background=None):
+    def __init__(self, arg, communicator=parallelComm, order=1, background=None, cacheDir=None):
         self.mshFile  = openMSHFile(arg,
                                     dimensions=3,
                                     communicator=communicator,
                                     order=order,
                                     mode='r',
-                                    background=background)
+                                    background=background,
+                                    cacheDir=cacheDir)
 
         (verts,
          faces,
@@ -2168,7 +2735,8 @@ class GmshGrid2D(Gmsh2D):
     """Should serve as a drop-in replacement for `Grid2D`
     """
     def __init__(self, dx=1., dy=1., nx=1, ny=None,
-                 coordDimensions=2, communicator=parallelComm, order=1):
+                 coordDimensions=2, communicator=parallelComm, order=1,
+                 cacheDir=None):
         self.dx = dx
         self.dy = dy or dx
         self.nx = nx
@@ -2176,7 +2744,8 @@ class GmshGrid2D(Gmsh2D):
 
         arg = self._makeGridGeo(self.dx, self.dy, self.nx, self.ny)
 
-        Gmsh2D.__init__(self, arg, coordDimensions, communicator, order, background=None)
+        Gmsh2D.__init__(self, arg, coordDimensions, communicator, order, background=None,
+                        cacheDir=cacheDir)
 
     @property
     def _meshSpacing(self):
@@ -2238,7 +2807,7 @@ class GmshGrid3D(Gmsh3D):
     """Should serve as a drop-in replacement for `Grid3D`
     """
     def __init__(self, dx=1., dy=1., dz=1., nx=1, ny=None, nz=None,
-                 communicator=parallelComm, order=1):
+                 communicator=parallelComm, order=1, cacheDir=None):
         self.dx = dx
         self.dy = dy or dx
         self.dz = dz or dx
@@ -2250,7 +2819,8 @@ class GmshGrid3D(Gmsh3D):
         arg = self._makeGridGeo(self.dx, self.dy, self.dz,
                                 self.nx, self.ny, self.nz)
 
-        Gmsh3D.__init__(self, arg, communicator=communicator, order=order)
+        Gmsh3D.__init__(self, arg, communicator=communicator, order=order,
+                        cacheDir=cacheDir)
 
     @property
     def _meshSpacing(self):
@@ -4,6 +4,7 @@ from builtins import range
 __docformat__ = 'restructuredtext'
 
 from fipy.meshes.abstractMesh import AbstractMesh
+from fipy.meshes.raggedArray import _RaggedArray
 from fipy.meshes.representations.meshRepresentation import _MeshRepresentation
 from fipy.meshes.topologies.meshTopology import _MeshTopology
 
@@ -38,6 +39,10 @@ class Mesh(AbstractMesh):
         self.faceVertexIDs = MA.masked_values(faceVertexIDs, -1)
         self.cellFaceIDs = MA.masked_values(cellFaceIDs, -1)
 
+        # the same connectivity, without padding, for the geometry
+        self._raggedFaceVertexIDs = _RaggedArray.fromPadded(self.faceVertexIDs)
+        self._raggedCellFaceIDs = _RaggedArray.fromPadded(self.cellFaceIDs)
+
         self.dim = self.vertexCoords.shape[0]
 
         if not hasattr(self, "numberOfFaces"):
@@ -142,38 +147,18 @@ class Mesh(AbstractMesh):
         self._cellNormals = self._calcCellNormals()
 
     def _calcFaceAreas(self):
-        faceVertexIDs = MA.filled(self.faceVertexIDs, -1)
-        substitute = numerix.repeat(faceVertexIDs[numerix.newaxis, 0],
-                                    faceVertexIDs.shape[0], axis=0)
-        faceVertexIDs = numerix.where(MA.getmaskarray(self.faceVertexIDs),
-                                      substitute, faceVertexIDs)
-        faceVertexCoords = numerix.take(self.vertexCoords, faceVertexIDs, axis=1)
-        faceOrigins = numerix.repeat(faceVertexCoords[:, 0], faceVertexIDs.shape[0], axis=0)
-        faceOrigins = numerix.reshape(faceOrigins, MA.shape(faceVertexCoords))
-        faceVertexCoords = faceVertexCoords - faceOrigins
-        left = list(range(faceVertexIDs.shape[0]))
-        right = left[1:] + [left[0]]
-        cross = numerix.sum(numerix.cross(faceVertexCoords,
-                                          numerix.take(faceVertexCoords, right, 1),
-                                          axis=0),
-                            1)
+        faceVertices = self._raggedFaceVertexIDs
+        faceVertexCoords = numerix.take(self.vertexCoords, faceVertices.indices, axis=1)
+        # the edges of each face, as seen from its first vertex
+        faceVertexCoords = faceVertexCoords - faceVertexCoords[:, faceVertices.firsts]
+        cross = faceVertices.sum(numerix.cross(faceVertexCoords,
+                                               faceVertexCoords[:, faceVertices.successors],
+                                               axis=0))
         return numerix.sqrtDot(cross, cross) / 2.
 
     def _calcFaceCenters(self):
-        maskedFaceVertexIDs = MA.filled(self.faceVertexIDs, 0)
-
-        faceVertexCoords = numerix.take(self.vertexCoords, maskedFaceVertexIDs, axis=1)
-
-        if MA.getmask(self.faceVertexIDs) is False:
-            faceVertexCoordsMask = numerix.zeros(numerix.shape(faceVertexCoords), 'l')
-        else:
-            faceVertexCoordsMask = \
-              numerix.repeat(MA.getmaskarray(self.faceVertexIDs)[numerix.newaxis, ...],
-                             self.dim, axis=0)
-
-        faceVertexCoords = MA.array(data=faceVertexCoords, mask=faceVertexCoordsMask)
-
-        return MA.filled(MA.average(faceVertexCoords, axis=1))
+        faceVertices = self._raggedFaceVertexIDs
+        return faceVertices.mean(numerix.take(self.vertexCoords, faceVertices.indices, axis=1))
 
     @property
     def _rightHandOrientation(self):
@@ -222,14 +207,20 @@ class Mesh(AbstractMesh):
     def _calcOrientedFaceNormals(self):
         return self.faceNormals
 
+    @property
+    def _raggedCellToFaceOrientations(self):
+        cellFaces = self._raggedCellFaceIDs
+        firstCells = MA.filled(self.faceCellIDs[0])[cellFaces.indices]
+        return (firstCells == cellFaces.rows) * 2 - 1
+
     def _calcCellVolumes(self):
         tmp = self._faceCenters[0] * self._faceAreas * self.faceNormals[0]
-        tmp = numerix.take(tmp, self.cellFaceIDs) * self._cellToFaceOrientations
-        return MA.filled(MA.sum(tmp, 0))
+        cellFaces = self._raggedCellFaceIDs
+        return cellFaces.sum(tmp[cellFaces.indices] * self._raggedCellToFaceOrientations)
 
     def _calcCellCenters(self):
-        tmp = numerix.take(self._faceCenters, self.cellFaceIDs, axis=1)
-        return MA.filled(MA.average(tmp, 1))
+        cellFaces = self._raggedCellFaceIDs
+        return cellFaces.mean(numerix.take(self._faceCenters, cellFaces.indices, axis=1))
 
     def _calcFaceToCellDistAndVec(self):
         tmp = MA.repeat(self._faceCenters[..., numerix.NewAxis,:], 2, 1)
@@ -327,6 +318,7 @@ class Mesh(AbstractMesh):
         self._setScaledValues()
 
     def _setScaledValues(self):
+        self._cellCenterTrees = {}
         self._scaledFaceAreas = self._scale['area'] * self._faceAreas
         self._scaledCellVolumes = self._scale['volume'] * self._cellVolumes
         self._scaledCellCenters = self._scale['length'] * self._cellCenters
@@ -428,29 +420,16 @@ class Mesh(AbstractMesh):
     """calculate Topology methods"""
 
     def _calcFaceCellIDs(self):
-        array = MA.array(MA.indices(self.cellFaceIDs.shape, 'l')[1],
-                         mask=MA.getmask(self.cellFaceIDs))
-        faceCellIDs = MA.zeros((2, self.numberOfFaces), 'l')
-
-        ## Nasty bug: MA.put(arr, ids, values) fills its ids and
-        ## values arguments when masked!  This was not the behavior
-        ## that was assumed when used below.  It was only working
-        ## because the old fill value was 0 and the first element of
-        ## the array needed to be 0 since the cell's face was
-        ## 0. numerix.put() has been changed to deal with this
-        ## properly.
-
-##         MA.put(firstRow, cellFaceIDsFlat[::-1], array[::-1])
-##         MA.put(secondRow, cellFaceIDsFlat, array)
-        firstRow = faceCellIDs[0]
-        secondRow = faceCellIDs[1]
-
-        numerix.put(firstRow, self.cellFaceIDs[::-1, ::-1], array[::-1, ::-1])
-        numerix.put(secondRow, self.cellFaceIDs, array)
-
-        mask = ((False,) * self.numberOfFaces, (firstRow == secondRow))
-        return MA.sort(MA.array(faceCellIDs, mask = mask),
-                                   axis=0)
+        cellFaces = self._raggedCellFaceIDs
+
+        # the cells are in increasing order, so the last `put` to each
+        # face is from its lowest or highest cell
+        faceCellIDs = numerix.zeros((2, self.numberOfFaces), 'l')
+        numerix.put(faceCellIDs[0], cellFaces.indices[::-1], cellFaces.rows[::-1])
+        numerix.put(faceCellIDs[1], cellFaces.indices, cellFaces.rows)
+
+        mask = ((False,) * self.numberOfFaces, (faceCellIDs[0] == faceCellIDs[1]))
+        return MA.array(faceCellIDs, mask=mask)
 
     """get Topology methods"""
 
@@ -545,7 +524,207 @@ class Mesh(AbstractMesh):
            [4 5 7 8]
 
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        points = numerix.asarray(points)
+        if points.ndim == 1:
+            return self._getNearestCellID(points[..., numerix.newaxis])[0]
+
+        tree = self._getCellCenterTree(overlapping=False)
+        if tree is None:
+            return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        elif points.shape[-1] == 0:
+            return numerix.arange(0)
+        else:
+            return numerix.asarray(tree.query(points.swapaxes(0, 1))[1], dtype=numerix.INT_DTYPE)
+
+    def _getCellCenterTree(self, overlapping=False):
+        """Lazily build a KD-tree of the cell centers.
+
+        Parameters
+        ----------
+        overlapping : bool
+            Whether to index the local overlapping cells (`True`) or the
+            global non-overlapping cells (`False`).
+
+        Returns
+        -------
+        ~scipy.spatial.cKDTree
+            `None` if :mod:`scipy.spatial` is not available.
+        """
+        if overlapping not in self._cellCenterTrees:
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                return None
+
+            if overlapping:
+                centers = self._scaledCellCenters
+            else:
+                centers = self.cellCenters.globalValue
+            centers = numerix.asarray(centers)
+
+            if centers.shape[-1] == 0:
+                return None
+
+            self._cellCenterTrees[overlapping] = cKDTree(centers.swapaxes(0, 1))
+
+        return self._cellCenterTrees[overlapping]
+
+    def _getContainingCellID(self, points, candidates=8):
+        """Find the cells that contain `points`
+
+        Points outside the bounding box of the mesh are rejected at once.
+        Each other point is tested against the faces of the `candidates`
+        cells with the closest centers and then, if none of them contains
+        it, against geometrically more of the nearest cells, for as long
+        as they are close enough for the point to lie within them.  The
+        cells are assumed to be convex.
+
+           >>> from fipy import *
+           >>> m = Grid2D(dx=(.1, 1., 10.), dy=(.1, 1., 10.))
+           >>> print(m._getContainingCellID(((0.05, 1.05, 5., 20.),
+           ...                               (0.05, 0.05, 8., 5.))))
+           [ 0  1  8 -1]
+
+        The nearest cell center is not necessarily in the containing cell
+
+           >>> print(m._getNearestCellID(((0.2,), (0.05,))))
+           [0]
+           >>> print(m._getContainingCellID(((0.2,), (0.05,))))
+           [1]
+
+        and, where the cell sizes change sharply, the containing cell may
+        not even be among the nearest few
+
+           >>> print(m._getContainingCellID(((2.42,), (2.19,))))
+           [8]
+           >>> print(m._getContainingCellID(((2.42,), (2.19,)), candidates=1))
+           [8]
+
+           >>> dx = 10.**numerix.arange(-3, 2)
+           >>> m = Grid2D(dx=dx, dy=dx[::-1])
+           >>> x, y = numerix.random.random((2, 1000)) * dx.sum()
+           >>> cellIDs = m._getContainingCellID((x, y))
+           >>> X, Y = numerix.take(m.faceCenters.value, m.cellFaceIDs.filled(0), axis=-1)
+           >>> print((cellIDs >= 0).all())
+           True
+           >>> print(((X.min(axis=0)[cellIDs] <= x) & (x <= X.max(axis=0)[cellIDs])
+           ...        & (Y.min(axis=0)[cellIDs] <= y) & (y <= Y.max(axis=0)[cellIDs])).all())
+           True
+
+        Parameters
+        ----------
+        points : array_like
+            A set of points in the format (X, Y, Z)
+        candidates : int
+            Number of nearest cells to check for each point before
+            searching further.
+
+        Returns
+        -------
+        ndarray
+            Global ID of the cell containing each point, or `-1` for
+            points that do not lie within a local cell.
+        """
+        points = numerix.asarray(points, dtype=float)
+        M = points.shape[-1]
+        cellIDs = -numerix.ones((M,), dtype=numerix.INT_DTYPE)
+
+        if self.numberOfCells == 0 or M == 0:
+            return cellIDs
+
+        scale = numerix.asarray(self.scale['length'])
+        vertexCoords = numerix.asarray(self.vertexCoords) * scale
+        faceCenters = numerix.asarray(self._faceCenters) * scale
+        cellCenters = numerix.asarray(self._cellCenters) * scale
+        faceIDs = MA.filled(self.cellFaceIDs, 0)
+        faceMask = MA.getmaskarray(self.cellFaceIDs)
+        normals = (numerix.take(MA.filled(self.faceNormals, 0), faceIDs, axis=-1)
+                   * MA.filled(self._cellToFaceOrientations, 0)[numerix.newaxis])
+
+        def contains(pointIDs, cells):
+            faces = faceIDs[..., cells]
+            n = normals[..., cells]
+            fc = faceCenters[..., faces]
+            # distance of each point beyond the outward face planes,
+            # relative to the distance of the cell center inside them
+            beyond = numerix.sum((points[..., numerix.newaxis, pointIDs] - fc) * n, axis=0)
+            inside = numerix.sum((fc - cellCenters[:, numerix.newaxis, cells]) * n, axis=0)
+            return ((beyond <= 1e-10 * inside) | faceMask[..., cells]).all(axis=0)
+
+        # points outside the bounding box of the vertices are in no cell
+        lower = vertexCoords.min(axis=-1)[..., numerix.newaxis]
+        upper = vertexCoords.max(axis=-1)[..., numerix.newaxis]
+        tolerance = 1e-10 * (upper - lower).max()
+        unresolved = numerix.nonzero(((points >= lower - tolerance)
+                                      & (points <= upper + tolerance)).all(axis=0))[0]
+        if len(unresolved) == 0:
+            return cellIDs
+
+        candidates = min(candidates, self.numberOfCells)
+        tree = self._getCellCenterTree(overlapping=True)
+        if tree is None:
+            nearest = numerix.nearest(data=self._scaledCellCenters,
+                                      points=points[..., unresolved])[numerix.newaxis]
+        else:
+            nearest = tree.query(points[..., unresolved].swapaxes(0, 1), k=candidates)[1]
+            nearest = numerix.reshape(nearest, (len(unresolved), -1)).swapaxes(0, 1)
+        candidateIDs = numerix.zeros((len(nearest), M), dtype=numerix.INT_DTYPE)
+        candidateIDs[:, unresolved] = nearest
+
+        for candidate in candidateIDs:
+            if len(unresolved) == 0:
+                break
+
+            cells = candidate[unresolved]
+            found = contains(unresolved, cells)
+
+            cellIDs[unresolved[found]] = cells[found]
+            unresolved = unresolved[~found]
+
+        if len(unresolved) > 0:
+            # a point inside a cell is no further from the cell center
+            # than the farthest vertex of the cell
+            vertexIDs = self._cellVertexIDs
+            vertices = numerix.take(vertexCoords, MA.filled(vertexIDs, 0), axis=-1)
+            radii = numerix.sqrt(numerix.sum((vertices - cellCenters[:, numerix.newaxis]) ** 2, axis=0))
+            radii = MA.filled(MA.masked_where(MA.getmaskarray(vertexIDs), radii), 0).max(axis=0)
+            # `cKDTree` reports missing neighbors as cell `numberOfCells`
+            radii = numerix.concatenate((radii * (1 + 1e-10), [-1.]))
+
+            if tree is None:
+                for point in unresolved:
+                    offsets = cellCenters - points[..., point, numerix.newaxis]
+                    cells = numerix.nonzero(numerix.sqrt(numerix.sum(offsets**2, axis=0)) <= radii[:-1])[0]
+                    if len(cells) > 0:
+                        found = contains(numerix.repeat(point, len(cells)), cells)
+                        if found.any():
+                            cellIDs[point] = cells[found][0]
+            else:
+                # look at geometrically more of the nearest cells, until
+                # the remaining ones are too far away to contain the point
+                k = candidates
+                while len(unresolved) > 0 and k < self.numberOfCells:
+                    start, k = k, min(2 * k, self.numberOfCells)
+                    distances, neighbors = tree.query(points[..., unresolved].swapaxes(0, 1), k=k,
+                                                      distance_upper_bound=radii.max())
+                    distances = numerix.reshape(distances, (len(unresolved), k))[:, start:]
+                    neighbors = numerix.reshape(neighbors, (len(unresolved), k))[:, start:]
+
+                    near = distances <= radii[neighbors]
+                    pointIDs = numerix.repeat(unresolved[:, numerix.newaxis], k - start, axis=1)[near]
+                    cells = neighbors[near]
+                    found = contains(pointIDs, cells)
+
+                    # a point on the boundary between cells belongs to the first
+                    cellIDs[pointIDs[found][::-1]] = cells[found][::-1]
+
+                    unresolved = unresolved[(cellIDs[unresolved] < 0)
+                                            & numerix.isfinite(distances[:, -1])]
+
+        found = cellIDs >= 0
+        cellIDs[found] = numerix.asarray(self._globalOverlappingCellIDs)[cellIDs[found]]
+
+        return cellIDs
 
     def _test(self):
         """
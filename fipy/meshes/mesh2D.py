@@ -122,11 +122,9 @@ class Mesh2D(Mesh):
 
         faceWeightedNonOrthogonalities = abs(faceCrossProducts / faceDisplacementVectorLengths) * self._faceAreas
 
-        cellFaceWeightedNonOrthogonalities = numerix.take(faceWeightedNonOrthogonalities, self.cellFaceIDs)
-
-        cellFaceAreas = numerix.take(self._faceAreas, self.cellFaceIDs)
-        cellTotalWeightedValues = numerix.add.reduce(cellFaceWeightedNonOrthogonalities, axis = 0)
-        cellTotalFaceAreas = numerix.add.reduce(cellFaceAreas, axis = 0)
+        cellFaces = self._raggedCellFaceIDs
+        cellTotalWeightedValues = cellFaces.sum(faceWeightedNonOrthogonalities[cellFaces.indices])
+        cellTotalFaceAreas = cellFaces.sum(self._faceAreas[cellFaces.indices])
 
         return (cellTotalWeightedValues / cellTotalFaceAreas)
 
@@ -0,0 +1,136 @@
+"""Connectivity of cells with different numbers of faces, or faces with
+different numbers of vertices
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+__all__ = []
+
+class _RaggedArray(object):
+    """Rows of different lengths, stored as the `indices` of all rows one
+    after the other and the `offsets` at which each row starts
+
+    :class:`~fipy.meshes.mesh.Mesh` stores connectivity, such as
+    `cellFaceIDs`, as masked arrays with one column per cell, padded to
+    the length of the longest column
+
+        >>> padded = MA.masked_values(((0, 3, 5),
+        ...                            (1, 4, -1),
+        ...                            (2, -1, -1)), -1)
+        >>> ragged = _RaggedArray.fromPadded(padded)
+        >>> print(ragged.offsets)
+        [0 3 5 6]
+        >>> print(ragged.indices)
+        [0 1 2 3 4 5]
+        >>> print(ragged.rows)
+        [0 0 0 1 1 2]
+        >>> print(ragged.lengths)
+        [3 2 1]
+
+    Values with one entry per index are reduced over each row without
+    any padding
+
+        >>> values = numerix.array(((1., 2., 3., 4., 5., 6.),
+        ...                         (0., 0., 3., 3., 1., 1.)))
+        >>> print(ragged.sum(values))
+        [[ 6.  9.  6.]
+         [ 3.  4.  1.]]
+        >>> print(ragged.mean(values))
+        [[ 2.   4.5  6. ]
+         [ 1.   2.   1. ]]
+
+    The entries that follow each entry, cyclically within its row, make
+    up the edges of polygons
+
+        >>> print(ragged.successors)
+        [1 2 0 4 3 5]
+        >>> print(ragged.firsts)
+        [0 0 0 3 3 5]
+
+    Rows may be empty
+
+        >>> empty = _RaggedArray.fromPadded(MA.masked_values(((0, -1, 1),), -1))
+        >>> print(empty.offsets)
+        [0 1 1 2]
+        >>> print(empty.sum(numerix.array((2., 3.))))
+        [ 2.  0.  3.]
+    """
+
+    def __init__(self, offsets, indices):
+        self.offsets = offsets
+        self.indices = indices
+        self.lengths = offsets[1:] - offsets[:-1]
+        self.numberOfRows = len(self.lengths)
+        self.rows = numerix.repeat(numerix.arange(self.numberOfRows), self.lengths)
+        if self.numberOfRows > 0 and numerix.all(self.lengths == self.lengths[0]):
+            self._uniformLength = self.lengths[0]
+        else:
+            self._uniformLength = None
+
+    @classmethod
+    def fromPadded(cls, padded):
+        """Convert a masked array with one column per row
+
+        Parameters
+        ----------
+        padded : ~numpy.ma.MaskedArray
+            Indices of each row, in order, down each column
+        """
+        valid = numerix.logical_not(MA.getmaskarray(padded)).swapaxes(0, 1)
+        indices = MA.filled(padded, 0).swapaxes(0, 1)[valid]
+        offsets = numerix.concatenate(([0], numerix.cumsum(valid.sum(axis=-1))))
+        return cls(offsets=numerix.asarray(offsets, dtype=numerix.INT_DTYPE),
+                   indices=numerix.asarray(indices, dtype=numerix.INT_DTYPE))
+
+    def sum(self, values):
+        """Sum of `values` with one entry per index, over each row
+
+        Parameters
+        ----------
+        values : array_like
+            Values of shape `(..., len(indices))`
+        """
+        values = numerix.asarray(values)
+        if self._uniformLength is not None:
+            # no need to search for the end of each row
+            return values.reshape(values.shape[:-1]
+                                  + (self.numberOfRows, self._uniformLength)).sum(axis=-1)
+
+        flat = values.reshape((-1, values.shape[-1]))
+        sums = numerix.empty((flat.shape[0], self.numberOfRows), dtype=float)
+        for i in range(flat.shape[0]):
+            sums[i] = numerix.bincount(self.rows, weights=flat[i], minlength=self.numberOfRows)
+        return sums.reshape(values.shape[:-1] + (self.numberOfRows,))
+
+    def mean(self, values):
+        """Average of `values` with one entry per index, over each row
+        """
+        return self.sum(values) / numerix.maximum(self.lengths, 1)
+
+    @property
+    def successors(self):
+        """Position of the entry that follows each entry in its row
+        """
+        successors = numerix.arange(1, len(self.indices) + 1)
+        last = self.offsets[1:][self.lengths > 0] - 1
+        successors[last] = self.offsets[:-1][self.lengths > 0]
+        return successors
+
+    @property
+    def firsts(self):
+        """Position of the first entry of the row of each entry
+        """
+        return numerix.repeat(self.offsets[:-1], self.lengths)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -11,6 +11,7 @@ def _suite():
     return _LateImportDocTestSuite(docTestModuleNames = (
         'fipy.meshes.mesh',
         'fipy.meshes.mesh2D',
+        'fipy.meshes.raggedArray',
         'fipy.meshes.nonUniformGrid1D',
         'fipy.meshes.nonUniformGrid2D',
         'fipy.meshes.nonUniformGrid3D',
@@ -19,6 +20,7 @@ def _suite():
         'fipy.meshes.periodicGrid1D',
         'fipy.meshes.periodicGrid2D',
         'fipy.meshes.periodicGrid3D',
+        'fipy.meshes.uniformGrid',
         'fipy.meshes.uniformGrid1D',
         'fipy.meshes.uniformGrid2D',
         'fipy.meshes.uniformGrid3D',
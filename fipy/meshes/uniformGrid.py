@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
 from fipy.meshes.abstractMesh import AbstractMesh
+from fipy.tools import numerix
 
 __all__ = ["UniformGrid"]
 from future.utils import text_to_native_str
@@ -51,3 +52,35 @@ class UniformGrid(AbstractMesh):
 
     _faceToCellDistances = property(_getFaceToCellDistances,
                                     _setFaceToCellDistances)
+
+    def _getContainingCellID(self, points):
+        """Find the cells that contain `points`
+
+        The cell indices of a uniform grid are computed directly.
+
+           >>> from fipy import *
+           >>> m = Grid2D(nx=3, ny=2)
+           >>> print(m._getContainingCellID(((0.5, 2.9, 3.5), (0.5, 1.2, 1.))))
+           [ 0  5 -1]
+
+        Parameters
+        ----------
+        points : array_like
+            A set of points in the format (X, Y, Z)
+
+        Returns
+        -------
+        ndarray
+            Global ID of the cell containing each point, or `-1` for
+            points that do not lie within the grid.
+        """
+        points = numerix.asarray(points, dtype=float)
+        cellIDs = numerix.array(self._getNearestCellID(points), dtype=numerix.INT_DTYPE)
+
+        if len(cellIDs) > 0:
+            spacing = numerix.array([getattr(self, d) for d in ("dx", "dy", "dz")[:self.dim]], dtype=float)
+            offsets = points - numerix.take(self.cellCenters.globalValue, cellIDs, axis=-1)
+            outside = (abs(offsets) > (spacing / 2. * (1 + 1e-10))[..., numerix.newaxis]).any(axis=0)
+            cellIDs[outside] = -1
+
+        return cellIDs
@@ -109,6 +109,19 @@ class UniformGrid2D(UniformGrid):
         interiorFaces[interiorIDs] = True
         return interiorFaces
 
+    @property
+    def _faceBands(self):
+        Nhor = self.numberOfHorizontalFaces
+        inner = slice(1, -1)
+        lower = slice(0, -1)
+        upper = slice(1, None)
+        every = slice(None)
+        return ((self.ny, self.nx),
+                (((0, Nhor, (self.numberOfHorizontalRows, self.nx), (inner, every)),
+                  (lower, every), (upper, every)),
+                 ((Nhor, self.numberOfFaces, (self.ny, self.numberOfVerticalColumns), (every, inner)),
+                  (every, lower), (every, upper))))
+
     @property
     def _cellToFaceOrientations(self):
         cellFaceOrientations = numerix.ones((4, self.numberOfCells), 'l')
@@ -122,6 +122,22 @@ class UniformGrid3D(UniformGrid):
         interiorFaces[interiorIDs] = True
         return interiorFaces
 
+    @property
+    def _faceBands(self):
+        NXY = self.numberOfXYFaces
+        NXZ = self.numberOfXZFaces
+        inner = slice(1, -1)
+        lower = slice(0, -1)
+        upper = slice(1, None)
+        every = slice(None)
+        return ((self.nz, self.ny, self.nx),
+                (((0, NXY, (self.nz + 1, self.ny, self.nx), (inner, every, every)),
+                  (lower, every, every), (upper, every, every)),
+                 ((NXY, NXY + NXZ, (self.nz, self.ny + 1, self.nx), (every, inner, every)),
+                  (every, lower, every), (every, upper, every)),
+                 ((NXY + NXZ, self.numberOfFaces, (self.nz, self.ny, self.nx + 1), (every, every, inner)),
+                  (every, every, lower), (every, every, upper))))
+
     @property
     def _cellToFaceOrientations(self):
         tmp = numerix.take(self.faceCellIDs[0], self.cellFaceIDs)
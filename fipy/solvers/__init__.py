@@ -140,6 +140,19 @@ register_skipper(flag='PYSPARSE_SOLVER',
                  why="the Pysparse solvers are not being used.",
                  skipWarning=True)
 
+def _checkForPyAMG():
+    hasPyAMG = True
+    try:
+        import pyamg
+    except Exception:
+        hasPyAMG = False
+    return hasPyAMG
+
+register_skipper(flag='PYAMG',
+                 test=_checkForPyAMG,
+                 why="the `pyamg` package cannot be imported",
+                 skipWarning=True)
+
 register_skipper(flag='NOT_PYAMGX_SOLVER',
                  test=lambda: solver != 'pyamgx',
                  why="the PyAMGX solver is being used.",
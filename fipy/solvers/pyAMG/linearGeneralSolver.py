@@ -1,7 +1,9 @@
 from __future__ import unicode_literals
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.solver import SolverConvergence
 from pyamg import solve
 import os
+import time
 from fipy.tools import numerix
 
 __all__ = ["LinearGeneralSolver"]
@@ -21,4 +23,21 @@ class LinearGeneralSolver(_ScipySolver):
         else:
             verbosity = False
 
-        return solve(L.matrix, b, verb=verbosity, tol=self.tolerance)
+        start = time.time()
+        x = solve(L.matrix, b, verb=verbosity, tol=self.tolerance)
+        solveTime = time.time() - start
+
+        residual = numerix.L2norm(b - L.matrix * x) / (numerix.L2norm(b) or 1.)
+        if residual <= self.tolerance:
+            status = "converged"
+        else:
+            status = "maximum iterations"
+
+        # `pyamg.solve` doesn't report its iterations
+        self.convergence = SolverConvergence(solver=self,
+                                             status=status,
+                                             iterations=None,
+                                             residual=residual,
+                                             solveTime=solveTime)
+
+        return x
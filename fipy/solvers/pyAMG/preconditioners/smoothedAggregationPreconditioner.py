@@ -1,14 +1,215 @@
+from __future__ import division
 from __future__ import unicode_literals
 from builtins import object
+from builtins import zip
 from pyamg import smoothed_aggregation_solver
+from pyamg.multilevel import coarse_grid_solver
+from pyamg.relaxation.smoothing import change_smoothers
+from scipy.sparse.linalg import LinearOperator
+
+from fipy.tools import numerix
 
 __all__ = ["SmoothedAggregationPreconditioner"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
 class SmoothedAggregationPreconditioner(object):
-    def __init__(self):
-        pass
+    """
+    Smoothed aggregation algebraic multigrid preconditioner for PyAMG.
+
+    Building the multigrid hierarchy usually costs more than the solve
+    it preconditions.  When the sparsity of the matrix doesn't change
+    and its values change slowly, as from one sweep or time step to the
+    next, the aggregates and prolongators of an earlier hierarchy remain
+    good and only the Galerkin coarse operators need to be recalculated
+    from the new matrix.
+
+    By default, a new hierarchy is built, with the smoothers and coarse
+    solver that PyAMG chooses, for every solve.  A reused hierarchy
+    needs its smoothers and coarse solver to be rebuilt after each
+    refresh, so it always uses symmetric block Gauss-Seidel smoothing
+    and a pseudoinverse coarse solve.
+
+    >>> from fipy.tools import numerix
+    >>> from pyamg.gallery import poisson # doctest: +PYAMG
+    >>> A = poisson((30, 30), format='csr') # doctest: +PYAMG
+    >>> b = numerix.ones(A.shape[0])
+
+    When the values of the matrix change, but not its sparsity, the
+    hierarchy is reused
+
+    >>> precon = SmoothedAggregationPreconditioner(reuseHierarchy=True)
+    >>> M = precon._applyToMatrix(A) # doctest: +PYAMG
+    >>> hierarchy = precon._hierarchy
+    >>> A2 = (2 * A).tocsr() # doctest: +PYAMG
+    >>> M2 = precon._applyToMatrix(A2) # doctest: +PYAMG
+    >>> print(precon._hierarchy is hierarchy) # doctest: +PYAMG
+    True
+    >>> print(precon._reuses) # doctest: +PYAMG
+    1
+
+    and it gives the same answer as a hierarchy built from scratch
+
+    >>> def solve(A, M, b):
+    ...     x = numerix.zeros(len(b))
+    ...     for i in range(20):
+    ...         x = x + M.matvec(b - A * x)
+    ...     return x
+    >>> fresh = SmoothedAggregationPreconditioner(reuseHierarchy=True)
+    >>> M2fresh = fresh._applyToMatrix(A2) # doctest: +PYAMG
+    >>> print(fresh._hierarchy is hierarchy) # doctest: +PYAMG
+    False
+    >>> x = solve(A2, M2, b) # doctest: +PYAMG
+    >>> print(numerix.allclose(x, solve(A2, M2fresh, b))) # doctest: +PYAMG
+    True
+    >>> from scipy.sparse.linalg import spsolve
+    >>> print(numerix.allclose(x, spsolve(A2, b))) # doctest: +PYAMG
+    True
+
+    A matrix with different sparsity gets a new hierarchy
+
+    >>> M3 = precon._applyToMatrix(poisson((20, 20), format='csr')) # doctest: +PYAMG
+    >>> print(precon._hierarchy is hierarchy) # doctest: +PYAMG
+    False
+
+    A `rebuildInterval` limits how many times a hierarchy is reused
+
+    >>> precon = SmoothedAggregationPreconditioner(reuseHierarchy=True,
+    ...                                            rebuildInterval=1)
+    >>> M = precon._applyToMatrix(A) # doctest: +PYAMG
+    >>> hierarchy = precon._hierarchy
+    >>> M = precon._applyToMatrix(A2) # doctest: +PYAMG
+    >>> print(precon._hierarchy is hierarchy) # doctest: +PYAMG
+    True
+    >>> M = precon._applyToMatrix(A) # doctest: +PYAMG
+    >>> print(precon._hierarchy is hierarchy) # doctest: +PYAMG
+    False
+
+    and an `iterationGrowth` rebuilds it when a solve needs too many
+    more applications of the preconditioner than the first solve with
+    the hierarchy did
+
+    >>> precon = SmoothedAggregationPreconditioner(reuseHierarchy=True,
+    ...                                            iterationGrowth=2.)
+    >>> M = precon._applyToMatrix(A) # doctest: +PYAMG
+    >>> hierarchy = precon._hierarchy
+    >>> x = [M.matvec(b) for i in range(2)] # doctest: +PYAMG
+    >>> M = precon._applyToMatrix(A2) # doctest: +PYAMG
+    >>> print(precon._hierarchy is hierarchy) # doctest: +PYAMG
+    True
+    >>> x = [M.matvec(b) for i in range(5)] # doctest: +PYAMG
+    >>> M = precon._applyToMatrix(A) # doctest: +PYAMG
+    >>> print(precon._hierarchy is hierarchy) # doctest: +PYAMG
+    False
+    """
+
+    _smoother = ('block_gauss_seidel', {'sweep': 'symmetric'})
+    _coarseSolver = 'pinv'
+
+    def __init__(self, reuseHierarchy=False, rebuildInterval=None, iterationGrowth=None):
+        """
+        Parameters
+        ----------
+        reuseHierarchy : bool
+            Keep the aggregates and prolongators of the multigrid
+            hierarchy between solves and only recalculate its coarse
+            operators, as long as the sparsity of the matrix is
+            unchanged.
+        rebuildInterval : int
+            If `reuseHierarchy`, build a new hierarchy after it has been
+            reused this many times.
+        iterationGrowth : float
+            If `reuseHierarchy`, build a new hierarchy when a solve takes
+            more than this many times the iterations of the first solve
+            with the current hierarchy.
+        """
+        self.reuseHierarchy = reuseHierarchy
+        self.rebuildInterval = rebuildInterval
+        self.iterationGrowth = iterationGrowth
+
+        self._hierarchy = None
+        self._indptr = None
+        self._indices = None
+        self._reuses = 0
+        self._applications = 0
+        self._baselineApplications = None
+
+    def _degraded(self):
+        """Whether the last solve took too many more iterations than
+        the first solve with the current hierarchy
+        """
+        if self._baselineApplications is None:
+            self._baselineApplications = self._applications
+            return False
+        return (self.iterationGrowth is not None
+                and self._applications > self.iterationGrowth * self._baselineApplications)
+
+    def _canReuse(self, A):
+        if not self.reuseHierarchy or self._hierarchy is None:
+            return False
+
+        if self._degraded():
+            return False
+
+        if self.rebuildInterval is not None and self._reuses >= self.rebuildInterval:
+            return False
+
+        A.sort_indices()
+        return (numerix.array_equal(self._indptr, A.indptr)
+                and numerix.array_equal(self._indices, A.indices))
+
+    def _build(self, A):
+        if not self.reuseHierarchy:
+            self._hierarchy = smoothed_aggregation_solver(A)
+        else:
+            self._hierarchy = smoothed_aggregation_solver(A,
+                                                          presmoother=self._smoother,
+                                                          postsmoother=self._smoother,
+                                                          coarse_solver=self._coarseSolver)
+            A.sort_indices()
+            self._indptr = A.indptr.copy()
+            self._indices = A.indices.copy()
+
+        self._reuses = 0
+        self._baselineApplications = None
+
+    def _refresh(self, A):
+        """Recalculate the Galerkin coarse operators of the hierarchy from `A`
+        """
+        levels = self._hierarchy.levels
+        levels[0].A = A
+        for fine, coarse in zip(levels[:-1], levels[1:]):
+            coarse.A = fine.R * fine.A * fine.P
+
+        # the smoothers and the coarse solver hold on to factors of the
+        # old operators
+        change_smoothers(self._hierarchy, presmoother=self._smoother, postsmoother=self._smoother)
+        self._hierarchy.coarse_solver = coarse_grid_solver(self._coarseSolver)
+        self._reuses += 1
 
     def _applyToMatrix(self, A):
-        return smoothed_aggregation_solver(A).aspreconditioner(cycle='V')
+        if self._canReuse(A):
+            self._refresh(A)
+        else:
+            self._build(A)
+
+        M = self._hierarchy.aspreconditioner(cycle='V')
+
+        if not self.reuseHierarchy:
+            return M
+
+        # each iteration of the Krylov solver applies the preconditioner
+        # about once
+        self._applications = 0
+        def matvec(b):
+            self._applications += 1
+            return M.matvec(b)
+
+        return LinearOperator(M.shape, matvec=matvec, dtype=M.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
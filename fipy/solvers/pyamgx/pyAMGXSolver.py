@@ -1,10 +1,12 @@
 from __future__ import unicode_literals
+import time
+
 import numpy
 from scipy.sparse import csr_matrix
 
 import pyamgx
 
-from fipy.solvers.solver import Solver
+from fipy.solvers.solver import Solver, SolverConvergence
 from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
 from fipy.tools import numerix
 
@@ -66,19 +68,40 @@ class PyAMGXSolver(Solver):
         self.var = var
         self.matrix = matrix
         self.RHSvector = RHSvector
+        start = time.time()
         self.A_gpu.upload_CSR(self.matrix.matrix)
+        self.setupTime = time.time() - start
+
+        start = time.time()
         self.solver.setup(self.A_gpu)
+        self.preconditionerTime = time.time() - start
 
     def _solve_(self, L, x, b):
+        start = time.time()
         # transfer data from CPU to GPU
         self.x_gpu.upload(x)
         self.b_gpu.upload(b)
+        setupTime = self.setupTime + time.time() - start
 
         # solve system on GPU
+        start = time.time()
         self.solver.solve(self.b_gpu, self.x_gpu)
+        solveTime = time.time() - start
 
         # download values from GPU to CPU
         self.x_gpu.download(x)
+
+        status = self.solver.status
+        if status == "success":
+            status = "converged"
+
+        self.convergence = SolverConvergence(solver=self,
+                                             status=status,
+                                             iterations=self.solver.iterations_number,
+                                             setupTime=setupTime,
+                                             preconditionerTime=self.preconditionerTime,
+                                             solveTime=solveTime)
+
         return x
 
     def _solve(self):
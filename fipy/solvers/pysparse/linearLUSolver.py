@@ -5,10 +5,12 @@ from builtins import range
 __docformat__ = 'restructuredtext'
 
 import os
+import time
 
 from pysparse import superlu
 
 from fipy.solvers.pysparse.pysparseSolver import PysparseSolver
+from fipy.solvers.solver import SolverConvergence
 from fipy.tools import numerix
 
 DEBUG = False
@@ -58,25 +60,43 @@ class LinearLUSolver(PysparseSolver):
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
+        start = time.time()
         LU = superlu.factorize(L.matrix.to_csr())
+        preconditionerTime = time.time() - start
 
         if DEBUG:
             import sys
             print(L.matrix, file=sys.stderr)
 
+        start = time.time()
         error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
+        history = []
+        status = "maximum iterations"
+        iterations = 0
         for iteration in range(self.iterations):
+            iterations = iteration + 1
             errorVector = L * x - b
 
-            if (numerix.sqrt(numerix.sum(errorVector**2)) / error0)  <= self.tolerance:
+            history.append(numerix.sqrt(numerix.sum(errorVector**2)) / error0)
+            if history[-1] <= self.tolerance:
+                status = "converged"
                 break
 
             xError = numerix.zeros(len(b), 'd')
             LU.solve(errorVector, xError)
             x[:] = x - xError
 
+        self.convergence = SolverConvergence(solver=self,
+                                             status=status,
+                                             iterations=iterations,
+                                             residual=history[-1] if history else None,
+                                             residualHistory=history,
+                                             preconditionerTime=preconditionerTime,
+                                             solveTime=time.time() - start)
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
-            PRINT('iterations: %d / %d' % (iteration+1, self.iterations))
-            PRINT('residual:', numerix.sqrt(numerix.sum(errorVector**2)))
+            PRINT('iterations: %d / %d' % (iterations, self.iterations))
+            if history:
+                PRINT('residual:', numerix.sqrt(numerix.sum(errorVector**2)))
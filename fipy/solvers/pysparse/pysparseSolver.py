@@ -2,7 +2,10 @@ from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
 import os
+import time
+
 from fipy.solvers.pysparseMatrixSolver import _PysparseMatrixSolver
+from fipy.solvers.solver import SolverConvergence
 
 __all__ = ["PysparseSolver"]
 from future.utils import text_to_native_str
@@ -38,14 +41,24 @@ class PysparseSolver(_PysparseMatrixSolver):
 
         A = L.matrix
 
+        start = time.time()
         if self.preconditioner is None:
             P = None
         else:
             P, A = self.preconditioner._applyToMatrix(A)
+        preconditionerTime = time.time() - start
 
+        start = time.time()
         info, iter, relres = self.solveFnc(A, b, x, self.tolerance,
                                            self.iterations, P)
 
+        self.convergence = SolverConvergence(solver=self,
+                                             status=self._status(info),
+                                             iterations=iter,
+                                             residual=relres,
+                                             preconditionerTime=preconditionerTime,
+                                             solveTime=time.time() - start)
+
         self._raiseWarning(info, iter, relres)
 
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
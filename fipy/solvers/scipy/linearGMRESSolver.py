@@ -5,6 +5,13 @@ from scipy.sparse.linalg import gmres
 
 from fipy.solvers.scipy.scipyKrylovSolver import _ScipyKrylovSolver
 
+try:
+    from inspect import signature
+    _acceptsCallbackType = "callback_type" in signature(gmres).parameters
+except ImportError:
+    # Python 2, whose SciPy predates `callback_type`
+    _acceptsCallbackType = False
+
 __all__ = ["LinearGMRESSolver"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
@@ -29,3 +36,8 @@ class LinearGMRESSolver(_ScipyKrylovSolver):
 
         super(LinearGMRESSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
         self.solveFnc = gmres
+        if _acceptsCallbackType:
+            # the residual norm of each inner iteration, as reported
+            # before `callback_type` was introduced, without the warning
+            # that leaving it out now raises
+            self._solveOptions = dict(callback_type="legacy")
@@ -1,13 +1,16 @@
 from __future__ import division
 from __future__ import unicode_literals
 from builtins import range
+from builtins import object
 __docformat__ = 'restructuredtext'
 
 import os
+import time
 
 from scipy.sparse.linalg import splu
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.solver import SolverConvergence
 from fipy.tools import numerix
 
 __all__ = ["LinearLUSolver"]
@@ -21,6 +24,98 @@ class LinearLUSolver(_ScipySolver):
     the Scipy `scipy.sparse.linalg.splu` module.
     """
 
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None,
+                 reuseFactorization=False):
+        """
+        Create a `LinearLUSolver`.
+
+        Parameters
+        ----------
+        tolerance : float
+            Required error tolerance.
+        iterations : int
+            Maximum number of iterative steps to perform.
+        precon
+            *ignored*
+        reuseFactorization : bool
+            Keep the LU factorization between calls to `solve()` or
+            `sweep()`.  If the matrix is unchanged, the factorization is
+            reused as is.  If only the values of the matrix have changed,
+            the column permutation of the last full factorization is
+            reused.
+        """
+        super(LinearLUSolver, self).__init__(tolerance=tolerance,
+                                             iterations=iterations,
+                                             precon=precon)
+        self.reuseFactorization = reuseFactorization
+        self._factoredMatrix = None
+        self._LU = None
+        self._columnOrder = None
+
+    @staticmethod
+    def _splu(A, permc_spec=3):
+        return splu(A, diag_pivot_thresh=1.,
+                       relax=1,
+                       panel_size=10,
+                       permc_spec=permc_spec)
+
+    def _factorize(self, A):
+        """Factor `A`, reusing as much as possible of the last factorization.
+
+        Solving again with the same matrix reuses the factorization
+
+            >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm, Variable
+            >>> mesh = Grid1D(nx=10)
+            >>> var = CellVariable(mesh=mesh, hasOld=True)
+            >>> var.constrain(1., mesh.facesLeft)
+            >>> D = Variable(1.)
+            >>> eq = TransientTerm() == DiffusionTerm(coeff=D)
+            >>> solver = LinearLUSolver(reuseFactorization=True)
+            >>> eq.solve(var=var, dt=1., solver=solver)
+            >>> LU, columnOrder = solver._LU, solver._columnOrder
+            >>> var.updateOld()
+            >>> eq.solve(var=var, dt=1., solver=solver)
+            >>> print(solver._LU is LU)
+            True
+
+        and a matrix with new values in the same places is factored again
+        with the column order of the first factorization
+
+            >>> D.value = 10.
+            >>> var.updateOld()
+            >>> expected = var.copy()
+            >>> eq.solve(var=expected, dt=1., solver=LinearLUSolver())
+            >>> eq.solve(var=var, dt=1., solver=solver)
+            >>> print(solver._LU is LU)
+            False
+            >>> print(solver._columnOrder is columnOrder)
+            True
+            >>> print(numerix.allclose(var, expected))
+            True
+        """
+        previous = self._factoredMatrix
+        A.sort_indices()
+
+        if (previous is not None
+            and previous.shape == A.shape
+            and numerix.array_equal(previous.indptr, A.indptr)
+            and numerix.array_equal(previous.indices, A.indices)):
+            if numerix.array_equal(previous.data, A.data):
+                return self._LU
+            else:
+                LU = _PermutedLU(self._splu(A[:, self._columnOrder],
+                                            permc_spec="NATURAL"),
+                                 self._columnOrder)
+        else:
+            LU = self._splu(A)
+            # `perm_c` maps each column of `A` to its permuted position
+            self._columnOrder = numerix.argsort(LU.perm_c)
+
+        self._factoredMatrix = A
+        self._LU = LU
+
+        return LU
+
     def _solve_(self, L, x, b):
         diag = L.takeDiagonal()
         maxdiag = max(numerix.absolute(diag))
@@ -28,25 +123,57 @@ class LinearLUSolver(_ScipySolver):
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
-        LU = splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
-                                            relax=1,
-                                            panel_size=10,
-                                            permc_spec=3)
+        start = time.time()
+        if self.reuseFactorization:
+            LU = self._factorize(L.matrix.asformat("csc"))
+        else:
+            LU = self._splu(L.matrix.asformat("csc"))
+        preconditionerTime = time.time() - start
 
+        start = time.time()
         error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
+        history = []
+        status = "maximum iterations"
+        iterations = 0
         for iteration in range(min(self.iterations, 10)):
+            iterations = iteration + 1
             errorVector = L * x - b
 
-            if (numerix.sqrt(numerix.sum(errorVector**2)) / error0)  <= self.tolerance:
+            history.append(numerix.sqrt(numerix.sum(errorVector**2)) / error0)
+            if history[-1] <= self.tolerance:
+                status = "converged"
                 break
 
             xError = LU.solve(errorVector)
             x[:] = x - xError
 
+        self.convergence = SolverConvergence(solver=self,
+                                             status=status,
+                                             iterations=iterations,
+                                             residual=history[-1] if history else None,
+                                             residualHistory=history,
+                                             preconditionerTime=preconditionerTime,
+                                             solveTime=time.time() - start)
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
-            PRINT('iterations: %d / %d' % (iteration+1, self.iterations))
-            PRINT('residual:', numerix.sqrt(numerix.sum(errorVector**2)))
+            PRINT('iterations: %d / %d' % (iterations, self.iterations))
+            if history:
+                PRINT('residual:', numerix.sqrt(numerix.sum(errorVector**2)))
+
+        return x
+
+class _PermutedLU(object):
+    """LU factorization of a column-permuted matrix, `A[:, columnOrder]`,
+    that solves for the unpermuted system.
+    """
+
+    def __init__(self, LU, columnOrder):
+        self.LU = LU
+        self.columnOrder = columnOrder
 
+    def solve(self, b):
+        x = numerix.empty_like(b)
+        x[self.columnOrder] = self.LU.solve(b)
         return x
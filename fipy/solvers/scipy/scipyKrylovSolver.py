@@ -4,8 +4,12 @@ __docformat__ = 'restructuredtext'
 __all__ = []
 
 import os
+import time
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.solver import SolverConvergence
+from fipy.tools import numerix
+from fipy.tools import sweepProfiler
 
 class _ScipyKrylovSolver(_ScipySolver):
     """
@@ -14,20 +18,63 @@ class _ScipyKrylovSolver(_ScipySolver):
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
+    # keyword arguments of `solveFnc` that only some of them take
+    _solveOptions = {}
+
     def _solve_(self, L, x, b):
         A = L.matrix
+        start = time.time()
         if self.preconditioner is None:
             M = None
         else:
-            M = self.preconditioner._applyToMatrix(A)
+            with sweepProfiler._timing("Solver precondition", self.preconditioner.__class__.__name__):
+                M = self.preconditioner._applyToMatrix(A)
+        preconditionerTime = time.time() - start
+
+        bNorm = numerix.L2norm(b)
+        if bNorm == 0:
+            bNorm = 1.
+        history = []
+
+        def callback(arg):
+            # GMRES reports its (preconditioned) residual norm, the
+            # others report the current solution
+            if numerix.ndim(arg) == 0:
+                history.append(float(arg))
+            elif self.recordResidualHistory:
+                history.append(numerix.L2norm(b - A * arg) / bNorm)
+            else:
+                history.append(None)
+
+        start = time.time()
+        with sweepProfiler._timing("Solver iterate", self.__class__.__name__):
+            x, info = self.solveFnc(A, b, x,
+                                    tol=self.tolerance,
+                                    maxiter=self.iterations,
+                                    M=M,
+                                    callback=callback,
+                                    **self._solveOptions)
+        solveTime = time.time() - start
+
+        if info == 0:
+            status = "converged"
+        elif info > 0:
+            status = "maximum iterations"
+        else:
+            status = "illegal input or breakdown"
 
-        x, info = self.solveFnc(A, b, x,
-                                tol=self.tolerance,
-                                maxiter=self.iterations,
-                                M=M)
+        self.convergence = SolverConvergence(solver=self,
+                                             status=status,
+                                             iterations=len(history),
+                                             residual=numerix.L2norm(b - A * x) / bNorm,
+                                             residualHistory=[r for r in history if r is not None],
+                                             preconditionerTime=preconditionerTime,
+                                             solveTime=solveTime)
 
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
-            if info < 0:
-                PRINT('failure', self._warningList[info].__class__.__name__)
+            from fipy.tools.debug import PRINT
+            PRINT('status:', status)
+            PRINT('iterations: %d / %d' % (len(history), self.iterations))
+            PRINT('residual:', self.convergence.residual)
 
         return x
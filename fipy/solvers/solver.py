@@ -22,7 +22,8 @@ from fipy.tools import numerix
 __all__ = ["SolverConvergenceWarning", "MaximumIterationWarning",
            "PreconditionerWarning", "IllConditionedPreconditionerWarning",
            "PreconditionerNotPositiveDefiniteWarning", "MatrixIllConditionedWarning",
-           "StagnatedSolverWarning", "ScalarQuantityOutOfRangeWarning", "Solver"]
+           "StagnatedSolverWarning", "ScalarQuantityOutOfRangeWarning", "Solver",
+           "SolverConvergence"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
@@ -62,13 +63,110 @@ class ScalarQuantityOutOfRangeWarning(SolverConvergenceWarning):
     def __str__(self):
         return "A scalar quantity became too small or too large to continue computing. Iterations: %g. Relative error: %g" % (self.iter, self.relres)
 
+class SolverConvergence(object):
+    """
+    Record of how a `Solver` solved a linear system
+
+    After each solution, the record is available as the `convergence`
+    attribute of the `Solver` and of the `Term` that was solved.
+
+        >>> from fipy import Grid1D, CellVariable, DiffusionTerm, DefaultSolver
+        >>> mesh = Grid1D(nx=10)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(1., mesh.facesLeft)
+        >>> eq = DiffusionTerm()
+        >>> solver = DefaultSolver(tolerance=1e-10)
+        >>> res = eq.sweep(var=var, solver=solver)
+        >>> convergence = solver.convergence
+        >>> print(convergence is eq.convergence)
+        True
+        >>> print(convergence.status) # doctest: +NOT_PYAMGX_SOLVER
+        converged
+        >>> print(convergence.converged)
+        True
+        >>> print(convergence.iterations > 0)
+        True
+        >>> print(convergence.residual < 1e-9) # doctest: +NOT_PYAMGX_SOLVER
+        True
+        >>> print(convergence.solveTime >= 0.)
+        True
+
+    A `LinearLUSolver` that is allowed no iterations leaves the solution
+    as it was, and has no residual to report
+
+        >>> from fipy import LinearLUSolver
+        >>> var.value = 0.
+        >>> eq.solve(var=var, solver=LinearLUSolver(iterations=0)) # doctest: +NOT_PYAMGX_SOLVER
+        >>> print(eq.convergence.iterations) # doctest: +NOT_PYAMGX_SOLVER
+        0
+        >>> print(eq.convergence.residual) # doctest: +NOT_PYAMGX_SOLVER
+        None
+        >>> print(var.value.max())
+        0.0
+
+    Attributes
+    ----------
+    solver : ~fipy.solvers.solver.Solver
+        The solver that produced this record.
+    status : str
+        "converged", "maximum iterations", or a description of the
+        failure reported by the solver package.
+    iterations : int
+        The number of iterations taken.
+    residual : float
+        The final residual, or `None` if the solver package doesn't
+        report it.  The SciPy, Pysparse and PyAMG solvers report it
+        relative to the right-hand-side vector.  The `LinearLUSolver`
+        classes, and, by default, the Trilinos iterative solvers, report
+        it relative to the initial residual.
+    residualHistory : list of float
+        The residual at each iteration, where the solver package makes
+        it available.  See `Solver.recordResidualHistory`.
+    setupTime : float
+        Seconds spent preparing the matrix and vectors for the solver
+        package.
+    preconditionerTime : float
+        Seconds spent building the preconditioner or factorization.
+    solveTime : float
+        Seconds spent iterating to the solution.
+    """
+
+    def __init__(self, solver, status, iterations, residual=None, residualHistory=None,
+                 setupTime=0., preconditionerTime=0., solveTime=0.):
+        self.solver = solver
+        self.status = status
+        self.iterations = iterations
+        self.residual = residual
+        if residualHistory is None:
+            residualHistory = []
+        self.residualHistory = residualHistory
+        self.setupTime = setupTime
+        self.preconditionerTime = preconditionerTime
+        self.solveTime = solveTime
+
+    @property
+    def converged(self):
+        return self.status == "converged"
+
+    def __repr__(self):
+        return "%s(solver=%r, status=%r, iterations=%r, residual=%r)" \
+            % (self.__class__.__name__, self.solver, str(self.status),
+               self.iterations, self.residual)
+
 class Solver(object):
     """
     The base `LinearXSolver` class.
 
     .. attention:: This class is abstract. Always create one of its subclasses.
+
+    After each solution, a `SolverConvergence` record is available as
+    the `convergence` attribute.  Set `recordResidualHistory` to `True`
+    to fill its `residualHistory` for solvers that would need an extra
+    matrix-vector product at every iteration to do so.
     """
 
+    recordResidualHistory = False
+
     def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
         """
         Create a `Solver` object.
@@ -91,6 +189,8 @@ class Solver(object):
 
         self.preconditioner = precon
 
+        self.convergence = None
+
     def _storeMatrix(self, var, matrix, RHSvector):
         self.var = var
         self.matrix = matrix
@@ -131,6 +231,22 @@ class Solver(object):
                     IllConditionedPreconditionerWarning,
                     MaximumIterationWarning)
 
+    _statusList = ("scalar quantity out of range",
+                   "stagnated",
+                   "matrix ill-conditioned",
+                   "preconditioner not positive definite",
+                   "preconditioner ill-conditioned",
+                   "maximum iterations")
+
+    def _status(self, info):
+        """Describe the `info` code of a solver that reports failures
+        by the negative indices of `_warningList`
+        """
+        if info < 0:
+            return self._statusList[info]
+        else:
+            return "converged"
+
     def _raiseWarning(self, info, iter, relres):
         # info is negative, so we list in reverse order so that
         # info can be used as an index from the end
@@ -1,12 +1,19 @@
 from __future__ import unicode_literals
 __all__ = []
 
-from fipy.tests.lateImportTest import _LateImportTestSuite
+from fipy.tests.doctestPlus import _LateImportDocTestSuite
 import fipy.tests.testProgram
+from fipy.solvers import solver
+
+docTestModuleNames = ('solver',)
+
+if solver == 'scipy':
+    docTestModuleNames += ('scipy.linearLUSolver',)
+elif solver == 'pyamg':
+    docTestModuleNames += ('pyAMG.preconditioners.smoothedAggregationPreconditioner',)
 
 def _suite():
-    return _LateImportTestSuite(testModuleNames = (),
-                                base = __name__)
+    return _LateImportDocTestSuite(docTestModuleNames=docTestModuleNames, base=__name__)
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
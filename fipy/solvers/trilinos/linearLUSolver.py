@@ -4,10 +4,12 @@ from builtins import range
 __docformat__ = 'restructuredtext'
 
 import os
+import time
 
 from PyTrilinos import Epetra
 from PyTrilinos import Amesos
 
+from fipy.solvers.solver import SolverConvergence
 from fipy.solvers.trilinos.trilinosSolver import TrilinosSolver
 
 __all__ = ["LinearLUSolver"]
@@ -47,7 +49,12 @@ class LinearLUSolver(TrilinosSolver):
 
     def _solve_(self, L, x, b):
 
+        start = time.time()
+        history = []
+        status = "maximum iterations"
+        iterations = 0
         for iteration in range(self.iterations):
+             iterations = iteration + 1
              # errorVector = L*x - b
              errorVector = Epetra.Vector(L.RangeMap())
              L.Multiply(False, x, errorVector)
@@ -62,7 +69,9 @@ class LinearLUSolver(TrilinosSolver):
              if iteration == 0:
                  tol0 = tol
 
-             if (tol / tol0) <= self.tolerance:
+             history.append(tol / tol0)
+             if history[-1] <= self.tolerance:
+                 status = "converged"
                  break
 
              xError = Epetra.Vector(L.RowMap())
@@ -73,7 +82,15 @@ class LinearLUSolver(TrilinosSolver):
 
              x[:] = x - xError
 
+        self.convergence = SolverConvergence(solver=self,
+                                             status=status,
+                                             iterations=iterations,
+                                             residual=history[-1] if history else None,
+                                             residualHistory=history,
+                                             solveTime=time.time() - start)
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
-            PRINT('iterations: %d / %d' % (iteration + 1, self.iterations))
-            PRINT('residual:', errorVector.Norm2())
+            PRINT('iterations: %d / %d' % (iterations, self.iterations))
+            if history:
+                PRINT('residual:', errorVector.Norm2())
@@ -2,9 +2,11 @@ from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
 import os
+import time
 
 from PyTrilinos import AztecOO
 
+from fipy.solvers.solver import SolverConvergence
 from fipy.solvers.trilinos.trilinosSolver import TrilinosSolver
 from fipy.solvers.trilinos.preconditioners.jacobiPreconditioner import JacobiPreconditioner
 
@@ -45,20 +47,38 @@ class TrilinosAztecOOSolver(TrilinosSolver):
 
         Solver.SetAztecOption(AztecOO.AZ_output, AztecOO.AZ_none)
 
+        start = time.time()
         if self.preconditioner is not None:
             self.preconditioner._applyToSolver(solver=Solver, matrix=L)
         else:
             Solver.SetAztecOption(AztecOO.AZ_precond, AztecOO.AZ_none)
+        preconditionerTime = time.time() - start
 
+        start = time.time()
         output = Solver.Iterate(self.iterations, self.tolerance)
+        solveTime = time.time() - start
 
         if self.preconditioner is not None:
             if hasattr(self.preconditioner, 'Prec'):
                 del self.preconditioner.Prec
 
-        if 'FIPY_VERBOSE_SOLVER' in os.environ:
-            status = Solver.GetAztecStatus()
+        status = Solver.GetAztecStatus()
+
+        why = {AztecOO.AZ_normal : 'converged',
+               AztecOO.AZ_param : 'illegal parameter',
+               AztecOO.AZ_breakdown : 'breakdown',
+               AztecOO.AZ_loss : 'loss of precision',
+               AztecOO.AZ_ill_cond : 'ill-conditioned',
+               AztecOO.AZ_maxits : 'maximum iterations'}
 
+        self.convergence = SolverConvergence(solver=self,
+                                             status=why.get(status[AztecOO.AZ_why], 'unknown'),
+                                             iterations=int(status[AztecOO.AZ_its]),
+                                             residual=status[AztecOO.AZ_scaled_r],
+                                             preconditionerTime=preconditionerTime,
+                                             solveTime=solveTime)
+
+        if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
             PRINT('iterations: %d / %d' % (status[AztecOO.AZ_its], self.iterations))
             failure = {AztecOO.AZ_normal : 'AztecOO.AZ_normal',
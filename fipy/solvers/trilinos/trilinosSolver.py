@@ -4,6 +4,8 @@ __docformat__ = 'restructuredtext'
 from PyTrilinos import Epetra
 from PyTrilinos import EpetraExt
 
+import time
+
 from fipy.solvers.solver import Solver
 from fipy.tools import numerix
 
@@ -71,7 +73,9 @@ class TrilinosSolver(Solver):
     def _solve(self):
         from fipy.terms import SolutionVariableNumberError
 
+        start = time.time()
         globalMatrix, nonOverlappingVector, nonOverlappingRHSvector, overlappingVector = self._globalMatrixAndVectors
+        setupTime = time.time() - start
 
         if not (globalMatrix.rangeMap.SameAs(globalMatrix.domainMap)
                 and globalMatrix.rangeMap.SameAs(nonOverlappingVector.Map())):
@@ -82,6 +86,9 @@ class TrilinosSolver(Solver):
                      nonOverlappingVector,
                      nonOverlappingRHSvector)
 
+        if self.convergence is not None:
+            self.convergence.setupTime = setupTime
+
         overlappingVector.Import(nonOverlappingVector,
                                  Epetra.Import(globalMatrix.colMap,
                                                globalMatrix.domainMap),
@@ -9,6 +9,7 @@ import os
 from fipy import input
 from fipy.terms.unaryTerm import _UnaryTerm
 from fipy.tools import numerix
+from fipy.tools import sweepProfiler
 from fipy.terms import TermMultiplyError
 from fipy.terms import AbstractBaseClassError
 from fipy.variables.faceVariable import FaceVariable
@@ -177,6 +178,14 @@ class _AbstractDiffusionTerm(_UnaryTerm):
     def __getCoefficientMatrix(self, SparseMatrix, var, coeff):
         mesh = var.mesh
 
+        coefficientMatrix = SparseMatrix(mesh=mesh, bandwidth = mesh._maxFacesPerCell + 1)
+
+        coeff = numerix.asarray(coeff)
+        minusCoeff = -coeff
+        if coefficientMatrix._addAtFaceBands((coeff, minusCoeff, minusCoeff, coeff),
+                                             self._vectorSize(var)):
+            return coefficientMatrix
+
         id1, id2 = mesh._adjacentCellIDs
         interiorFaces = numerix.nonzero(mesh.interiorFaces)[0]
 
@@ -189,12 +198,12 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 ##         print 'id1',id1
 ##         print 'id2',id2
 
-        coefficientMatrix = SparseMatrix(mesh=mesh, bandwidth = mesh._maxFacesPerCell + 1)
         interiorCoeff = numerix.take(coeff, interiorFaces, axis=-1).ravel()
-        coefficientMatrix.addAt(interiorCoeff, id1.ravel(), id1.swapaxes(0, 1).ravel())
-        coefficientMatrix.addAt(-interiorCoeff, id1.ravel(), id2.swapaxes(0, 1).ravel())
-        coefficientMatrix.addAt(-interiorCoeff, id2.ravel(), id1.swapaxes(0, 1).ravel())
-        coefficientMatrix.addAt(interiorCoeff, id2.ravel(), id2.swapaxes(0, 1).ravel())
+        coefficientMatrix.addAtStencil((interiorCoeff, -interiorCoeff, -interiorCoeff, interiorCoeff),
+                                       (id1.ravel(), id1.ravel(), id2.ravel(), id2.ravel()),
+                                       (id1.swapaxes(0, 1).ravel(), id2.swapaxes(0, 1).ravel(),
+                                        id1.swapaxes(0, 1).ravel(), id2.swapaxes(0, 1).ravel()),
+                                       stencil=("interiorFaces", self._vectorSize(var)))
 
 ##         print 'coefficientMatrix',coefficientMatrix
 ##         raw_input('stopped')
@@ -237,7 +246,8 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
     def __doBCs(self, SparseMatrix, higherOrderBCs, N, M, coeffs, coefficientMatrix, boundaryB):
         for boundaryCondition in higherOrderBCs:
-            LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffs)
+            with sweepProfiler._timing("BoundaryCondition", boundaryCondition.__class__.__name__):
+                LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffs)
             if 'FIPY_DISPLAY_MATRIX' in os.environ:
                 self._viewer.title = r"%s %s" % (boundaryCondition.__class__.__name__, self.__class__.__name__)
                 self._viewer.plot(matrix=LL, RHSvector=bb)
@@ -8,6 +8,7 @@ from fipy.terms.nonDiffusionTerm import _NonDiffusionTerm
 from fipy.tools import vector
 from fipy.tools import numerix
 from fipy.tools import inline
+from fipy.tools import sweepProfiler
 
 __all__ = ["FaceTerm"]
 from future.utils import text_to_native_str
@@ -38,19 +39,29 @@ class FaceTerm(_NonDiffusionTerm):
         mesh = var.mesh
         coeffMatrix = self._getCoeffMatrix_(var, weight)
 
-        id1 = self._reshapeIDs(var, id1)
-        id2 = self._reshapeIDs(var, id2)
-
-        L.addAt(numerix.take(coeffMatrix['cell 1 diag'], interiorFaces, axis=-1).ravel(), id1.ravel(), id1.swapaxes(0, 1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 1 offdiag'], interiorFaces, axis=-1).ravel(), id1.ravel(), id2.swapaxes(0, 1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 2 offdiag'], interiorFaces, axis=-1).ravel(), id2.ravel(), id1.swapaxes(0, 1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 2 diag'], interiorFaces, axis=-1).ravel(), id2.ravel(), id2.swapaxes(0, 1).ravel())
+        if not L._addAtFaceBands((coeffMatrix['cell 1 diag'],
+                                  coeffMatrix['cell 1 offdiag'],
+                                  coeffMatrix['cell 2 offdiag'],
+                                  coeffMatrix['cell 2 diag']),
+                                 self._vectorSize(var)):
+            id1 = self._reshapeIDs(var, id1)
+            id2 = self._reshapeIDs(var, id2)
+
+            L.addAtStencil((numerix.take(coeffMatrix['cell 1 diag'], interiorFaces, axis=-1).ravel(),
+                            numerix.take(coeffMatrix['cell 1 offdiag'], interiorFaces, axis=-1).ravel(),
+                            numerix.take(coeffMatrix['cell 2 offdiag'], interiorFaces, axis=-1).ravel(),
+                            numerix.take(coeffMatrix['cell 2 diag'], interiorFaces, axis=-1).ravel()),
+                           (id1.ravel(), id1.ravel(), id2.ravel(), id2.ravel()),
+                           (id1.swapaxes(0, 1).ravel(), id2.swapaxes(0, 1).ravel(),
+                            id1.swapaxes(0, 1).ravel(), id2.swapaxes(0, 1).ravel()),
+                           stencil=("interiorFaces", self._vectorSize(var)))
 
         N = mesh.numberOfCells
         M = mesh._maxFacesPerCell
 
         for boundaryCondition in boundaryConditions:
-            LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
+            with sweepProfiler._timing("BoundaryCondition", boundaryCondition.__class__.__name__):
+                LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
 
             if 'FIPY_DISPLAY_MATRIX' in os.environ:
                 self._viewer.title = r"%s %s" % (boundaryCondition.__class__.__name__, self.__class__.__name__)
@@ -74,7 +85,8 @@ class FaceTerm(_NonDiffusionTerm):
 
         for boundaryCondition in boundaryConditions:
 
-            LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
+            with sweepProfiler._timing("BoundaryCondition", boundaryCondition.__class__.__name__):
+                LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
             if LL != 0:
 ##              b -= LL.takeDiagonal() * numerix.array(oldArray)
                 b -= LL * numerix.array(oldArray)
@@ -7,6 +7,7 @@ import os
 
 from fipy import input
 from fipy.tools import numerix
+from fipy.tools import sweepProfiler
 from fipy.terms import AbstractBaseClassError
 from fipy.terms import SolutionVariableRequiredError
 
@@ -40,6 +41,7 @@ class Term(object):
         self._cacheRHSvector = False
         self._RHSvector = None
         self.var = var
+        self.convergence = None
 
     def _calcVars(self):
         raise NotImplementedError
@@ -93,20 +95,24 @@ class Term(object):
         else:
             return var.shape[0]
 
-    def _getMatrixClass(self, solver, var):
+    def _getMatrixClass(self, solver, var, matrixFree=False):
+        if matrixFree:
+            from fipy.matrices.matrixFreeMatrix import _MatrixFreeMeshMatrix
+            matrixClass = _MatrixFreeMeshMatrix
+        else:
+            matrixClass = solver._matrixClass
+
         if self._vectorSize(var) > 1:
             from fipy.matrices.offsetSparseMatrix import OffsetSparseMatrix
-            SparseMatrix =  OffsetSparseMatrix(SparseMatrix=solver._matrixClass,
+            SparseMatrix =  OffsetSparseMatrix(SparseMatrix=matrixClass,
                                                numberOfVariables=self._vectorSize(var),
                                                numberOfEquations=self._vectorSize(var))
         else:
-            SparseMatrix = solver._matrixClass
+            SparseMatrix = matrixClass
 
         return SparseMatrix
 
-    def _prepareLinearSystem(self, var, solver, boundaryConditions, dt):
-        solver = self.getDefaultSolver(var, solver)
-
+    def _buildLinearSystem(self, var, solver, boundaryConditions, dt, matrixFree=False):
         var = self._verifyVar(var)
         self._checkVar(var)
 
@@ -116,13 +122,8 @@ class Term(object):
         for bc in boundaryConditions:
             bc._resetBoundaryConditionApplied()
 
-        if 'FIPY_DISPLAY_MATRIX' in os.environ:
-            if not hasattr(self, "_viewer"):
-                from fipy.viewers.matplotlibViewer.matplotlibSparseMatrixViewer import MatplotlibSparseMatrixViewer
-                Term._viewer = MatplotlibSparseMatrixViewer()
-
         var, matrix, RHSvector = self._buildAndAddMatrices(var,
-                                                           self._getMatrixClass(solver, var),
+                                                           self._getMatrixClass(solver, var, matrixFree=matrixFree),
                                                            boundaryConditions=boundaryConditions,
                                                            dt=dt,
                                                            transientGeomCoeff=self._getTransientGeomCoeff(var),
@@ -131,6 +132,18 @@ class Term(object):
 
         self._buildCache(matrix, RHSvector)
 
+        return var, matrix, RHSvector
+
+    def _prepareLinearSystem(self, var, solver, boundaryConditions, dt):
+        solver = self.getDefaultSolver(var, solver)
+
+        if 'FIPY_DISPLAY_MATRIX' in os.environ:
+            if not hasattr(self, "_viewer"):
+                from fipy.viewers.matplotlibViewer.matplotlibSparseMatrixViewer import MatplotlibSparseMatrixViewer
+                Term._viewer = MatplotlibSparseMatrixViewer()
+
+        var, matrix, RHSvector = self._buildLinearSystem(var, solver, boundaryConditions, dt)
+
         solver._storeMatrix(var=var, matrix=matrix, RHSvector=RHSvector)
 
         if 'FIPY_DISPLAY_MATRIX' in os.environ:
@@ -157,7 +170,8 @@ class Term(object):
         r"""
         Builds and solves the `Term`'s linear system once. This method
         does not return the residual. It should be used when the
-        residual is not required.
+        residual is not required.  How the solver converged is recorded
+        in the `convergence` member of `Term`.
 
         Parameters
         ----------
@@ -175,13 +189,17 @@ class Term(object):
 
         solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
 
-        solver._solve()
+        with sweepProfiler._timing("Solver solve", solver.__class__.__name__):
+            solver._solve()
+
+        self.convergence = solver.convergence
 
     def sweep(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, cacheResidual=False, cacheError=False):
         r"""
         Builds and solves the `Term`'s linear system once. This method
         also recalculates and returns the residual as well as applying
-        under-relaxation.
+        under-relaxation.  How the solver converged is recorded in the
+        `convergence` member of `Term`.
 
         Parameters
         ----------
@@ -213,27 +231,33 @@ class Term(object):
         """
         solver = self._prepareLinearSystem(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt)
         solver._applyUnderRelaxation(underRelaxation=underRelaxation)
-        residual = solver._calcResidual(residualFn=residualFn)
+        with sweepProfiler._timing("Solver residual", solver.__class__.__name__):
+            residual = solver._calcResidual(residualFn=residualFn)
 
         if cacheResidual or cacheError:
-            self.residualVector = solver._calcResidualVector(residualFn=residualFn)
+            with sweepProfiler._timing("Solver residual", solver.__class__.__name__):
+                self.residualVector = solver._calcResidualVector(residualFn=residualFn)
 
         if cacheError:
             self.errorVector = solver.var.copy()
             var_tmp = solver.var
             RHS_tmp = solver.RHSvector
             solver._storeMatrix(var=self.errorVector, matrix=solver.matrix, RHSvector=self.residualVector)
-            solver._solve()
+            with sweepProfiler._timing("Solver solve", solver.__class__.__name__):
+                solver._solve()
             solver._storeMatrix(var=var_tmp, matrix=solver.matrix, RHSvector=RHS_tmp)
 
         if not cacheResidual:
             self.residualVector = None
 
-        solver._solve()
+        with sweepProfiler._timing("Solver solve", solver.__class__.__name__):
+            solver._solve()
+
+        self.convergence = solver.convergence
 
         return residual
 
-    def justResidualVector(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None):
+    def justResidualVector(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, matrixFree=False):
         r"""Builds the `Term`'s linear system once.
 
         This method also recalculates and returns the residual as well as
@@ -247,6 +271,17 @@ class Term(object):
         >>> len(DiffusionTerm().justResidualVector(v)) == m.numberOfCells
         True
 
+        The residual can be found without assembling the sparse matrix
+
+        >>> v.constrain(1., where=m.facesLeft)
+        >>> eq = TransientTerm() == DiffusionTerm(coeff=2.) - 3. * v
+        >>> print(numerix.allclose(eq.justResidualVector(v, dt=0.1, matrixFree=True),
+        ...                        eq.justResidualVector(v, dt=0.1)))
+        True
+        >>> print(numerix.allclose(eq.justResidualVector(v, dt=0.1, underRelaxation=0.5, matrixFree=True),
+        ...                        eq.justResidualVector(v, dt=0.1, underRelaxation=0.5)))
+        True
+
         Parameters
         ----------
         var : ~fipy.variables.cellVariable.CellVariable
@@ -265,13 +300,41 @@ class Term(object):
         residualFn : function
             Takes `var`, `matrix`, and `RHSvector` arguments, used to
             customize the residual calculation.
+        matrixFree : bool
+            If `True`, apply the contributions of each `Term` to `var`
+            directly, rather than assembling them into a sparse matrix
+            first.  The `solver` is not used.
         """
+        if matrixFree:
+            return self._matrixFreeResidualVector(var, boundaryConditions, dt, underRelaxation, residualFn)
+
         solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
         solver._applyUnderRelaxation(underRelaxation)
 
-        return solver._calcResidualVector(residualFn=residualFn)
+        with sweepProfiler._timing("Solver residual", solver.__class__.__name__):
+            return solver._calcResidualVector(residualFn=residualFn)
+
+    def _matrixFreeResidualVector(self, var, boundaryConditions, dt, underRelaxation, residualFn):
+        """Calculate the residual vector without a solver
+
+        Some solver suites can only store assembled matrices, so the
+        operator is applied directly.
+        """
+        var, matrix, RHSvector = self._buildLinearSystem(var, None, boundaryConditions, dt, matrixFree=True)
+        x = numerix.array(var).flatten()
+        RHSvector = numerix.array(RHSvector).flatten()
+
+        if underRelaxation is not None:
+            matrix.putDiagonal(numerix.asarray(matrix.takeDiagonal()) / underRelaxation)
+            RHSvector = RHSvector + (1 - underRelaxation) * matrix.takeDiagonal() * x
+
+        with sweepProfiler._timing("Solver residual", "matrix-free"):
+            if residualFn is not None:
+                return residualFn(var, matrix, RHSvector)
+            else:
+                return matrix * x - RHSvector
 
-    def residualVectorAndNorm(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None):
+    def residualVectorAndNorm(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, matrixFree=False):
         r"""Builds the `Term`'s linear system once.
 
         This method also recalculates and returns the residual as well as
@@ -295,14 +358,54 @@ class Term(object):
         residualFn : function
             Takes `var`, `matrix`, and `RHSvector` arguments, used to
             customize the residual calculation.
+        matrixFree : bool
+            If `True`, apply the contributions of each `Term` to `var`
+            directly, rather than assembling them into a sparse matrix
+            first.  The `solver` is not used.
         """
         vector = self.justResidualVector(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt,
-                                         underRelaxation=underRelaxation, residualFn=residualFn)
+                                         underRelaxation=underRelaxation, residualFn=residualFn, matrixFree=matrixFree)
 
         L2norm = numerix.L2norm(vector)
 
         return vector, L2norm
 
+    def linearOperator(self, var=None, boundaryConditions=(), dt=None):
+        r"""The `Term`'s linear system, without assembling its matrix
+
+        Returns :math:`\mathsf{L}`, as an operator that Krylov solvers,
+        such as those of :mod:`scipy.sparse.linalg`, can apply to a
+        vector, and :math:`\vec{b}`.
+
+        >>> from fipy import *
+        >>> from scipy.sparse.linalg import gmres # doctest: +SCIPY
+        >>> m = Grid1D(nx=10)
+        >>> v = CellVariable(mesh=m)
+        >>> v.constrain(1., where=m.facesLeft)
+        >>> eq = TransientTerm() == DiffusionTerm() - v
+        >>> L, b = eq.linearOperator(v, dt=1.)
+        >>> x, info = gmres(L, b, tol=1e-12) # doctest: +SCIPY
+        >>> eq.solve(v, dt=1.)
+        >>> print(numerix.allclose(x, v, atol=1e-8)) # doctest: +SCIPY
+        True
+
+        Parameters
+        ----------
+        var : ~fipy.variables.cellVariable.CellVariable
+            `Variable` to be solved for.  Provides the old value.
+        boundaryConditions : :obj:`tuple` of :obj:`~fipy.boundaryConditions.boundaryCondition.BoundaryCondition`
+        dt : float
+            Timestep size.
+
+        Returns
+        -------
+        L : ~scipy.sparse.linalg.LinearOperator
+        b : ~numpy.ndarray
+        """
+        var, matrix, RHSvector = self._buildLinearSystem(var, None, boundaryConditions, dt, matrixFree=True)
+
+        return matrix.asLinearOperator(), numerix.array(RHSvector).ravel()
+
     def justErrorVector(self, var=None, solver=None, boundaryConditions=(), dt=1., underRelaxation=None, residualFn=None):
         r"""Builds the `Term`'s linear system once.
 
@@ -340,11 +443,15 @@ class Term(object):
         """
         solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
         solver._applyUnderRelaxation(underRelaxation)
-        residualVector = solver._calcResidualVector(residualFn=residualFn)
+        with sweepProfiler._timing("Solver residual", solver.__class__.__name__):
+            residualVector = solver._calcResidualVector(residualFn=residualFn)
 
         errorVector = solver.var.copy()
         solver._storeMatrix(var=errorVector, matrix=solver.matrix, RHSvector=residualVector)
-        solver._solve()
+        with sweepProfiler._timing("Solver solve", solver.__class__.__name__):
+            solver._solve()
+
+        self.convergence = solver.convergence
 
         return errorVector
 
@@ -803,6 +910,18 @@ class Term(object):
         >>> eqn = TransientTerm() == DiffusionTerm([[[0.01, -1], [1, 0.01]]])
         >>> res = eqn.sweep(var=v, dt=1.)
 
+        Under-relaxation of the matrix-free residual of coupled equations
+        acts on the diagonal of the whole matrix
+
+        >>> m = Grid1D(nx=5)
+        >>> a = CellVariable(mesh=m, value=m.x)
+        >>> b = CellVariable(mesh=m, value=m.x**2)
+        >>> eq = ((TransientTerm(var=a) == DiffusionTerm(var=a) + b)
+        ...       & (TransientTerm(var=b) == DiffusionTerm(var=b) - a))
+        >>> print(numerix.allclose(eq.justResidualVector(dt=0.1, underRelaxation=0.3, matrixFree=True),
+        ...                        eq.justResidualVector(dt=0.1, underRelaxation=0.3)))
+        True
+
         """
 
 class __Term(Term):
@@ -7,6 +7,7 @@ import os
 
 from fipy import input
 from fipy.tools import numerix
+from fipy.tools import sweepProfiler
 from fipy.terms.term import Term
 
 class _UnaryTerm(Term):
@@ -59,19 +60,21 @@ class _UnaryTerm(Term):
         """
 
         if var is self.var or self.var is None:
-            var, matrix, RHSvector = self._buildMatrix(var,
-                                                       SparseMatrix,
-                                                       boundaryConditions=boundaryConditions,
-                                                       dt=dt,
-                                                       transientGeomCoeff=transientGeomCoeff,
-                                                       diffusionGeomCoeff=diffusionGeomCoeff)
+            with sweepProfiler._timing("Term build", self.__class__.__name__):
+                var, matrix, RHSvector = self._buildMatrix(var,
+                                                           SparseMatrix,
+                                                           boundaryConditions=boundaryConditions,
+                                                           dt=dt,
+                                                           transientGeomCoeff=transientGeomCoeff,
+                                                           diffusionGeomCoeff=diffusionGeomCoeff)
         elif buildExplicitIfOther:
-            _, matrix, RHSvector = self._buildMatrix(self.var,
-                                                     SparseMatrix,
-                                                     boundaryConditions=boundaryConditions,
-                                                     dt=dt,
-                                                     transientGeomCoeff=transientGeomCoeff,
-                                                     diffusionGeomCoeff=diffusionGeomCoeff)
+            with sweepProfiler._timing("Term build", self.__class__.__name__):
+                _, matrix, RHSvector = self._buildMatrix(self.var,
+                                                         SparseMatrix,
+                                                         boundaryConditions=boundaryConditions,
+                                                         dt=dt,
+                                                         transientGeomCoeff=transientGeomCoeff,
+                                                         diffusionGeomCoeff=diffusionGeomCoeff)
             RHSvector = RHSvector - matrix * self.var.value
             matrix = SparseMatrix(mesh=var.mesh)
         else:
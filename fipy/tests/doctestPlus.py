@@ -115,11 +115,21 @@ register_skipper(flag="SCIPY",
                  test=_checkForSciPy,
                  why="the `scipy` package cannot be imported")
 
+def _importSkippers():
+    """Import all of :term:`FiPy`, so that the skippers registered by its
+    modules are known before any test that uses their flags is parsed,
+    even though `import fipy` only imports modules as they are needed
+    """
+    import fipy
+    fipy.__all__
+
 class _SelectiveDocTestParser(doctest.DocTestParser):
     """
     Custom doctest parser that adds support for skipping test examples
     """
     def parse(self, string, name='<string>'):
+        _importSkippers()
+
         pieces = doctest.DocTestParser.parse(self, string, name)
 
         return [piece for piece in pieces if not self._skipExample(piece)]
@@ -39,6 +39,8 @@ class test(_test):
         ('viewers', None, "test FiPy viewer modules (requires user input)"),
         ('cache', None, "run FiPy with Variable caching"),
         ('no-cache', None, "run FiPy without Variable caching"),
+        ('inplace', None, "run FiPy recalculating cached Variables in place"),
+        ('fuse', None, "run FiPy evaluating Variable expressions as fused chains of ufuncs"),
         ('timetests=', None, "file in which to put time spent on each test"),
         ('skfmm', None, "run FiPy using the Scikit-fmm level set solver (default)"),
         ('lsmlib', None, "run FiPy using the LSMLIB level set solver (default)"),
@@ -58,6 +60,8 @@ class test(_test):
         self.pythoncompiled = None
         self.cache = False
         self.no_cache = True
+        self.inplace = False
+        self.fuse = False
         self.Trilinos = False
         self.Pysparse = False
         self.trilinos = False
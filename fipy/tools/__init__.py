@@ -82,19 +82,27 @@ for M in (2, 3):
                          skipWarning=False)
 
 import fipy.tools.dump
+import fipy.tools.checkpoint
 import fipy.tools.numerix
 import fipy.tools.vector
 from .dimensions.physicalField import PhysicalField
 from fipy.tools.numerix import *
 from fipy.tools.vitals import Vitals
+from fipy.tools.sweepProfiler import SweepProfiler
+from fipy.tools.probeSet import ProbeSet
+from fipy.tools.backgroundWriter import BackgroundWriter
 
 __all__ = ["serialComm",
            "parallelComm",
            "dump",
+           "checkpoint",
            "numerix",
            "vector",
            "PhysicalField",
            "Vitals",
+           "SweepProfiler",
+           "ProbeSet",
+           "BackgroundWriter",
            "serial",
            "parallel"]
 from future.utils import text_to_native_str
@@ -0,0 +1,137 @@
+"""Output that is written while the calculation carries on
+"""
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+from future import standard_library
+standard_library.install_aliases()
+__docformat__ = 'restructuredtext'
+
+import queue
+import sys
+import threading
+
+__all__ = ["BackgroundWriter"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class BackgroundWriter(object):
+    """Queue of writes that are carried out by background threads
+
+    Viewers and :mod:`~fipy.tools.dump` take a copy of the values to
+    write, then hand the formatting, compression and writing of the copy
+    to a `BackgroundWriter` and return to the time loop
+
+        >>> import os
+        >>> from tempfile import mkstemp
+        >>> f, fname = mkstemp(".tsv")
+        >>> os.close(f)
+
+        >>> from fipy import Grid1D, CellVariable, TSVViewer
+        >>> m = Grid1D(nx=3)
+        >>> v = CellVariable(mesh=m, name="v", value=(1., 2., 3.))
+        >>> viewer = TSVViewer(vars=v)
+        >>> with BackgroundWriter() as writer:
+        ...     viewer.plot(filename=fname, writer=writer)
+        ...     v.value = 0.
+        >>> with open(fname) as f:
+        ...     print(f.read().strip()) #doctest: +NORMALIZE_WHITESPACE, +SERIAL
+        v
+        x       v
+        0.5     1
+        1.5     2
+        2.5     3
+        >>> os.remove(fname)
+
+    At most `maxPending` writes wait in the queue; further writes block
+    until one of them is done, so that output that is produced faster
+    than it can be written does not fill up memory.
+
+    Errors raised by a write are raised again by the next call to
+    :meth:`submit`, :meth:`flush` or :meth:`close`
+
+        >>> writer = BackgroundWriter()
+        >>> writer.submit(int, "one")
+        >>> writer.close()
+        Traceback (most recent call last):
+            ...
+        ValueError: invalid literal for int() with base 10: 'one'
+    """
+
+    def __init__(self, maxPending=2, threads=1):
+        """
+        Parameters
+        ----------
+        maxPending : int
+            The number of writes that may wait to be carried out before
+            :meth:`submit` blocks.
+        threads : int
+            The number of threads that carry out the writes.  With more
+            than one thread, writes may complete out of order.
+        """
+        self._queue = queue.Queue(maxsize=maxPending)
+        self._errors = []
+        self._threads = [threading.Thread(target=self._work) for i in range(threads)]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def _work(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                function, args, kwargs = task
+                try:
+                    function(*args, **kwargs)
+                except Exception:
+                    self._errors.append(sys.exc_info()[1])
+            finally:
+                self._queue.task_done()
+
+    def _raiseErrors(self):
+        if self._errors:
+            error = self._errors.pop(0)
+            del self._errors[:]
+            raise error
+
+    def submit(self, function, *args, **kwargs):
+        """Call `function(*args, **kwargs)` in the background
+
+        Blocks while `maxPending` writes are waiting.  The arguments
+        must not be changed until the write is done.
+        """
+        if not self._threads:
+            raise ValueError("the BackgroundWriter is closed")
+        self._raiseErrors()
+        self._queue.put((function, args, kwargs))
+
+    def flush(self):
+        """Wait for all submitted writes to be done
+        """
+        self._queue.join()
+        self._raiseErrors()
+
+    def close(self):
+        """Wait for all submitted writes to be done and stop the threads
+        """
+        for thread in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._raiseErrors()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
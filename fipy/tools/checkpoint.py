@@ -0,0 +1,279 @@
+"""Binary checkpoints of `CellVariable` objects, written by every processor
+
+Unlike :mod:`fipy.tools.dump`, which pickles whole objects on processor
+0, a checkpoint is a directory that holds
+
+``manifest.json``
+    the names, shapes, types and units of the variables
+``mesh.pickle``
+    the mesh, pickled once, if the pickle describes the whole mesh
+``cells.N.npy``
+    the global IDs of the cells owned by processor `N`
+``name.N.npy`` and ``name.old.N.npy``
+    the values, and old values, of variable `name` in those cells
+
+so that no processor ever holds more than its own share of the values,
+and the values are stored in binary.  A checkpoint may be read back by
+any number of processors.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import io
+import json
+import os
+import pickle
+
+from fipy.tools import numerix
+
+__all__ = ["write", "read"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+_FORMAT = "fipy-checkpoint-1"
+
+def _shardName(path, name, procID):
+    return os.path.join(path, "%s.%d.npy" % (name, procID))
+
+def _namedVariables(variables):
+    if hasattr(variables, "items"):
+        return list(variables.items())
+    else:
+        return [(var.name, var) for var in variables]
+
+def write(path, variables, communicator=None):
+    """Write a checkpoint of `variables` to the directory `path`
+
+        >>> import tempfile, shutil
+        >>> from fipy import Grid2D, CellVariable
+        >>> m = Grid2D(nx=4, ny=3)
+        >>> x, y = m.cellCenters
+        >>> phi = CellVariable(mesh=m, name="phi", value=x * y, hasOld=True)
+        >>> u = CellVariable(mesh=m, name="u", value=m.cellCenters, unit="m/s")
+        >>> phi.updateOld()
+        >>> phi.value = 2 * x * y
+        >>> path = tempfile.mkdtemp()
+        >>> write(path, (phi, u))
+        >>> print(sorted(os.listdir(path))) # doctest: +SERIAL
+        ['cells.0.npy', 'manifest.json', 'mesh.pickle', 'phi.0.npy', 'phi.old.0.npy', 'u.0.npy']
+
+    Reading the checkpoint recreates the mesh and the variables
+
+        >>> mesh, restored = read(path)
+        >>> print(mesh.numberOfCells == m.numberOfCells)
+        True
+        >>> print(numerix.allclose(restored["phi"], phi))
+        True
+        >>> print(numerix.allclose(restored["phi"].old, phi.old))
+        True
+        >>> print(restored["u"].unit)
+        <PhysicalUnit m/s>
+        >>> print(numerix.allclose(restored["u"].numericValue, u.numericValue))
+        True
+
+    or reads the values onto an existing mesh.  The shards of a
+    checkpoint may come from any number of processors; here the shards of
+    a single processor are split in two, as if they were written by two
+    processors, and are still read by one
+
+        >>> with open(os.path.join(path, "manifest.json")) as f:
+        ...     manifest = json.load(f)
+        >>> manifest["nproc"] = 2
+        >>> manifest["hasMesh"] = False
+        >>> with open(os.path.join(path, "manifest.json"), "w") as f:
+        ...     json.dump(manifest, f)
+        >>> for name in ("cells", "phi", "phi.old", "u"): # doctest: +SERIAL
+        ...     shard = numerix.load(_shardName(path, name, 0))
+        ...     numerix.save(_shardName(path, name, 0), shard[..., ::2])
+        ...     numerix.save(_shardName(path, name, 1), shard[..., 1::2])
+        >>> mesh, restored = read(path, mesh=m)
+        >>> print(mesh is m)
+        True
+
+    Meshes other than grids, written by more than one processor, are
+    not checkpointed whole, so they must be given
+
+        >>> read(path) # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+            ...
+        ValueError: ... so the mesh must be given
+        >>> print(numerix.allclose(restored["phi"], phi))
+        True
+        >>> print(numerix.allclose(restored["u"].numericValue, u.numericValue))
+        True
+
+        >>> shutil.rmtree(path) # doctest: +PROCESSOR_0
+
+    Each variable needs a name of its own
+
+        >>> write(tempfile.mkdtemp(), (phi, CellVariable(mesh=m, name="phi")))
+        Traceback (most recent call last):
+            ...
+        ValueError: 'phi' is the name of more than one variable
+
+    Parameters
+    ----------
+    path : str
+        Name of the directory to hold the checkpoint.  It is created if it
+        does not exist.
+    variables : dict or :obj:`list` of ~fipy.variables.cellVariable.CellVariable
+        The variables to write, all on the same mesh, either keyed by
+        name or named by their own `name`.
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        The processors that share the mesh.  Defaults to the
+        `communicator` of the mesh.
+    """
+    from fipy.variables.cellVariable import CellVariable
+
+    variables = _namedVariables(variables)
+    if len(variables) == 0:
+        raise ValueError("nothing to checkpoint")
+
+    mesh = variables[0][1].mesh
+    names = set()
+    for name, var in variables:
+        if name in names:
+            raise ValueError("%r is the name of more than one variable" % name)
+        names.add(name)
+        if not isinstance(var, CellVariable):
+            raise TypeError("%s is not a CellVariable" % var)
+        if var.mesh is not mesh:
+            raise ValueError("%s is not defined on the same mesh as %s" % (var, variables[0][1]))
+        if name in ("cells", "manifest", "mesh") or not name or "." in name or os.sep in name:
+            raise ValueError("%r cannot be used as the name of a checkpointed variable" % name)
+
+    communicator = communicator or mesh.communicator
+
+    if communicator.procID == 0 and not os.path.isdir(path):
+        os.makedirs(path)
+    communicator.Barrier()
+
+    localIDs = mesh._localNonOverlappingCellIDs
+    numerix.save(_shardName(path, "cells", communicator.procID),
+                 numerix.asarray(mesh._globalNonOverlappingCellIDs, dtype=numerix.INT_DTYPE))
+
+    entries = []
+    for name, var in variables:
+        value = numerix.asarray(var.value)
+        numerix.save(_shardName(path, name, communicator.procID), value[..., localIDs])
+        hasOld = var._old is not None
+        if hasOld:
+            numerix.save(_shardName(path, name + ".old", communicator.procID),
+                         numerix.asarray(var._old.value)[..., localIDs])
+
+        unit = var.unit
+        entries.append(dict(name=name,
+                            elementshape=list(value.shape[:-1]),
+                            dtype=value.dtype.str,
+                            unit=None if unit.isDimensionless() else unit.name(),
+                            hasOld=hasOld))
+
+    # all shards are complete before the manifest appears
+    communicator.Barrier()
+
+    # grids pickle the arguments that create the whole of them, but
+    # other meshes pickle only the cells of the processor that pickles
+    # them
+    from fipy.meshes.representations.gridRepresentation import _GridRepresentation
+    hasMesh = (communicator.Nproc == 1
+               or isinstance(mesh.representation, _GridRepresentation))
+
+    if communicator.procID == 0:
+        if hasMesh:
+            with open(os.path.join(path, "mesh.pickle"), "wb") as f:
+                pickle.dump(mesh, f, pickle.HIGHEST_PROTOCOL)
+        with io.open(os.path.join(path, "manifest.json"), "w") as f:
+            f.write(json.dumps(dict(format=_FORMAT,
+                                    nproc=communicator.Nproc,
+                                    hasMesh=hasMesh,
+                                    globalNumberOfCells=int(mesh.globalNumberOfCells),
+                                    variables=entries),
+                               indent=1))
+
+    communicator.Barrier()
+
+def _readValues(path, name, nproc, sortedIDs, order, value):
+    """Fill `value` with the entries of the shards of `name` that belong
+    to the cells of this processor
+    """
+    for procID in range(nproc):
+        ids = numerix.load(_shardName(path, "cells", procID), mmap_mode='r')
+        positions = numerix.searchsorted(sortedIDs, ids)
+        positions = numerix.minimum(positions, len(sortedIDs) - 1)
+        found = numerix.nonzero(sortedIDs[positions] == ids)[0]
+        if len(found) > 0:
+            shard = numerix.load(_shardName(path, name, procID), mmap_mode='r')
+            value[..., order[positions[found]]] = shard[..., found]
+
+def read(path, mesh=None):
+    """Read the variables of the checkpoint in the directory `path`
+
+    Each processor reads only the values of its own cells, including
+    its ghost cells, from the shards of every processor that wrote the
+    checkpoint.
+
+    Parameters
+    ----------
+    path : str
+        Name of the directory that holds the checkpoint.
+    mesh : ~fipy.meshes.mesh.Mesh
+        The mesh to define the variables on.  It must have the same
+        global cell numbering as the mesh that was checkpointed.  Defaults
+        to the checkpointed mesh, which is partitioned among the
+        processors that read it.  Only grids are checkpointed whole when
+        they are written by more than one processor, so other meshes
+        must be given.
+
+    Returns
+    -------
+    mesh : ~fipy.meshes.mesh.Mesh
+    variables : dict
+        The `CellVariable` objects, keyed by name.
+    """
+    from fipy.variables.cellVariable import CellVariable
+
+    with io.open(os.path.join(path, "manifest.json"), "r") as f:
+        manifest = json.loads(f.read())
+    if manifest.get("format") != _FORMAT:
+        raise ValueError("%s is not a FiPy checkpoint" % path)
+
+    if mesh is None:
+        if not manifest.get("hasMesh", True):
+            raise ValueError("%s was written in parallel from a mesh that is not a grid, "
+                             "so the mesh must be given" % path)
+        with open(os.path.join(path, "mesh.pickle"), "rb") as f:
+            mesh = pickle.load(f)
+
+    if mesh.globalNumberOfCells != manifest["globalNumberOfCells"]:
+        raise ValueError("the mesh has %d cells, but the checkpoint has %d"
+                         % (mesh.globalNumberOfCells, manifest["globalNumberOfCells"]))
+
+    globalIDs = numerix.asarray(mesh._globalOverlappingCellIDs)
+    order = numerix.argsort(globalIDs)
+    sortedIDs = globalIDs[order]
+
+    variables = {}
+    for entry in manifest["variables"]:
+        name = entry["name"]
+        shape = tuple(entry["elementshape"]) + (mesh.numberOfCells,)
+        value = numerix.zeros(shape, dtype=numerix.dtype(str(entry["dtype"])))
+        _readValues(path, name, manifest["nproc"], sortedIDs, order, value)
+
+        var = CellVariable(mesh=mesh, name=name, value=value,
+                           unit=entry["unit"], hasOld=entry["hasOld"])
+        if entry["hasOld"]:
+            old = numerix.zeros(shape, dtype=value.dtype)
+            _readValues(path, name + ".old", manifest["nproc"], sortedIDs, order, old)
+            var._old.value = old
+        variables[name] = var
+
+    return mesh, variables
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,20 @@
+"""Communicators that share the work of a calculation among processors
+
+`fipy.input` only prompts on processor 0, and makes the other
+processors wait for the answer, when there is more than one processor
+
+    >>> import fipy
+    >>> print(fipy.input is fipy._parallelInput())
+    True
+    >>> print(fipy.input is fipy._mpiInput) # doctest: +PARALLEL
+    True
+"""
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -51,3 +51,12 @@ class Mpi4pyCommWrapper(CommWrapper):
 
         """
         return self.mpi4py_comm.allgather(sendobj=obj)
+
+    def gather(self, obj, root=0):
+        """mpi4py `gather`
+
+        Communicates copies of each `sendobj` to `root` only, creating a
+        rank-dimensional list of `sendobj` objects on `root` and `None`
+        on every other rank.
+        """
+        return self.mpi4py_comm.gather(sendobj=obj, root=root)
@@ -1366,6 +1366,40 @@ class PhysicalField(object):
         other = self._inMyUnits(other)
         return MA.allequal(self.value, other.value)
 
+# Products, quotients and powers of units, which would otherwise be
+# recalculated by every arithmetic operation on a `PhysicalField`
+_unitOperations = {}
+_maxUnitOperations = 10000
+
+def _memoizeUnitOperation(op):
+    """Decorate a binary operation of `PhysicalUnit` objects, so that it
+    returns the same `PhysicalUnit` every time it is applied to the same
+    operands
+
+    The operands are compared by their names, factors, powers and
+    offsets, as units are rarely the same object.
+    """
+    def memoized(self, other):
+        if isinstance(other, PhysicalUnit):
+            key = (op.__name__, self._key, other._key)
+        elif type(other) in (int, float):
+            key = (op.__name__, self._key, type(other), other)
+        else:
+            return op(self, other)
+
+        try:
+            return _unitOperations[key]
+        except KeyError:
+            result = op(self, other)
+            if len(_unitOperations) >= _maxUnitOperations:
+                _unitOperations.clear()
+            _unitOperations[key] = result
+            return result
+
+    memoized.__name__ = op.__name__
+    memoized.__doc__ = op.__doc__
+    return memoized
+
 class PhysicalUnit(object):
     """
     A `PhysicalUnit` represents the units of a `PhysicalField`.
@@ -1398,6 +1432,17 @@ class PhysicalUnit(object):
         self.offset = offset
         self.powers = numerix.array(powers)
 
+    @property
+    def _key(self):
+        """Hashable description of the unit
+        """
+        key = self.__dict__.get('_cachedKey')
+        if key is None:
+            key = (tuple(self.names.items()), self.factor,
+                   tuple(self.powers.tolist()), self.offset)
+            self._cachedKey = key
+        return key
+
     def __repr__(self):
         """
         Return representation of a physical unit
@@ -1459,6 +1504,12 @@ class PhysicalUnit(object):
         self._checkSame(other)
         return self.factor >= other.factor
 
+    def _isSame(self, other):
+        """Whether `other` has the same names, factor, powers and offset
+        """
+        return self is other or self._key == other._key
+
+    @_memoizeUnitOperation
     def __mul__(self, other):
         """
         Multiply units together
@@ -1506,6 +1557,7 @@ class PhysicalUnit(object):
 
     __rmul__ = __mul__
 
+    @_memoizeUnitOperation
     def __truediv__(self, other):
         """
         Divide one unit by another
@@ -1583,6 +1635,7 @@ class PhysicalUnit(object):
 
     __rdiv__ = __rtruediv__
 
+    @_memoizeUnitOperation
     def __pow__(self, other):
         """
         Raise a unit to an integer power
@@ -1743,6 +1796,8 @@ class PhysicalUnit(object):
             >>> PhysicalField("1. inch").unit.isDimensionless()
             0
         """
+        if self is _unity:
+            return True
         return not numerix.logical_or.reduce(self.powers)
 
     def isAngle(self):
@@ -1802,6 +1857,9 @@ class PhysicalUnit(object):
         """
         self.names = _NumberDict()
         self.names[name] = 1
+        self._cachedKey = None
+        # this unit may be the memoized result of some operation
+        _unitOperations.clear()
 
     def name(self):
         """
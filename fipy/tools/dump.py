@@ -17,7 +17,7 @@ __all__ = [text_to_native_str(n) for n in __all__]
 
 # TODO: add test to show that round trip pickle of mesh doesn't work properly
 # FIXME: pickle fails to work properly on numpy 1.1 (run gapFillMesh.py)
-def write(data, filename = None, extension = '', communicator=parallelComm):
+def write(data, filename = None, extension = '', communicator=parallelComm, writer=None):
     """
     Pickle an object and write it to a file. Wrapper for
     `cPickle.dump()`.
@@ -43,7 +43,44 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
         Used if `filename` is not given.
     communicator : ~fipy.tools.comms.commWrapper.CommWrapper
         A duck-typed object with `procID` and `Nproc` attributes is sufficient
+    writer : ~fipy.tools.backgroundWriter.BackgroundWriter
+        If not `None`, `data` is pickled immediately, but compressed and
+        written to `filename` in the background
+
+            >>> from fipy.tools.backgroundWriter import BackgroundWriter
+            >>> from fipy.variables.cellVariable import CellVariable
+            >>> v = CellVariable(mesh=old, value=(1., 2.))
+            >>> from tempfile import mkstemp
+            >>> f, fname = mkstemp(".gz")
+            >>> with BackgroundWriter() as writer:
+            ...     write(v, fname, writer=writer)
+            ...     v.value = 0.
+            >>> print(read(fname, f))
+            [ 1.  2.]
+
+        Every processor takes part in pickling a `CellVariable`, which
+        gathers the values of all of them, but only processor 0 writes
+
+            >>> from fipy.tools import numerix
+            >>> from fipy.meshes import Grid1D
+            >>> m = Grid1D(nx=10)
+            >>> v = CellVariable(mesh=m, value=m.cellCenters[0])
+            >>> print(len(v.value) < len(v.globalValue)) # doctest: +PARALLEL
+            True
+            >>> f, fname = mkstemp(".gz")
+            >>> with BackgroundWriter() as writer:
+            ...     write(v, fname, writer=writer)
+            >>> print(numerix.allclose(read(fname, f).globalValue, v.globalValue))
+            True
     """
+    if writer is not None and filename is not None:
+        # pickling takes the snapshot of `data`, and may need every
+        # processor to gather the values
+        pickled = pickle.dumps(data, 0)
+        if communicator.procID == 0:
+            writer.submit(_writePickled, pickled, filename)
+        return
+
     if communicator.procID == 0:
         if filename is None:
             import tempfile
@@ -61,6 +98,11 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
     if filename is None:
         return (f, _filename)
 
+def _writePickled(pickled, filename):
+    fileStream = gzip.GzipFile(filename = filename, mode = 'w', fileobj = None)
+    fileStream.write(pickled)
+    fileStream.close()
+
 def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=False):
     """
     Read a pickled object from a file. Returns the unpickled object.
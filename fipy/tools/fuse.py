@@ -0,0 +1,281 @@
+"""Fused evaluation of `_OperatorVariable` expressions
+
+When enabled with the ``--fuse`` flag or the :envvar:`FIPY_FUSE`
+environment variable, an `_OperatorVariable` that would otherwise be
+evaluated one node at a time is lowered, by the same walk that generates
+code for ``--inline``, to a single expression string.  The expression is
+compiled once by the selected backend and the resulting kernel is cached
+by the expression string, which only encodes the structure of the tree
+and not the values of its leaves.
+
+The ``numpy`` backend compiles an expression to a chain of
+:class:`~numpy.ufunc` calls.  The intermediate results of a chain are
+written into buffers that are kept by the variable being evaluated, so
+repeated evaluations do not allocate a temporary array for each node of
+the tree.
+"""
+from __future__ import unicode_literals
+from builtins import object
+from builtins import zip
+__all__ = ["doFuse"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+import ast
+import numbers
+import os
+import sys
+
+from fipy.tools import numerix
+
+if '--fuse' in [s.lower() for s in sys.argv[1:]]:
+    doFuse = True
+else:
+    doFuse = 'FIPY_FUSE' in os.environ
+
+class _Unfusable(Exception):
+    """Raised when an expression cannot be lowered to a kernel
+    """
+    pass
+
+class _UfuncChain(object):
+    """Sequence of ufunc calls that evaluates an expression
+
+    Each node of the expression becomes one step of the chain.  An
+    operand of a step is the result of an earlier step, a named argument
+    or a constant.
+
+        >>> chain = _UfuncChain("((var00 * var01) + sin(var1))")
+        >>> print([ufunc.__name__ for ufunc, operands in chain.steps])
+        ['multiply', 'sin', 'add']
+        >>> print(sorted(chain.arguments))
+        ['var00', 'var01', 'var1']
+
+    The first evaluation allocates the intermediate results and returns
+    them as buffers for later evaluations with arguments of the same
+    shape and type
+
+        >>> args = dict(var00=numerix.array((1., 2.)),
+        ...             var01=numerix.array((3., 4.)),
+        ...             var1=0.)
+        >>> result, buffers = chain(args)
+        >>> print(result)
+        [ 3.  8.]
+        >>> multiplied = buffers[1][0]
+        >>> args['var00'] = numerix.array((5., 6.))
+        >>> result, again = chain(args, buffers=buffers)
+        >>> print(result)
+        [ 15.  24.]
+        >>> print(again is buffers and buffers[1][0] is multiplied)
+        True
+
+    A change in the type of an argument discards the buffers
+
+        >>> args['var1'] = numerix.array((0, 0))
+        >>> result, again = chain(args, buffers=buffers)
+        >>> print(again is buffers)
+        False
+
+    Expressions that cannot be expressed as ufuncs are rejected
+
+        >>> _UfuncChain("var0[var1]") # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+            ...
+        _Unfusable: Subscript
+        >>> _UfuncChain("dot(var0, var1)") # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+            ...
+        _Unfusable: dot
+    """
+
+    _binaryOps = {
+        ast.Add: numerix.NUMERIX.add,
+        ast.Sub: numerix.NUMERIX.subtract,
+        ast.Mult: numerix.NUMERIX.multiply,
+        ast.Div: numerix.NUMERIX.true_divide,
+        ast.FloorDiv: numerix.NUMERIX.floor_divide,
+        ast.Mod: numerix.NUMERIX.remainder,
+        ast.Pow: numerix.NUMERIX.power,
+        ast.BitAnd: numerix.NUMERIX.bitwise_and,
+        ast.BitOr: numerix.NUMERIX.bitwise_or,
+        ast.BitXor: numerix.NUMERIX.bitwise_xor,
+        ast.LShift: numerix.NUMERIX.left_shift,
+        ast.RShift: numerix.NUMERIX.right_shift
+    }
+
+    _unaryOps = {
+        ast.USub: numerix.NUMERIX.negative,
+        ast.Invert: numerix.NUMERIX.invert,
+        ast.Not: numerix.NUMERIX.logical_not
+    }
+
+    _compareOps = {
+        ast.Lt: numerix.NUMERIX.less,
+        ast.LtE: numerix.NUMERIX.less_equal,
+        ast.Eq: numerix.NUMERIX.equal,
+        ast.NotEq: numerix.NUMERIX.not_equal,
+        ast.Gt: numerix.NUMERIX.greater,
+        ast.GtE: numerix.NUMERIX.greater_equal
+    }
+
+    _functions = {
+        'pow': numerix.NUMERIX.power,
+        'abs': numerix.NUMERIX.absolute
+    }
+
+    _STEP, _ARGUMENT, _CONSTANT = 0, 1, 2
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.steps = []
+        self.arguments = set()
+        kind, index = self._lower(ast.parse(expression, mode="eval").body)
+        if kind != self._STEP:
+            raise _Unfusable(expression)
+
+    def _lower(self, node):
+        """Append the steps that evaluate `node` and return its operand
+        """
+        if isinstance(node, ast.BinOp):
+            ufunc = self._binaryOps.get(type(node.op))
+            operands = [node.left, node.right]
+        elif isinstance(node, ast.UnaryOp):
+            if isinstance(node.op, ast.UAdd):
+                return self._lower(node.operand)
+            ufunc = self._unaryOps.get(type(node.op))
+            operands = [node.operand]
+        elif isinstance(node, ast.Compare):
+            if len(node.ops) != 1:
+                raise _Unfusable("chained comparison")
+            ufunc = self._compareOps.get(type(node.ops[0]))
+            operands = [node.left, node.comparators[0]]
+        elif isinstance(node, ast.Call):
+            if (not isinstance(node.func, ast.Name)
+                or node.keywords or getattr(node, "starargs", None)
+                or getattr(node, "kwargs", None)):
+                raise _Unfusable(ast.dump(node.func))
+            ufunc = self._functions.get(node.func.id,
+                                        getattr(numerix.NUMERIX, node.func.id, None))
+            if not isinstance(ufunc, numerix.ufunc) or ufunc.nin != len(node.args):
+                raise _Unfusable(node.func.id)
+            operands = node.args
+        elif isinstance(node, ast.Name):
+            if not node.id.startswith("var"):
+                raise _Unfusable(node.id)
+            self.arguments.add(node.id)
+            return (self._ARGUMENT, node.id)
+        elif (isinstance(node, getattr(ast, "Constant", ()))
+              and isinstance(node.value, numbers.Number)
+              and not isinstance(node.value, bool)):
+            return (self._CONSTANT, node.value)
+        elif sys.version_info < (3, 8) and isinstance(node, ast.Num):
+            # numbers are `ast.Constant` from Python 3.8 on
+            return (self._CONSTANT, node.n)
+        else:
+            raise _Unfusable(type(node).__name__)
+
+        if ufunc is None:
+            raise _Unfusable(ast.dump(node))
+
+        operands = [self._lower(operand) for operand in operands]
+        self.steps.append((ufunc, operands))
+
+        return (self._STEP, len(self.steps) - 1)
+
+    def _signature(self, args):
+        return tuple((type(args[name]),
+                      numerix.shape(args[name]),
+                      getattr(args[name], "dtype", None)) for name in sorted(self.arguments))
+
+    def __call__(self, args, buffers=None, out=None):
+        """Evaluate the chain
+
+        Parameters
+        ----------
+        args : dict
+            Value of each argument of the expression
+        buffers : tuple
+            Buffers returned by an earlier evaluation of this chain
+        out : ~numpy.ndarray
+            Array to hold the result, if it has the shape and type of the
+            result
+
+        Returns
+        -------
+        result : ~numpy.ndarray
+            Value of the expression
+        buffers : tuple
+            Buffers to pass to the next evaluation
+        """
+        signature = self._signature(args)
+        if buffers is not None and buffers[0] != signature:
+            buffers = None
+
+        results = []
+        def fetch(operand):
+            kind, value = operand
+            if kind == self._STEP:
+                return results[value]
+            elif kind == self._ARGUMENT:
+                return args[value]
+            else:
+                return value
+
+        if buffers is None:
+            for ufunc, operands in self.steps:
+                results.append(ufunc(*[fetch(operand) for operand in operands]))
+            result = results.pop()
+            # results that are not arrays can't be written into
+            buffers = (signature,
+                       [r if isinstance(r, numerix.ndarray) else None for r in results],
+                       numerix.shape(result),
+                       getattr(result, "dtype", None))
+        else:
+            for (ufunc, operands), buffer in zip(self.steps[:-1], buffers[1]):
+                if buffer is None:
+                    results.append(ufunc(*[fetch(operand) for operand in operands]))
+                else:
+                    results.append(ufunc(*[fetch(operand) for operand in operands], out=buffer))
+
+            ufunc, operands = self.steps[-1]
+            if (isinstance(out, numerix.ndarray)
+                and len(buffers[2]) > 0
+                and out.shape == buffers[2] and out.dtype == buffers[3]):
+                result = ufunc(*[fetch(operand) for operand in operands], out=out)
+            else:
+                result = ufunc(*[fetch(operand) for operand in operands])
+
+        return result, buffers
+
+_backends = {
+    'numpy': _UfuncChain
+}
+
+_backend = os.environ.get('FIPY_FUSE', '').lower()
+if _backend not in _backends:
+    _backend = 'numpy'
+
+_kernels = {}
+
+def _getKernel(expression):
+    """Return the cached kernel for `expression`, or `None` if it can't be fused
+
+        >>> _getKernel("(var0 + var1)") is _getKernel("(var0 + var1)")
+        True
+        >>> print(_getKernel("any(var0)"))
+        None
+    """
+    if expression not in _kernels:
+        try:
+            _kernels[expression] = _backends[_backend](expression)
+        except _Unfusable:
+            _kernels[expression] = None
+
+    return _kernels[expression]
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
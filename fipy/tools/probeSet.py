@@ -0,0 +1,235 @@
+"""Repeated evaluation of `CellVariable` objects at fixed points
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import zip
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+
+__all__ = ["ProbeSet"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class ProbeSet(object):
+    r"""Fixed set of points at which to sample `CellVariable` objects
+
+    Calling a `CellVariable` with a set of points looks up the cell
+    nearest to each point every time.  A `ProbeSet` looks up the cells,
+    and the displacement of each point from the center of its cell, once
+    when it is created.  The probed values are the same as those of
+    :meth:`~fipy.variables.cellVariable.CellVariable.__call__`
+
+        >>> from fipy import Grid2D, CellVariable
+        >>> m = Grid2D(nx=3, ny=2)
+        >>> v = CellVariable(mesh=m, value=m.cellCenters[0])
+        >>> points = ((0., 1.1, 1.2), (0., 1., 1.))
+        >>> probes = ProbeSet(mesh=m, points=points)
+        >>> print(probes.cellIDs)
+        [0 1 1]
+        >>> print(probes(v))
+        [ 0.5  1.5  1.5]
+
+    which are the values of the cells with the nearest centers
+
+        >>> centers = m.cellCenters.globalValue
+        >>> ids = numerix.argmin(numerix.sum((centers[..., numerix.newaxis]
+        ...                                   - numerix.array(points)[:, numerix.newaxis])**2,
+        ...                                  axis=0), axis=0)
+        >>> print(numerix.allclose(probes(v), v.globalValue[ids]))
+        True
+
+    and follow the changes of the variable
+
+        >>> v.value = 2 * m.cellCenters[0]
+        >>> print(probes(v))
+        [ 1.  3.  3.]
+
+    Linear interpolation uses the gradient of each variable
+
+        >>> v.value = m.cellCenters[0]
+        >>> linear = ProbeSet(mesh=m, points=points, order=1)
+        >>> print(linear(v))
+        [ 0.25  1.1   1.2 ]
+        >>> displacements = numerix.array(points) - centers[..., ids]
+        >>> x, y = m.cellCenters
+        >>> v.value = x * y
+        >>> print(numerix.allclose(linear(v),
+        ...                        v.globalValue[ids]
+        ...                        + numerix.sum(v.grad.globalValue[..., ids]
+        ...                                      * displacements, axis=0)))
+        True
+        >>> v.value = x
+
+    Several variables, including vector variables, are sampled together
+
+        >>> w = CellVariable(mesh=m, value=m.cellCenters)
+        >>> vp, wp = linear(v, w)
+        >>> print(wp.shape)
+        (2, 3)
+        >>> print(numerix.allclose(wp[0], vp))
+        True
+
+    The cell with the nearest center need not contain the point, where
+    neighbouring cells differ in size.  The probes can instead be placed
+    in the cells that contain them
+
+        >>> from fipy import Grid1D
+        >>> m1 = Grid1D(dx=(1., 10.))
+        >>> u = CellVariable(mesh=m1, value=(1., 2.))
+        >>> print(ProbeSet(mesh=m1, points=((2.,),))(u))
+        [ 1.]
+        >>> print(ProbeSet(mesh=m1, points=((2.,),), containing=True)(u))
+        [ 2.]
+        >>> ProbeSet(mesh=m1, points=((20.,),), containing=True)
+        Traceback (most recent call last):
+            ...
+        ValueError: some of the points are not within the mesh
+
+    A single point gives a single value
+
+        >>> print(ProbeSet(mesh=m, points=(1.2, 0.4), order=1)(v))
+        1.2
+
+        >>> ProbeSet(mesh=m, points=points, order=2)
+        Traceback (most recent call last):
+            ...
+        ValueError: order should be either 0 or 1
+
+    .. note::
+
+       The cells are only looked up when the `ProbeSet` is created, so
+       it must be recreated if the mesh moves.
+    """
+
+    def __init__(self, mesh, points, order=0, cellIDs=None, containing=False):
+        """
+        Parameters
+        ----------
+        mesh : ~fipy.meshes.mesh.Mesh
+            The mesh of the variables to sample.
+        points : tuple or :obj:`list` of :obj:`tuple`
+            A point or set of points in the format (X, Y, Z)
+        order : {`0`, `1`}
+            The order of interpolation, default is 0
+        cellIDs : array_like of int
+            The global IDs of the cells nearest to `points`, if already
+            known
+        containing : bool
+            Whether to sample the cells that contain `points`, rather
+            than the cells with the nearest centers.  Every point must then
+            lie within the mesh.
+        """
+        if order not in (0, 1):
+            raise ValueError('order should be either 0 or 1')
+
+        points = numerix.array(points, dtype=float)
+        self._singlePoint = (points.ndim == 1)
+        if self._singlePoint:
+            points = points[..., numerix.newaxis]
+
+        self.mesh = mesh
+        self.points = points
+        self.order = order
+        comm = mesh.communicator
+        if cellIDs is None and containing:
+            cellIDs = mesh._getContainingCellID(points)
+            if comm.Nproc > 1:
+                # each point is found by the processors whose cells contain it
+                cellIDs = numerix.array(comm.allgather(cellIDs)).max(axis=0)
+            if (cellIDs < 0).any():
+                raise ValueError("some of the points are not within the mesh")
+        elif cellIDs is None:
+            cellIDs = mesh._getNearestCellID(points)
+        self.cellIDs = numerix.array(cellIDs, dtype=numerix.INT_DTYPE).reshape((-1,))
+
+        if comm.Nproc > 1:
+            # each processor samples the probes in the cells it owns
+            globalToLocal = -numerix.ones((mesh.globalNumberOfCells,), dtype=numerix.INT_DTYPE)
+            globalToLocal[mesh._globalNonOverlappingCellIDs] = mesh._localNonOverlappingCellIDs
+            localIDs = globalToLocal[self.cellIDs]
+            owned = numerix.nonzero(localIDs >= 0)[0]
+            self._localCellIDs = localIDs[owned]
+            self._probeOrder = numerix.concatenate(comm.allgather(owned))
+        else:
+            owned = slice(None)
+            self._localCellIDs = self.cellIDs
+            self._probeOrder = None
+
+        if order == 1:
+            self._displacements = (points[..., owned]
+                                   - mesh.cellCenters.value[..., self._localCellIDs])
+
+    def _localValue(self, var):
+        """Value of `var` at the probes in the cells of this processor
+        """
+        if var.mesh is not self.mesh:
+            raise ValueError("%s is not defined on the mesh of the probes" % var)
+
+        value = var.value[..., self._localCellIDs]
+
+        if self.order == 1:
+            grad = var.grad.value[..., self._localCellIDs]
+            # displacements are `(dim, N)`, gradients are
+            # `(dim,) + elementshape + (N,)`
+            displacements = self._displacements.reshape((self._displacements.shape[0],)
+                                                        + (1,) * (grad.ndim - 2)
+                                                        + self._displacements.shape[1:])
+            value = value + numerix.sum(displacements * grad, axis=0)
+
+        return value
+
+    def _gather(self, values):
+        """Assemble the probed `values` of all processors with one exchange
+        """
+        values = [numerix.asarray(value) for value in values]
+        shapes = [value.shape[:-1] for value in values]
+        sizes = [int(numerix.prod(shape)) for shape in shapes]
+        local = numerix.concatenate([value.reshape((size, -1))
+                                     for value, size in zip(values, sizes)], axis=0)
+
+        gathered = numerix.empty((local.shape[0], len(self.cellIDs)), dtype=local.dtype)
+        gathered[..., self._probeOrder] = numerix.concatenate(self.mesh.communicator.allgather(local),
+                                                              axis=-1)
+
+        offsets = numerix.cumsum([0] + sizes)
+        return [gathered[start:stop].reshape(shape + (-1,)).astype(value.dtype)
+                for start, stop, shape, value in zip(offsets[:-1], offsets[1:], shapes, values)]
+
+    def __call__(self, *variables):
+        """Sample `variables` at the probes
+
+        Parameters
+        ----------
+        *variables : ~fipy.variables.cellVariable.CellVariable
+            Variables defined on the mesh of the probes
+
+        Returns
+        -------
+        ~numpy.ndarray or :obj:`list` of ~numpy.ndarray
+            The values at the probes, with the shape of each variable's
+            element followed by the number of probes, or a single value
+            for each variable if the probes were created with a single
+            point.  A list is returned when sampling more than one
+            variable.
+        """
+        values = [self._localValue(var) for var in variables]
+
+        if self._probeOrder is not None:
+            values = self._gather(values)
+
+        if self._singlePoint:
+            values = [value[..., 0] for value in values]
+
+        if len(values) == 1:
+            return values[0]
+        else:
+            return values
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
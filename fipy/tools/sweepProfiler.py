@@ -0,0 +1,302 @@
+"""Record where the time of a `Term.sweep` goes
+
+While a :class:`SweepProfiler` is active, :term:`FiPy` records the wall
+time, the number of calls and, optionally, the memory allocated by
+
+- building the matrix of each `Term` class,
+- applying each boundary condition class,
+- each `Solver` class solving, calculating residuals and preparing its
+  preconditioner,
+- recalculating each `Variable`, by name.
+
+Times are inclusive, e.g., the time spent building a `Term` includes the
+time spent recalculating the `Variable` objects that make up its
+coefficient.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import str
+from builtins import zip
+__docformat__ = 'restructuredtext'
+
+import time
+import weakref
+
+from fipy.tests.doctestPlus import register_skipper
+
+__all__ = ["SweepProfiler"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+def _checkForTracemalloc():
+    try:
+        import tracemalloc
+        hasTracemalloc = True
+    except ImportError:
+        hasTracemalloc = False
+    return hasTracemalloc
+
+register_skipper(flag="TRACEMALLOC",
+                 test=_checkForTracemalloc,
+                 why="the `tracemalloc` module cannot be imported")
+
+# profilers that are currently recording
+_active = []
+
+class _NoTiming(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+_noTiming = _NoTiming()
+
+class _Timing(object):
+    def __init__(self, category, name):
+        self.category = category
+        self.name = name
+
+    def __enter__(self):
+        self.starts = [profiler._start() for profiler in _active]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for profiler, start in zip(_active, self.starts):
+            profiler._stop(profiler._record(self.category, self.name), start)
+
+class _VariableTiming(_Timing):
+    def __init__(self, var):
+        self.var = var
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for profiler, start in zip(_active, self.starts):
+            profiler._stop(profiler._variableRecord(self.var), start)
+
+def _timing(category, name):
+    """Context manager that records the enclosed code with any active
+    `SweepProfiler`
+
+    Parameters
+    ----------
+    category : str
+        Kind of work, e.g., "Term build"
+    name : str
+        What did the work, e.g., the class name of a `Term`
+    """
+    if _active:
+        return _Timing(category, name)
+    else:
+        return _noTiming
+
+class SweepProfiler(object):
+    """Instrumentation of `Term`, `Solver` and `Variable` evaluation
+
+    Use as a context manager
+
+        >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+        >>> mesh = Grid1D(nx=100)
+        >>> phi = CellVariable(mesh=mesh, value=0., name="phi")
+        >>> phi.constrain(1., mesh.facesLeft)
+        >>> D = CellVariable(mesh=mesh, value=1., name="D")
+        >>> eq = TransientTerm() == DiffusionTerm(coeff=D * (1 + phi))
+
+        >>> with SweepProfiler() as profiler:
+        ...     for sweep in range(3):
+        ...         res = eq.sweep(var=phi, dt=1.)
+
+    or call :meth:`start` and :meth:`stop`. The results are available as a
+    list of records, ordered from most to least time,
+
+        >>> records = profiler.report()
+        >>> categories = set(r["category"] for r in records)
+        >>> print(set(['Solver residual', 'Solver solve',
+        ...            'Term build', 'Variable']) <= categories)
+        True
+        >>> print([r["calls"] for r in records
+        ...        if r["category"] == "Term build"])
+        [3, 3]
+        >>> print(sorted(r["name"] for r in records
+        ...              if r["category"] == "Term build"))
+        ['DiffusionTerm', 'TransientTerm']
+        >>> print(max(r["seconds"] for r in records) == records[0]["seconds"])
+        True
+
+    or as a table
+
+        >>> print(profiler) # doctest: +ELLIPSIS
+        category         name ... calls     seconds        bytes
+        ...Term build       DiffusionTerm ...     3 ...
+
+    Nothing is recorded outside of the profiler
+
+        >>> res = eq.sweep(var=phi, dt=1.)
+        >>> print(sum(r["calls"] for r in profiler.report() if r["name"] == "TransientTerm"))
+        3
+
+    `Variable` objects are recorded by name.  Unnamed variables, whose
+    names are generated from their expressions, are only named in the
+    report, and those that no longer exist are recorded by class
+
+        >>> x = CellVariable(mesh=mesh, value=mesh.cellCenters[0], name="x")
+        >>> with SweepProfiler() as profiler:
+        ...     for step in range(3):
+        ...         expr = x * x
+        ...         expr.cacheMe()
+        ...         value = expr.value
+        >>> print(len(profiler._unnamed))
+        1
+        >>> print(sorted((r["name"], r["calls"]) for r in profiler.report()))
+        [('(x * x)', 1), ('binOp', 2)]
+
+    The memory allocated by each piece of work is recorded with the
+    :mod:`tracemalloc` module
+
+        >>> with SweepProfiler(traceMemory=True) as profiler: # doctest: +TRACEMALLOC
+        ...     res = eq.sweep(var=phi, dt=1.)
+        >>> print(all(r["bytes"] is not None for r in profiler.report())) # doctest: +TRACEMALLOC
+        True
+
+    """
+
+    def __init__(self, traceMemory=False):
+        """
+        Parameters
+        ----------
+        traceMemory : bool
+            Whether to record the net memory allocated by each piece of
+            work.  Requires :mod:`tracemalloc`, which starts tracing if
+            it isn't already.
+        """
+        self.traceMemory = traceMemory
+        self.records = {}
+        # records of the variables without a name of their own, by `id`
+        self._unnamed = {}
+        self._startedTracing = False
+
+    def start(self):
+        """Begin recording
+        """
+        if self.traceMemory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._startedTracing = True
+        if self not in _active:
+            _active.append(self)
+
+    def stop(self):
+        """Stop recording
+        """
+        if self in _active:
+            _active.remove(self)
+        if self._startedTracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self._startedTracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _start(self):
+        if self.traceMemory:
+            import tracemalloc
+            return (time.time(), tracemalloc.get_traced_memory()[0])
+        else:
+            return (time.time(), None)
+
+    def _stop(self, record, start):
+        seconds = time.time() - start[0]
+        if start[1] is not None:
+            import tracemalloc
+            allocated = tracemalloc.get_traced_memory()[0] - start[1]
+        else:
+            allocated = None
+
+        self._add(record, (1, seconds, allocated))
+
+    @staticmethod
+    def _add(record, work):
+        calls, seconds, allocated = work
+        record[0] += calls
+        record[1] += seconds
+        if allocated is not None:
+            record[2] = (record[2] or 0) + allocated
+
+    def _record(self, category, name):
+        return self.records.setdefault((category, name), [0, 0., None])
+
+    def _variableRecord(self, var):
+        """Record of the recalculation of `var`
+
+        The name of an `_OperatorVariable` is generated from its whole
+        expression, so it is left to :meth:`report`.  Until then, the
+        work of each unnamed variable is kept separately, and is added to
+        the work of its class once the variable is gone.
+        """
+        if var._name:
+            return self._record("Variable", var._name)
+
+        key = id(var)
+        if key not in self._unnamed:
+            def forget(ref, key=key, className=var.__class__.__name__):
+                ref, record = self._unnamed.pop(key)
+                self._add(self._record("Variable", className), record)
+
+            self._unnamed[key] = (weakref.ref(var, forget), [0, 0., None])
+
+        return self._unnamed[key][1]
+
+    def report(self):
+        """Recorded work, from most to least time
+
+        Returns
+        -------
+        list of dict
+            With keys "category", "name", "calls", "seconds" and
+            "bytes" (`None` unless `traceMemory`)
+        """
+        work = dict((key, list(record)) for key, record in self.records.items())
+        for ref, record in list(self._unnamed.values()):
+            var = ref()
+            if var is not None:
+                name = var.name or var.__class__.__name__
+                self._add(work.setdefault(("Variable", name), [0, 0., None]), record)
+
+        records = [dict(category=category, name=name,
+                        calls=calls, seconds=seconds, bytes=allocated)
+                   for (category, name), (calls, seconds, allocated) in work.items()]
+        return sorted(records, key=lambda r: -r["seconds"])
+
+    def __str__(self):
+        records = self.report()
+        width = max([len("name")] + [len(r["name"]) for r in records])
+        lines = ["%-16s %-*s %6s %11s %12s" % ("category", width, "name", "calls", "seconds", "bytes")]
+        for r in records:
+            if r["bytes"] is None:
+                allocated = "-"
+            else:
+                allocated = str(r["bytes"])
+            lines.append("%-16s %-*s %6d %11.6f %12s" % (r["category"], width, r["name"],
+                                                         r["calls"], r["seconds"], allocated))
+        return "\n".join(lines)
+
+def _variableTiming(var):
+    """Context manager that records the recalculation of `var`
+    """
+    if _active:
+        return _VariableTiming(var)
+    else:
+        return _noTiming
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
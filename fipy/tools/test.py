@@ -9,6 +9,12 @@ def _suite():
             'dimensions.physicalField',
             'numerix',
             'dump',
+            'backgroundWriter',
+            'checkpoint',
+            'comms',
+            'fuse',
+            'sweepProfiler',
+            'probeSet',
             'vector',
         ), base = __name__)
 
@@ -47,14 +47,17 @@ def _BinaryOperatorVariable(operatorClass=None):
 
             return self.op(self.var[0].value, val1)
 
+        def _calcUnit(self):
+            try:
+                var = self._varProxy
+                return self._extractUnit(self.op(var[0], var[1]))
+            except:
+                return self._extractUnit(self._calcValue_())
+
         @property
         def unit(self):
             if self._unit is None:
-                try:
-                    var = self._varProxy
-                    return self._extractUnit(self.op(var[0], var[1]))
-                except:
-                    return self._extractUnit(self._calcValue_())
+                return self._getCachedUnit()
             else:
                 return self._unit
 
@@ -128,7 +128,19 @@ class CellVariable(_MeshVariable):
         :attr:`~fipy.variables.variable.Variable.value`.
         """
         return self._getGlobalValue(self.mesh._localNonOverlappingCellIDs,
-                                    self.mesh._globalNonOverlappingCellIDs)
+                                    self.mesh._gatheredGlobalNonOverlappingCellIDs)
+
+    @property
+    def _rootValue(self):
+        """Concatenate values from all processors on processor 0 only
+
+        Other processors receive `None`. When running on a single
+        processor, the result is identical to
+        :attr:`~fipy.variables.variable.Variable.value`.
+        """
+        return self._getGlobalValue(self.mesh._localNonOverlappingCellIDs,
+                                    self.mesh._gatheredGlobalNonOverlappingCellIDs,
+                                    root=0)
 
     def setValue(self, value, unit = None, where = None):
         _MeshVariable.setValue(self, value=self._globalToLocalValue(value), unit=unit, where=where)
@@ -138,7 +150,9 @@ class CellVariable(_MeshVariable):
         Interpolates the `CellVariable` to a set of points using a
         method that has a memory requirement on the order of `Ncells` by
         `Npoints` in general, but uses only `Ncells` when the
-        `CellVariable`'s mesh is a `UniformGrid` object.
+        `CellVariable`'s mesh is a `UniformGrid` object.  To sample at
+        the same points repeatedly, use a
+        :class:`~fipy.tools.probeSet.ProbeSet`.
 
         Tests
 
@@ -149,6 +163,7 @@ class CellVariable(_MeshVariable):
             [ 0.5  1.5  1.5]
             >>> print(v(((0., 1.1, 1.2), (0., 1., 1.)), order=1))
             [ 0.25  1.1   1.2 ]
+
             >>> m0 = Grid2D(nx=2, ny=2, dx=1., dy=1.)
             >>> m1 = Grid2D(nx=4, ny=4, dx=.5, dy=.5)
             >>> x, y = m0.cellCenters
@@ -160,6 +175,23 @@ class CellVariable(_MeshVariable):
             [ 0.125  0.25   0.5    0.625  0.25   0.375  0.875  1.     0.5    0.875
               1.875  2.25   0.625  1.     2.25   2.625]
 
+        Each component of a vector variable is interpolated with its own
+        gradient, which is indexed by direction first
+
+            >>> x, y = m.cellCenters
+            >>> w = CellVariable(mesh=m, value=(x * y, x + y), rank=1)
+            >>> points = numerix.array(((0., 1.1, 1.2), (0., 1., 1.)))
+            >>> ids = (0, 1, 1)
+            >>> displacements = points - m.cellCenters.globalValue[..., ids]
+            >>> print(w(points, order=1).shape)
+            (2, 3)
+            >>> print(numerix.allclose(w(points, order=1),
+            ...                        w.globalValue[..., ids]
+            ...                        + numerix.sum(w.grad.globalValue[..., ids]
+            ...                                      * displacements[:, numerix.newaxis],
+            ...                                      axis=0)))
+            True
+
         Parameters
         ----------
         points : tuple or :obj:`list` of :obj:`tuple`
@@ -171,23 +203,10 @@ class CellVariable(_MeshVariable):
             nearest cell IDs array, shape should be same as points
         """
         if points is not None:
-
-            if nearestCellIDs is None:
-                nearestCellIDs = self.mesh._getNearestCellID(points)
-
-            if order == 0:
-                return self.globalValue[..., nearestCellIDs]
-
-            elif order == 1:
-                ##cellID = self.mesh._getNearestCellID(points)
-##                return self[...,self.mesh._getNearestCellID(points)] + numerix.dot(points - self.mesh.cellCenters[...,cellID], self.grad[...,cellID])
-                return (self.globalValue[..., nearestCellIDs]
-                        + numerix.dot(points - self.mesh.cellCenters.globalValue[..., nearestCellIDs],
-                                      self.grad.globalValue[..., nearestCellIDs]))
-
-            else:
-                raise ValueError('order should be either 0 or 1')
-
+            # only the values at `points` are exchanged between processors
+            from fipy.tools.probeSet import ProbeSet
+            return ProbeSet(mesh=self.mesh, points=points, order=order,
+                            cellIDs=nearestCellIDs)(self)
         else:
             return _MeshVariable.__call__(self)
 
@@ -35,8 +35,28 @@ class FaceVariable(_MeshVariable):
 
     @property
     def globalValue(self):
+        """Values at all faces of the global mesh, on every processor
+
+        Faces on the boundaries between processors are counted once
+
+            >>> from fipy import Grid1D
+            >>> m = Grid1D(nx=8)
+            >>> v = FaceVariable(mesh=m, value=m.faceCenters[0])
+            >>> print(len(v.globalValue))
+            9
+            >>> print(numerix.allclose(v.globalValue, numerix.arange(9.)))
+            True
+            >>> print(len(v.value) < len(v.globalValue)) # doctest: +PARALLEL
+            True
+        """
+        return self._getGlobalValue(self.mesh._localNonOverlappingFaceIDs,
+                                    self.mesh._gatheredGlobalNonOverlappingFaceIDs)
+
+    @property
+    def _rootValue(self):
         return self._getGlobalValue(self.mesh._localNonOverlappingFaceIDs,
-                                    self.mesh._globalNonOverlappingFaceIDs)
+                                    self.mesh._gatheredGlobalNonOverlappingFaceIDs,
+                                    root=0)
 
     def setValue(self, value, unit = None, where = None):
         _MeshVariable.setValue(self, value=self._globalToLocalValue(value), unit=unit, where=where)
@@ -123,16 +123,44 @@ class _MeshVariable(Variable):
             value = value.value
         return value
 
-    def _getGlobalValue(self, localIDs, globalIDs):
+    def _getGlobalValue(self, localIDs, globalIDs, root=None):
+        """Assemble the values of all processors
+
+        Parameters
+        ----------
+        localIDs : array_like of int
+            IDs of the elements owned by this processor, in its own
+            numbering.
+        globalIDs : array_like of int
+            IDs of the elements owned by each processor, in the global
+            numbering, one processor after the other.
+        root : int
+            If `None`, every processor receives the assembled values.
+            Otherwise, only processor `root` receives them and every
+            other processor receives `None`.
+        """
         localValue = self.value
-        if self.mesh.communicator.Nproc > 1:
+        comm = self.mesh.communicator
+        if comm.Nproc > 1:
             if localValue.shape[-1] != 0:
                 localValue = localValue[..., localIDs]
-            globalIDs = numerix.concatenate(self.mesh.communicator.allgather(globalIDs))
 
-            globalValue = numerix.empty(localValue.shape[:-1] + (max(globalIDs) + 1,),
+            if root is None:
+                localValues = comm.allgather(localValue)
+            else:
+                localValues = comm.gather(localValue, root=root)
+                if comm.procID != root:
+                    return None
+
+            # elements on the boundaries between processors, such as
+            # faces, are owned by more than one of them
+            if len(globalIDs) > 0:
+                numberOfElements = globalIDs.max() + 1
+            else:
+                numberOfElements = 0
+            globalValue = numerix.empty(localValue.shape[:-1] + (numberOfElements,),
                                         dtype=numerix.obj2sctype(localValue))
-            globalValue[..., globalIDs] = numerix.concatenate(self.mesh.communicator.allgather(localValue), axis=-1)
+            globalValue[..., globalIDs] = numerix.concatenate(localValues, axis=-1)
 
             return globalValue
         else:
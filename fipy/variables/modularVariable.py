@@ -66,7 +66,9 @@ class ModularVariable(CellVariable):
         """
         value = self._makeValue(value=value, unit=unit, array=array)
         from fipy.variables.modPhysicalField import _ModPhysicalField
-        self._value = _ModPhysicalField(value=value, unit=unit, array=array)
+        value = _ModPhysicalField(value=value, unit=unit, array=array)
+        self._noteUnitChange(value)
+        self._value = value
 
     def updateOld(self):
         """
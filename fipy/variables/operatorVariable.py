@@ -19,6 +19,7 @@ def _OperatorVariableClass(baseClass=object):
             self.var = var
             self.opShape = opShape
             self._unit = unit
+            self._unitCache = None
             if valueMattersForUnit is None:
                 self.valueMattersForUnit = [False for v in var]
             else:
@@ -38,6 +39,10 @@ def _OperatorVariableClass(baseClass=object):
 
             self.comment = inlineComment
 
+            self._fusedTemplate = None
+            self._fusedKernel = None
+            self._fusedBuffers = None
+
         def __setitem__(self, index, value):
             raise TypeError("The value of an `_OperatorVariable` cannot be assigned")
 
@@ -49,8 +54,13 @@ def _OperatorVariableClass(baseClass=object):
                 return self._calcValue_()
             else:
                 from fipy.tools import inline
+                from fipy.tools import fuse
                 if inline.doInline:
                     return self._execInline(comment=self.comment)
+                elif fuse.doFuse:
+                    return self._execFused()
+                elif self._evaluateInPlace and self._value is not None:
+                    return self._execInPlace()
                 else:
                     return self._calcValue_()
 
@@ -71,14 +81,91 @@ def _OperatorVariableClass(baseClass=object):
 
             return s
 
+        def _getFusedString(self, argDict={}, id="", freshen=False):
+            if self.canInline:
+                s = self._getRepresentation(style="fused", argDict=argDict, id=id, freshen=freshen)
+            else:
+                s = baseClass._getFusedString(self, argDict=argDict, id=id)
+            if freshen:
+                self._markFresh()
+
+            return s
+
+        def _execFused(self):
+            """
+            Evaluate the tree of uncached `_OperatorVariable` objects rooted
+            here with a single kernel from :mod:`fipy.tools.fuse`
+            """
+            from fipy.tools import fuse
+            argDict = {}
+            try:
+                expression = self._getFusedString(argDict=argDict, freshen=True)
+            except SyntaxError:
+                expression = None
+
+            if expression is not None:
+                self._fusedKernel = fuse._getKernel(expression)
+            else:
+                self._fusedKernel = None
+
+            if self._fusedKernel is None:
+                return self._calcValue_()
+
+            value, self._fusedBuffers = self._fusedKernel(argDict, buffers=self._fusedBuffers,
+                                                          out=self._inPlaceTarget)
+
+            return value
+
+        @property
+        def _inPlaceTarget(self):
+            if self._evaluateInPlace:
+                return self._value
+            else:
+                return None
+
+        def _execInPlace(self):
+            """
+            Evaluate this node alone with a single ufunc from
+            :mod:`fipy.tools.fuse`, writing into the array that holds the
+            cached value when its shape and type are unchanged
+            """
+            from fipy.tools import fuse
+            try:
+                if self._fusedTemplate is None:
+                    self._fusedTemplate = _OperatorVariable._getRepresentation(self, style="template")
+                expression = self._fusedTemplate.format(*["var%d" % i for i in range(len(self.var))])
+            except SyntaxError:
+                expression = None
+
+            if expression is not None:
+                self._fusedKernel = fuse._getKernel(expression)
+            else:
+                self._fusedKernel = None
+
+            if self._fusedKernel is None:
+                return self._calcValue_()
+
+            argDict = dict(("var%d" % i, v.value) for i, v in enumerate(self.var))
+            value, self._fusedBuffers = self._fusedKernel(argDict, buffers=self._fusedBuffers,
+                                                          out=self._inPlaceTarget)
+
+            return value
+
         def _getRepresentation(self, style="__repr__", argDict={}, id=id, freshen=False):
             """
 
             Parameters
             ----------
-            style : {'__repr__', 'name', 'TeX', 'C'}
+            style : {'__repr__', 'name', 'TeX', 'C', 'fused', 'template'}
                desired formatting for representation
             """
+            if style == "fused":
+                # only parse the bytecode of `op` once
+                if self._fusedTemplate is None:
+                    self._fusedTemplate = _OperatorVariable._getRepresentation(self, style="template")
+                return self._fusedTemplate.format(*[self.__var(i, style, argDict, id, freshen)
+                                                    for i in range(len(self.var))])
+
             if isinstance(self.op, numerix.ufunc):
                 return "%s(%s)" % (self.op.__name__, ", ".join([self.__var(i, style, argDict, id, freshen)
                                                                for i in range(len(self.var))]))
@@ -125,6 +212,19 @@ def _OperatorVariableClass(baseClass=object):
                     result = v._variableClass._getCstring(v, argDict,
                                                                id=id + str(i),
                                                                freshen=False)
+            elif style == "template":
+                result = "{%d}" % i
+            elif style == "fused":
+                if not v._isCached():
+                    result = v._getFusedString(argDict, id=id + str(i), freshen=freshen)
+                    if isinstance(v, Variable):
+                        v._value = None
+                    else:
+                        v.value = None
+                else:
+                    result = v._variableClass._getFusedString(v, argDict,
+                                                              id=id + str(i),
+                                                              freshen=False)
             else:
                 raise SyntaxError("Unknown style: %s" % style)
 
@@ -155,6 +255,8 @@ def _OperatorVariableClass(baseClass=object):
                     s = stack.pop()
                     if style == 'C':
                         return s.replace('numerix.', '').replace('arc', 'a')
+                    elif style == 'template':
+                        return s.replace('numerix.', '')
                     else:
                         return s
                 elif dis.opname[bytecode] == 'LOAD_CONST':
@@ -202,6 +304,8 @@ def _OperatorVariableClass(baseClass=object):
                     s = stack.pop()
                     if style == 'C':
                         return s.replace('numerix.', '').replace('arc', 'a')
+                    elif style == 'template':
+                        return s.replace('numerix.', '')
                     else:
                         return s
                 elif ins.opname == 'LOAD_CONST':
@@ -235,6 +339,22 @@ def _OperatorVariableClass(baseClass=object):
                 else:
                     raise SyntaxError("Unknown instruction: %s" % repr(ins))
 
+        def _calcUnit(self):
+            pass
+
+        def _getCachedUnit(self):
+            """Unit of the result, only recalculated if the unit of some
+            `Variable` has changed since it was last calculated
+            """
+            if True in self.valueMattersForUnit:
+                # e.g., the unit of `a**b` depends on the value of `b`
+                return self._calcUnit()
+
+            changes = Variable._unitChanges
+            if self._unitCache is None or self._unitCache[0] != changes:
+                self._unitCache = (changes, self._calcUnit())
+            return self._unitCache[1]
+
         @property
         def _varProxy(self):
             """list of dimensional scalars that stand in for `self.var`
@@ -1200,6 +1320,101 @@ def _testBinOp(self):
     """
     pass
 
+def _testFused(self):
+    """
+    Test of `_execFused`
+
+        >>> a = Variable((1., 2., 3.))
+        >>> b = Variable((4., 5., 6.))
+        >>> c = Variable(2.)
+        >>> expr = (a * b - c) / c
+        >>> print(expr._execFused())
+        [ 1.  4.  8.]
+        >>> a.value = (2., 2., 2.)
+        >>> print(expr._execFused())
+        [ 3.  4.  5.]
+
+    Kernels are shared by trees of the same structure
+
+        >>> from fipy.tools import fuse
+        >>> argDict = {}
+        >>> expression = ((b * a - c) / a)._getFusedString(argDict=argDict)
+        >>> print(fuse._getKernel(expression) is expr._fusedKernel)
+        True
+
+    Trees that can't be fused are evaluated node by node
+
+        >>> print(Variable((1, 2, 3))[1:]._execFused())
+        [2 3]
+
+    Cached intermediate variables are leaves of the fused tree
+
+        >>> from fipy.meshes import Grid1D
+        >>> from fipy.variables.cellVariable import CellVariable
+        >>> mesh = Grid1D(nx=4)
+        >>> phi = CellVariable(mesh=mesh, value=(0., 0.25, 0.5, 1.))
+        >>> g = phi * (1 - phi)
+        >>> source = 30 * g * g
+        >>> other = -g
+        >>> fuse.doFuse, doFuse = True, fuse.doFuse
+        >>> print(numerix.allclose(source, 30 * (phi * (1 - phi))**2))
+        True
+        >>> phi.value = (1., 0.5, 0.25, 0.)
+        >>> print(numerix.allclose(source, 30 * (phi * (1 - phi))**2))
+        True
+        >>> print(source._fusedKernel.expression)
+        ((var00 * var01) * var1)
+        >>> fuse.doFuse = doFuse
+    """
+    pass
+
+def _testInPlace(self):
+    """
+    Test of `_execInPlace`
+
+    A cached `_OperatorVariable` recalculates its value into the same
+    array, as long as the shape and type of the result don't change
+
+        >>> from fipy.tools import fuse
+        >>> fuse.doFuse, doFuse = False, fuse.doFuse
+        >>> a = Variable((1., 2., 3.))
+        >>> b = Variable((4., 5., 6.))
+        >>> expr = a * b
+        >>> expr.cacheMe()
+        >>> evaluateInPlace, Variable._evaluateInPlace = Variable._evaluateInPlace, True
+        >>> print(expr)
+        [  4.  10.  18.]
+        >>> a.value = (2., 2., 2.)
+        >>> first = expr.value
+        >>> print(first)
+        [  8.  10.  12.]
+        >>> a.value = (3., 3., 3.)
+        >>> print(expr.value is first)
+        True
+        >>> print(first)
+        [ 12.  15.  18.]
+
+    Nodes that can't be expressed as a ufunc are calculated as usual
+
+        >>> c = Variable(((1., 2.), (3., 4.))).dot(Variable((1., 1.)))
+        >>> c.cacheMe()
+        >>> print(c)
+        [ 4.  6.]
+        >>> d = numerix.sin(a + b)
+        >>> d.cacheMe()
+        >>> print(numerix.allclose(d, numerix.sin((7., 8., 9.))))
+        True
+        >>> a.value = (2., 2., 2.)
+        >>> print(numerix.allclose(d, numerix.sin((6., 7., 8.))))
+        True
+        >>> print(d._fusedKernel.expression)
+        sin(var0)
+
+        >>> Variable._evaluateInPlace = evaluateInPlace
+        >>> fuse.doFuse = doFuse
+    """
+    pass
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
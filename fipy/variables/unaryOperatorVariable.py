@@ -35,15 +35,18 @@ def _UnaryOperatorVariable(operatorClass=None):
         def _calcValue_(self):
             return self.op(self.var[0].value)
 
+        def _calcUnit(self):
+            try:
+                var = self._varProxy
+                return self._extractUnit(self.op(var[0]))
+            except:
+                return self._extractUnit(self._calcValue())
+
         @property
         def unit(self):
             assert(hasattr(self, "_unit") == True)
             if self._unit is None:
-                try:
-                    var = self._varProxy
-                    return self._extractUnit(self.op(var[0]))
-                except:
-                    return self._extractUnit(self._calcValue())
+                return self._getCachedUnit()
             else:
                 return self._unit
 
@@ -5,12 +5,14 @@ from builtins import str
 from future.utils import string_types
 __docformat__ = 'restructuredtext'
 
+import contextlib
 import os
 
 from fipy.tools.dimensions import physicalField
 from fipy.tools import numerix
 from fipy.tools import parser
 from fipy.tools import inline
+from fipy.tools import sweepProfiler
 
 __all__ = ["Variable"]
 from future.utils import text_to_native_str
@@ -48,6 +50,15 @@ class Variable(object):
 
     _cacheNever = False
 
+    # recalculate the cached value of an `_OperatorVariable` into the
+    # array that already holds it
+    _evaluateInPlace = ((os.getenv("FIPY_INPLACE") is not None)
+                        or parser.parse("--inplace", action="store_true"))
+
+    # count of changes to the unit of any `Variable`, which invalidate
+    # the units cached by `_OperatorVariable` objects
+    _unitChanges = 0
+
     def __new__(cls, *args, **kwds):
         return object.__new__(cls)
 
@@ -230,10 +241,22 @@ class Variable(object):
             >>> a.unit = "m**2/s"
             >>> print(a)
             1.0 m**2/s
+
+        The units of expressions that use `self` change, too
+
+            >>> b = Variable(value=2.)
+            >>> c = a * b + a
+            >>> print(c.unit)
+            <PhysicalUnit m**2/s>
+            >>> a.unit = "m"
+            >>> print(c.unit)
+            <PhysicalUnit m>
         """
         if self._value is None:
             self.value
 
+        Variable._unitChanges += 1
+
         if isinstance(self._value, physicalField.PhysicalField):
             self._value.unit = unit
         else:
@@ -434,6 +457,27 @@ class Variable(object):
          else:
              return identifier + self._getCIndexString(shape)
 
+    def _getFusedString(self, argDict={}, id="", freshen=None):
+        """
+        Generate the expression and dictionary to be used by
+        :mod:`fipy.tools.fuse`
+
+            >>> from future.utils import text_to_native_str as ttns
+
+            >>> argDict = {}
+            >>> ttns((Variable((1, 2)) * Variable(3))._getFusedString(argDict=argDict))
+            '(var0 * var1)'
+            >>> print(argDict['var0'])
+            [1 2]
+
+        freshen is ignored
+        """
+        identifier = 'var%s' % (id)
+
+        argDict[identifier] = self.value
+
+        return identifier
+
     def tostring(self, max_line_width=75, precision=8, suppress_small=False, separator=' '):
         return numerix.tostring(self.value,
                                 max_line_width=max_line_width,
@@ -489,8 +533,15 @@ class Variable(object):
 
         """
 
+        if Variable._batchedRoots:
+            Variable._flushBatchedChanges()
+
         if self.stale or not self._isCached() or self._value is None:
-            value = self._calcValue()
+            if sweepProfiler._active:
+                with sweepProfiler._variableTiming(self):
+                    value = self._calcValue()
+            else:
+                value = self._calcValue()
             if self._isCached():
                 self._setValueInternal(value=value)
             else:
@@ -621,7 +672,24 @@ class Variable(object):
                 var.dontCacheMe(recursive=False)
 
     def _setValueInternal(self, value, unit=None, array=None):
-        self._value = self._makeValue(value=value, unit=unit, array=array)
+        value = self._makeValue(value=value, unit=unit, array=array)
+        self._noteUnitChange(value)
+        self._value = value
+
+    def _noteUnitChange(self, value):
+        """Count a change of unit if `value`, which is about to replace
+        the value of `self`, has different units
+
+        Unset values are ignored, as the units of variables that aren't
+        cached only change when the units of the variables they're
+        calculated from do.
+        """
+        oldValue = getattr(self, '_value', None)
+        if oldValue is not None and value is not None:
+            oldUnit = self._extractUnit(oldValue)
+            newUnit = self._extractUnit(value)
+            if not oldUnit._isSame(newUnit):
+                Variable._unitChanges += 1
 
     def _makeValue(self, value, unit=None, array=None):
 
@@ -799,9 +867,18 @@ class Variable(object):
     def _calcValueInline(self):
         raise NotImplementedError
 
-    def _getSubscribedVariables(self):
+    def _compactSubscribers(self):
+        """Drop the references to subscribers that no longer exist
+        """
         self._subscribedVariables = [sub for sub in self._subscribedVariables if sub() is not None]
 
+    def _getSubscribedVariables(self):
+        # only rebuild the list when a subscriber has been collected
+        for sub in self._subscribedVariables:
+            if sub() is None:
+                self._compactSubscribers()
+                break
+
         return self._subscribedVariables
 
     def _setSubscribedVariables(self, sVars):
@@ -810,16 +887,98 @@ class Variable(object):
     subscribedVariables = property(_getSubscribedVariables,
                                    _setSubscribedVariables)
 
-    def __markStale(self):
-        for subscriber in self.subscribedVariables:
-            if subscriber() is not None:
-                ## Even though getSubscribedVariables() strips out dead
-                ## references, subscriber() might still be dead due to the
-                ## vagaries of garbage collection and the possibility that
-                ## later subscribedVariables were removed, changing the
-                ## dependencies of this subscriber.
+    # nesting depth of `batchedChanges()` and the variables whose
+    # subscribers have yet to be marked stale
+    _batchDepth = 0
+    _batchedRoots = []
+
+    @staticmethod
+    def _markSubscribersStale(roots):
+        """Mark everything that depends on `roots` as stale
+
+        Walks the dependency graph with an explicit stack, rather than
+        recursively, so that deep chains of `Variable` objects don't
+        exhaust the interpreter's recursion limit.  The walk stops at any
+        `Variable` that is already stale, as everything that depends on
+        it must already be stale, too.
+        """
+        stack = list(roots)
+        while stack:
+            var = stack.pop()
+            dead = False
+            for ref in var._subscribedVariables:
+                ## Even though the subscribers are compacted, ref() might
+                ## still be dead due to the vagaries of garbage collection
+                ## and the possibility that later subscribedVariables were
+                ## removed, changing the dependencies of this subscriber.
                 ## See <https://github.com/usnistgov/fipy/issues/103> for more explanation.
-                subscriber()._markStale()
+                subscriber = ref()
+                if subscriber is None:
+                    dead = True
+                elif not subscriber.stale:
+                    subscriber.stale = 1
+                    stack.append(subscriber)
+            if dead:
+                var._compactSubscribers()
+
+    @staticmethod
+    def _flushBatchedChanges():
+        roots = Variable._batchedRoots
+        Variable._batchedRoots = []
+        Variable._markSubscribersStale(roots)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def batchedChanges():
+        """Mark dependent variables stale once for several changes
+
+        Each change to the value of a `Variable` marks everything that
+        depends on it as stale.  Within this context, that is deferred
+        until the first time any value is asked for, or until the context
+        ends, and then done in a single pass.
+
+            >>> a = Variable(value=1.)
+            >>> b = Variable(value=2.)
+            >>> c = (a + b) * a
+            >>> print(c)
+            3.0
+            >>> with Variable.batchedChanges():
+            ...     a.value = 2.
+            ...     b.value = 3.
+            ...     print(c)
+            10.0
+            >>> with Variable.batchedChanges():
+            ...     a.value = 3.
+            >>> print(c)
+            18.0
+
+        Chains of dependencies are not limited by the depth of recursion
+        that the interpreter allows
+
+            >>> import sys
+            >>> x = Variable(value=0.)
+            >>> y = x
+            >>> for i in range(sys.getrecursionlimit() + 10):
+            ...     y = y._UnaryOperatorVariable(lambda z: z + 1)
+            ...     y._markFresh()
+            >>> x.value = 1.
+            >>> y.stale
+            1
+
+        """
+        Variable._batchDepth += 1
+        try:
+            yield
+        finally:
+            Variable._batchDepth -= 1
+            if Variable._batchDepth == 0:
+                Variable._flushBatchedChanges()
+
+    def __markStale(self):
+        if Variable._batchDepth > 0:
+            Variable._batchedRoots.append(self)
+        else:
+            Variable._markSubscribersStale((self,))
 
     def _markFresh(self):
         self.stale = 0
@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 from builtins import range
+from builtins import zip
 __docformat__ = 'restructuredtext'
 
 import sys
@@ -64,37 +65,48 @@ class TSVViewer(AbstractViewer):
             assert mesh is var.mesh
 
 
-    def _plot(self, values, f, dim):
-        for index in range(values.shape[-1]):
-            lineValues = values[..., index]
-
-            # omit any elements whose cell centers lie outside of the specified limits
-            skip = False
-            for axis in range(dim):
-                mini = self._getLimit("%smin" % self._axis[axis])
-                maxi = self._getLimit("%smax" % self._axis[axis])
-
-                if (mini and lineValues[axis] < mini) or (maxi and lineValues[axis] > maxi):
-                    skip = True
-                    break
-
-            if skip:
-                continue
+    _rowsPerChunk = 10000
 
-            # replace any values that lie outside of the specified datalimits with 'nan'
-            for valIndex in range(dim, len(lineValues)):
-                mini = self._getLimit("datamin")
-                maxi = self._getLimit("datamax")
+    def _limited(self, values, dim):
+        """Omit the elements of `values` whose centers lie outside of the
+        limits, and replace the first value of each element that lies
+        outside of the data limits with `nan`
+        """
+        keep = numerix.ones(values.shape[-1], dtype=bool)
+        for axis in range(dim):
+            mini = self._getLimit("%smin" % self._axis[axis])
+            maxi = self._getLimit("%smax" % self._axis[axis])
+            if mini:
+                keep &= ~(values[axis] < mini)
+            if maxi:
+                keep &= ~(values[axis] > maxi)
+        if not keep.all():
+            values = values[..., keep]
+
+        mini = self._getLimit("datamin")
+        maxi = self._getLimit("datamax")
+        if (mini or maxi) and values.shape[0] > dim:
+            data = values[dim:]
+            outside = numerix.zeros(data.shape, dtype=bool)
+            if mini:
+                outside |= (data < mini)
+            if maxi:
+                outside |= (data > maxi)
+            elements = numerix.nonzero(outside.any(axis=0))[0]
+            data[numerix.argmax(outside[:, elements], axis=0), elements] = float("NaN")
+
+        return values
 
-                if (mini and lineValues[valIndex] < mini) or (maxi and lineValues[valIndex] > maxi):
-                    lineValues[valIndex] = float("NaN")
-                    break
+    def _plot(self, values, f, dim):
+        values = self._limited(values, dim)
 
-            line = ["%.15g" % value for value in lineValues]
-            f.write("\t".join(line))
-            f.write("\n")
+        # format a whole chunk of lines with a single operation
+        line = "\t".join(["%.15g"] * values.shape[0]) + "\n"
+        for start in range(0, values.shape[-1], self._rowsPerChunk):
+            chunk = values[..., start:start + self._rowsPerChunk]
+            f.write((line * chunk.shape[-1]) % tuple(chunk.swapaxes(0, 1).ravel()))
 
-    def plot(self, filename=None):
+    def plot(self, filename=None, writer=None):
         """
         "plot" the coordinates and values of the variables to `filename`.
         If `filename` is not provided, "plots" to `stdout`.
@@ -119,32 +131,75 @@ class TSVViewer(AbstractViewer):
         0.05    0.45    -2      35      -3.33333333333333
         0.15    0.45    5       35      5
 
+        Only processor 0 writes to a file, so only it gathers the values
+        of all processors
+
+        >>> import os
+        >>> from tempfile import mkstemp
+        >>> f, fname = mkstemp(".tsv")
+        >>> os.close(f)
+        >>> TSVViewer(vars=(v,), title="var").plot(filename=fname)
+        >>> with open(fname) as f:
+        ...     print(f.read().strip()) #doctest: +NORMALIZE_WHITESPACE, +SERIAL
+        var
+        x       y       var
+        0.05    0.15    0
+        0.15    0.15    2
+        0.05    0.45    -2
+        0.15    0.45    5
+        >>> os.remove(fname)
+
+        Files named with a ``.npz`` extension hold the same columns in
+        binary, named by their headings, and files named with a ``.npy``
+        extension hold them as a structured array
+
+        >>> f, fname = mkstemp(".npz")
+        >>> os.close(f)
+        >>> TSVViewer(vars=(v, v.grad), ymin=0.3).plot(filename=fname)
+        >>> columns = numerix.load(fname) # doctest: +PROCESSOR_0
+        >>> print(sorted(columns.keys())) # doctest: +PROCESSOR_0
+        ['var', 'var_gauss_grad_x', 'var_gauss_grad_y', 'x', 'y']
+        >>> print(columns["var"]) # doctest: +PROCESSOR_0
+        [-2.  5.]
+        >>> os.remove(fname) # doctest: +PROCESSOR_0
+
+        >>> f, fname = mkstemp(".npy")
+        >>> os.close(f)
+        >>> TSVViewer(vars=(v,), datamax=4.).plot(filename=fname)
+        >>> table = numerix.load(fname) # doctest: +PROCESSOR_0
+        >>> print(table.dtype.names) # doctest: +PROCESSOR_0
+        ('x', 'y', 'var')
+        >>> print(table["var"]) # doctest: +PROCESSOR_0
+        [  0.   2.  -2.  nan]
+        >>> os.remove(fname) # doctest: +PROCESSOR_0
+
+        Columns of unnamed variables, or of variables with the same name,
+        are named by their position
+
+        >>> f, fname = mkstemp(".npy")
+        >>> os.close(f)
+        >>> u = CellVariable(mesh=m, value=1.)
+        >>> TSVViewer(vars=(v, u, v, u)).plot(filename=fname)
+        >>> table = numerix.load(fname) # doctest: +PROCESSOR_0
+        >>> print(table.dtype.names) # doctest: +PROCESSOR_0
+        ('x', 'y', 'var', 'column3', 'var_4', 'column5')
+        >>> print(table["var_4"]) # doctest: +PROCESSOR_0
+        [ 0.  2. -2.  5.]
+        >>> os.remove(fname) # doctest: +PROCESSOR_0
+
         Parameters
         ----------
         filename : str
             If not `None`, the name of a file to save the image into.
+            Files named with a ``.gz`` extension are compressed.
+        writer : ~fipy.tools.backgroundWriter.BackgroundWriter
+            If not `None`, the values are formatted and written to
+            `filename` in the background.
         """
 
         mesh = self.vars[0].mesh
         dim = mesh.dim
 
-        if filename is not None:
-            import os
-            if mesh.communicator.procID == 0:
-                if os.path.splitext(filename)[1] == ".gz":
-                    import gzip
-                    f = gzip.GzipFile(filename = filename, mode = 'w', fileobj = None)
-                else:
-                    f = open(filename, "w")
-            else:
-                f = open(os.devnull, mode='w')
-        else:
-            f = sys.stdout
-
-        if self.title and len(self.title) > 0:
-            f.write(self.title)
-            f.write("\n")
-
         headings = []
         for index in range(dim):
             headings.extend(self._axis[index])
@@ -157,35 +212,115 @@ class TSVViewer(AbstractViewer):
             else:
                 headings.extend([name])
 
-        f.write("\t".join(headings))
-        f.write("\n")
-
         cellVars = [var for var in self.vars if isinstance(var, CellVariable)]
         faceVars = [var for var in self.vars if isinstance(var, FaceVariable)]
 
-        if len(cellVars) > 0:
-            values = mesh.cellCenters.globalValue
-            for var in self.vars:
-                if isinstance(var, CellVariable) and var.rank == 1:
-                    values = numerix.concatenate((values, numerix.array(var.globalValue)))
-                else:
-                    values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
+        if filename is not None:
+            # only processor 0 writes, so only it needs the values of
+            # the other processors
+            def globalValue(var):
+                return var._rootValue
+        else:
+            def globalValue(var):
+                return var.globalValue
+
+        blocks = []
+        for centers, elementVars, elementClass in ((mesh.cellCenters, cellVars, CellVariable),
+                                                   (mesh.faceCenters, faceVars, FaceVariable)):
+            if len(elementVars) > 0:
+                columns = [globalValue(centers)] + [globalValue(var) for var in self.vars]
+                if columns[0] is None:
+                    continue
+
+                rows = [numerix.array(columns[0])]
+                for var, value in zip(self.vars, columns[1:]):
+                    if isinstance(var, elementClass) and var.rank == 1:
+                        rows.append(numerix.array(value))
+                    else:
+                        rows.append(numerix.array(value)[numerix.newaxis])
+
+                values = numerix.empty((sum(len(row) for row in rows),) + rows[0].shape[1:],
+                                       dtype=numerix.result_type(*rows))
+                start = 0
+                for row in rows:
+                    values[start:start + len(row)] = row
+                    start += len(row)
+
+                blocks.append(values)
+
+        if writer is not None and filename is not None:
+            # `blocks` are new arrays, so they can be written while the
+            # variables change
+            if mesh.communicator.procID == 0:
+                writer.submit(self._write, filename, headings, blocks, dim)
+        else:
+            self._write(filename, headings, blocks, dim)
 
-            self._plot(values, f, dim)
+    def _write(self, filename, headings, blocks, dim):
+        """Write the `headings` and the `blocks` of values to `filename`,
+        or to `stdout`
+        """
+        import os
+        if filename is not None and os.path.splitext(filename)[1] in (".npy", ".npz"):
+            if self.vars[0].mesh.communicator.procID == 0:
+                self._writeBinary(filename, headings, blocks, dim)
+            return
 
-        if len(faceVars) > 0:
-            values = mesh.faceCenters.globalValue
-            for var in self.vars:
-                if isinstance(var, FaceVariable) and var.rank == 1:
-                    values = numerix.concatenate((values, numerix.array(var.globalValue)))
+        if filename is not None:
+            if self.vars[0].mesh.communicator.procID == 0:
+                if os.path.splitext(filename)[1] == ".gz":
+                    import gzip
+                    f = gzip.GzipFile(filename = filename, mode = 'w', fileobj = None)
                 else:
-                    values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
+                    f = open(filename, "w")
+            else:
+                f = open(os.devnull, mode='w')
+        else:
+            f = sys.stdout
 
+        if self.title and len(self.title) > 0:
+            f.write(self.title)
+            f.write("\n")
+
+        f.write("\t".join(headings))
+        f.write("\n")
+
+        for values in blocks:
             self._plot(values, f, dim)
 
         if f is not sys.stdout:
             f.close()
 
+    def _writeBinary(self, filename, headings, blocks, dim):
+        """Write the columns of the `blocks` of values to a NumPy file,
+        named by the `headings`
+        """
+        import os
+        from future.utils import text_to_native_str
+
+        blocks = [self._limited(values, dim) for values in blocks]
+        if len(blocks) > 0:
+            values = numerix.concatenate(blocks, axis=-1)
+        else:
+            values = numerix.zeros((len(headings), 0))
+        # unnamed variables have empty headings, and variables may share
+        # a name, but each column needs a name of its own
+        names = []
+        for index, heading in enumerate(headings):
+            name = heading or "column%d" % index
+            if name in names:
+                name = "%s_%d" % (name, index)
+            names.append(text_to_native_str(name))
+
+        if os.path.splitext(filename)[1] == ".npz":
+            numerix.savez(filename, **dict(zip(names, values)))
+        else:
+            table = numerix.empty(values.shape[-1],
+                                  dtype=[(name, values.dtype) for name in names])
+            for name, column in zip(names, values):
+                table[name] = column
+            numerix.save(filename, table)
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
@@ -74,7 +74,17 @@ class VTKViewer(AbstractViewer):
 
         return (name, rank, value)
 
-    def plot(self, filename=None):
+    def plot(self, filename=None, writer=None):
+        """Write the values of the variables to `filename`
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file to write.
+        writer : ~fipy.tools.backgroundWriter.BackgroundWriter
+            If not `None`, a copy of the data set is written in the
+            background.
+        """
         data = self._data
 
         from fipy.tools import numerix
@@ -89,7 +99,14 @@ class VTKViewer(AbstractViewer):
             from tvtk.misc import write_data
         except ImportError as e:
             from enthought.tvtk.misc import write_data
-        write_data(self.dataset, filename)
+
+        if writer is not None:
+            # the arrays of `self.dataset` are overwritten by the next `plot`
+            dataset = self.dataset.__class__()
+            dataset.deep_copy(self.dataset)
+            writer.submit(write_data, dataset, filename)
+        else:
+            write_data(self.dataset, filename)
 
     def _getSuitableVars(self, vars):
         if type(vars) not in [type([]), type(())]:
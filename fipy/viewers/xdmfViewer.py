@@ -0,0 +1,310 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+from builtins import zip
+__docformat__ = 'restructuredtext'
+
+import io
+import os
+
+from fipy.tools import numerix
+from fipy.viewers.viewer import AbstractViewer
+from fipy.variables.cellVariable import CellVariable
+from fipy.meshes.raggedArray import _RaggedArray
+
+__all__ = ["XDMFViewer"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+# XDMF codes of the elements of a "Mixed" topology
+_POLYLINE = 2
+_POLYGON = 3
+_POLYHEDRON = 16
+
+def _gatherRows(ragged, rows):
+    """Indices of the `rows` of `ragged`, one row after the other, and
+    the length of each row
+    """
+    lengths = ragged.lengths[rows]
+    starts = ragged.offsets[:-1][rows]
+    shifts = starts - (numerix.cumsum(lengths) - lengths)
+    index = numerix.arange(lengths.sum()) + numerix.repeat(shifts, lengths)
+    return ragged.indices[index], lengths
+
+def _withHeaders(headers, body, lengths):
+    """Prefix each row of `body` with its column of `headers`
+
+    Parameters
+    ----------
+    headers : array_like
+        Values of shape `(k, N)` to put before each of `N` rows
+    body : ~numpy.ndarray
+        The entries of all rows, one row after the other
+    lengths : ~numpy.ndarray
+        The number of entries of each row
+    """
+    headers = numerix.asarray(headers, dtype=numerix.INT_DTYPE)
+    k = headers.shape[0]
+    starts = numerix.cumsum(k + lengths) - (k + lengths)
+    isHeader = numerix.zeros((k * len(lengths) + len(body),), dtype=bool)
+    for j in range(k):
+        isHeader[starts + j] = True
+    entries = numerix.empty(isHeader.shape, dtype=numerix.INT_DTYPE)
+    entries[isHeader] = headers.swapaxes(0, 1).ravel()
+    entries[~isHeader] = body
+    return entries
+
+def _mixedTopology(mesh, cellIDs):
+    """Connectivity of the cells `cellIDs` of `mesh` as an XDMF "Mixed"
+    topology
+
+        >>> from fipy import Grid1D, Grid2D, Tri2D, Grid3D
+        >>> print(_mixedTopology(Grid1D(nx=2), [0, 1]))
+        [2 2 1 0 2 2 2 1]
+        >>> print(_mixedTopology(Grid2D(nx=2, ny=1), [1]))
+        [3 4 2 5 4 1]
+        >>> print(_mixedTopology(Tri2D(nx=1, ny=1), [0, 3]))
+        [3 3 3 1 4 3 3 1 0 4]
+
+    Cells in 3D are polyhedra, listed by the vertices of their faces
+
+        >>> print(_mixedTopology(Grid3D(nx=1, ny=1, nz=1), [0]))
+        [16  6  4  0  2  6  4  4  1  3  7  5  4  0  1  5  4  4  2  3  7  6  4  0  1
+          3  2  4  4  5  7  6]
+    """
+    cellIDs = numerix.asarray(cellIDs, dtype=numerix.INT_DTYPE)
+    if mesh.dim < 3:
+        vertices = _RaggedArray.fromPadded(mesh._orderedCellVertexIDs)
+        body, lengths = _gatherRows(vertices, cellIDs)
+        element = (_POLYLINE, _POLYGON)[mesh.dim - 1]
+        return _withHeaders((numerix.repeat(element, len(cellIDs)), lengths), body, lengths)
+    else:
+        vertices = _RaggedArray.fromPadded(mesh.faceVertexIDs)
+        faceEntries = _RaggedArray(offsets=numerix.concatenate(([0], numerix.cumsum(vertices.lengths + 1))),
+                                   indices=_withHeaders((vertices.lengths,),
+                                                        vertices.indices, vertices.lengths))
+        faces, facesPerCell = _gatherRows(_RaggedArray.fromPadded(mesh.cellFaceIDs), cellIDs)
+        body, faceLengths = _gatherRows(faceEntries, faces)
+        lengths = numerix.bincount(numerix.repeat(numerix.arange(len(cellIDs)), facesPerCell),
+                                   weights=faceLengths, minlength=len(cellIDs))
+        return _withHeaders((numerix.repeat(_POLYHEDRON, len(cellIDs)), facesPerCell),
+                            body, numerix.asarray(lengths, dtype=numerix.INT_DTYPE))
+
+class XDMFViewer(AbstractViewer):
+    r"""Writes a time series of `CellVariable` objects in XDMF format
+
+    The mesh is written once, and each call to :meth:`plot` only writes
+    the values of the variables, as raw binary files that are listed by
+    an XDMF file that can be read by ParaView or VisIt.  Each processor
+    writes its own cells.  Neither `tvtk` nor `h5py` is needed.
+
+        >>> import os, shutil, tempfile
+        >>> from xml.etree import ElementTree
+        >>> from fipy import Grid2D
+        >>> m = Grid2D(nx=3, ny=2)
+        >>> x, y = m.cellCenters
+        >>> phi = CellVariable(mesh=m, name="phi", value=x * y)
+        >>> directory = None
+        >>> if m.communicator.procID == 0:
+        ...     directory = tempfile.mkdtemp()
+        >>> directory = m.communicator.bcast(directory, root=0)
+        >>> viewer = XDMFViewer(vars=(phi, phi.grad),
+        ...                     filename=os.path.join(directory, "run.xmf"))
+        >>> for t in (0., 0.5):
+        ...     phi.value = x * y + t
+        ...     viewer.plot(time=t)
+        >>> print(sorted(os.listdir(os.path.join(directory, "run")))) # doctest: +SERIAL
+        ['geometry.0.bin', 'phi.0.0.bin', 'phi.1.0.bin', 'phi_gauss_grad.0.0.bin', 'phi_gauss_grad.1.0.bin', 'topology.0.bin']
+
+    The XDMF file lists the steps and the files that hold them
+
+        >>> tree = ElementTree.parse(os.path.join(directory, "run.xmf")) # doctest: +PROCESSOR_0
+        >>> steps = tree.findall("Domain/Grid/Grid") # doctest: +PROCESSOR_0
+        >>> print([step.find("Time").get("Value") for step in steps]) # doctest: +PROCESSOR_0
+        ['0', '0.5']
+        >>> attribute = steps[1].find("Grid/Attribute") # doctest: +SERIAL
+        >>> print(attribute.get("Name"), attribute.get("Center")) # doctest: +SERIAL
+        phi Cell
+        >>> item = attribute.find("DataItem") # doctest: +SERIAL
+        >>> print(item.text) # doctest: +SERIAL
+        run/phi.1.0.bin
+        >>> value = numerix.fromfile(os.path.join(directory, item.text),
+        ...                          dtype="<f8") # doctest: +SERIAL
+        >>> print(numerix.allclose(value, phi)) # doctest: +SERIAL
+        True
+
+    Vectors have three components
+
+        >>> item = steps[1].findall("Grid/Attribute")[1].find("DataItem") # doctest: +SERIAL
+        >>> print(item.get("Dimensions")) # doctest: +SERIAL
+        6 3
+        >>> value = numerix.fromfile(os.path.join(directory, item.text),
+        ...                          dtype="<f8").reshape((6, 3)) # doctest: +SERIAL
+        >>> print(numerix.allclose(value[:, :2], phi.grad.value.swapaxes(0, 1))) # doctest: +SERIAL
+        True
+        >>> print(numerix.allclose(value[:, 2], 0.)) # doctest: +SERIAL
+        True
+
+        >>> m.communicator.Barrier()
+        >>> shutil.rmtree(directory) # doctest: +PROCESSOR_0
+    """
+
+    def __init__(self, vars, filename, title=None, limits={}, **kwlimits):
+        """Creates a `XDMFViewer`
+
+        Parameters
+        ----------
+        vars : ~fipy.variables.cellVariable.CellVariable or list
+            the `CellVariable` objects to write.
+        filename : str
+            the name of the XDMF file.  The binary files are written in
+            a directory with the same name, without the extension.
+        title : str, optional
+            the name of the time series
+        limits : dict, optional
+            a (deprecated) alternative to limit keyword arguments
+        float xmin, xmax, ymin, ymax, zmin, zmax, datamin, datamax : float, optional
+            ignored
+        """
+        kwlimits.update(limits)
+        AbstractViewer.__init__(self, vars=vars, title=title, **kwlimits)
+
+        self.filename = filename
+        self._directory = os.path.splitext(filename)[0]
+
+        self._names = []
+        for var in self.vars:
+            name = var.name or "%s #%d" % (var.__class__.__name__, id(var))
+            name = "".join([c if c.isalnum() or c in "-_" else "_" for c in name])
+            if name in self._names:
+                name = "%s_%d" % (name, len(self._names))
+            self._names.append(name)
+
+        self._times = []
+        self._partitions = None
+
+    def _getSuitableVars(self, vars):
+        vars = [var for var in AbstractViewer._getSuitableVars(self, vars)
+                if isinstance(var, CellVariable)]
+        if len(vars) == 0:
+            raise TypeError("%s can only write %s" % (self.__class__.__name__, CellVariable.__name__))
+        return [var for var in vars if var.mesh == vars[0].mesh]
+
+    def _binaryName(self, name, procID):
+        return os.path.join(os.path.basename(self._directory), "%s.%d.bin" % (name, procID))
+
+    def _writeArray(self, name, array, dtype):
+        path = os.path.join(os.path.dirname(self.filename), name)
+        numerix.ascontiguousarray(array, dtype=dtype).tofile(path)
+
+    def _writeMesh(self):
+        """Write the vertices and cells of this processor, and collect the
+        sizes of those of all processors
+        """
+        mesh = self.vars[0].mesh
+        comm = mesh.communicator
+
+        if comm.procID == 0 and not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+        comm.Barrier()
+
+        vertices = numerix.zeros((3, mesh.vertexCoords.shape[-1]), dtype=float)
+        vertices[:mesh.dim] = mesh.vertexCoords
+        topology = _mixedTopology(mesh, mesh._localNonOverlappingCellIDs)
+
+        self._writeArray(self._binaryName("geometry", comm.procID), vertices.swapaxes(0, 1), "<f8")
+        self._writeArray(self._binaryName("topology", comm.procID), topology, "<i8")
+
+        sizes = (len(mesh._localNonOverlappingCellIDs), vertices.shape[-1], len(topology))
+        if comm.Nproc > 1:
+            self._partitions = comm.allgather(sizes)
+        else:
+            self._partitions = [sizes]
+
+    @staticmethod
+    def _dataItem(dimensions, numberType, name):
+        return ('<DataItem Dimensions="%s" NumberType="%s" Precision="8" Format="Binary" Endian="Little">%s</DataItem>'
+                % (" ".join([str(d) for d in dimensions]), numberType, name))
+
+    def _stepXML(self, step, time):
+        lines = ['   <Grid Name="step %d" GridType="Collection" CollectionType="Spatial">' % step,
+                 '    <Time Value="%.15g"/>' % time]
+        for procID, (numberOfCells, numberOfVertices, topologyLength) in enumerate(self._partitions):
+            lines += ['    <Grid Name="partition %d" GridType="Uniform">' % procID,
+                      '     <Topology TopologyType="Mixed" NumberOfElements="%d">' % numberOfCells,
+                      '      ' + self._dataItem((topologyLength,), "Int",
+                                                self._binaryName("topology", procID)),
+                      '     </Topology>',
+                      '     <Geometry GeometryType="XYZ">',
+                      '      ' + self._dataItem((numberOfVertices, 3), "Float",
+                                                self._binaryName("geometry", procID)),
+                      '     </Geometry>']
+            for var, name in zip(self.vars, self._names):
+                attributeType, components = {0: ("Scalar", ()),
+                                             1: ("Vector", (3,)),
+                                             2: ("Tensor", (9,))}[var.rank]
+                lines += ['     <Attribute Name="%s" AttributeType="%s" Center="Cell">' % (name, attributeType),
+                          '      ' + self._dataItem((numberOfCells,) + components, "Float",
+                                                    self._binaryName("%s.%d" % (name, step), procID)),
+                          '     </Attribute>']
+            lines += ['    </Grid>']
+        lines += ['   </Grid>']
+        return lines
+
+    def _writeXML(self):
+        lines = ['<?xml version="1.0" ?>',
+                 '<Xdmf Version="3.0">',
+                 ' <Domain>',
+                 '  <Grid Name="%s" GridType="Collection" CollectionType="Temporal">' % (self.title or "FiPy")]
+        for step, time in enumerate(self._times):
+            lines += self._stepXML(step, time)
+        lines += ['  </Grid>',
+                  ' </Domain>',
+                  '</Xdmf>',
+                  '']
+        with io.open(self.filename, "w") as f:
+            f.write("\n".join(lines))
+
+    def plot(self, filename=None, time=None):
+        """Write the values of the variables as the next step of the series
+
+        Parameters
+        ----------
+        filename : str
+            ignored; the series is written to the `filename` the
+            `XDMFViewer` was created with
+        time : float
+            the time of this step.  Defaults to the number of the step.
+        """
+        mesh = self.vars[0].mesh
+        comm = mesh.communicator
+
+        if self._partitions is None:
+            self._writeMesh()
+
+        step = len(self._times)
+        if time is None:
+            time = step
+
+        cellIDs = mesh._localNonOverlappingCellIDs
+        for var, name in zip(self.vars, self._names):
+            value = numerix.array(var.value, dtype=float)[..., cellIDs]
+            if var.rank > 0:
+                padded = numerix.zeros((3,) * var.rank + value.shape[-1:], dtype=float)
+                padded[(slice(0, mesh.dim),) * var.rank] = value
+                value = padded.reshape((-1, value.shape[-1])).swapaxes(0, 1)
+            self._writeArray(self._binaryName("%s.%d" % (name, step), comm.procID), value, "<f8")
+
+        self._times.append(float(time))
+
+        # the XDMF file only lists steps that all processors have written
+        comm.Barrier()
+        if comm.procID == 0:
+            self._writeXML()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()